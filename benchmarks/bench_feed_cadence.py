@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+自适应检查周期模拟：固定周期轮询 vs 按各源更新规律轮询
+
+模拟一批发布频率不同的RSS源（每小时到每周），调度器每个tick检查一次，
+统计请求数以及新条目被发现的平均延迟。
+
+用法: python benchmarks/bench_feed_cadence.py [源数量] [模拟天数] [tick分钟]
+"""
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.feed_schedule import FeedCadence
+from news_agent.core.feed_state import FeedStateStore
+
+HOUR = 3600
+PERIODS = [1 * HOUR, 3 * HOUR, 12 * HOUR, 24 * HOUR, 7 * 24 * HOUR]
+
+
+def simulate(feeds, days: int, tick: int, cadence: FeedCadence = None):
+    requests = 0
+    delays = []
+    last_seen = {url: 0.0 for url in feeds}
+    for now in range(tick, days * 24 * HOUR + 1, tick):
+        for url, (period, phase) in feeds.items():
+            if cadence is not None and not cadence.is_due(url, now):
+                continue
+            requests += 1
+            published = [t for t in range(phase, now + 1, period) if t > last_seen[url]]
+            if published:
+                delays.extend(now - t for t in published)
+                last_seen[url] = published[-1]
+            if cadence is not None:
+                cadence.record(url, updated=bool(published),
+                               newest=published[-1] if published else None, now=now)
+    return requests, sum(delays) / max(1, len(delays))
+
+
+def main():
+    feed_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 14
+    tick = int(sys.argv[3]) * 60 if len(sys.argv) > 3 else 15 * 60
+    rng = random.Random(0)
+
+    feeds = {}
+    for i in range(feed_count):
+        period = rng.choice(PERIODS)
+        feeds[f"http://feed{i}.example.com/rss"] = (period, rng.randrange(period))
+
+    fixed_requests, fixed_delay = simulate(feeds, days, tick)
+    with tempfile.TemporaryDirectory() as tmp:
+        cadence = FeedCadence(FeedStateStore(str(Path(tmp) / "schedule.json")),
+                              min_interval=tick, max_interval=7 * 24 * HOUR)
+        adaptive_requests, adaptive_delay = simulate(feeds, days, tick, cadence)
+
+    print(f"源数量: {feed_count}, 模拟: {days}天, tick: {tick // 60}分钟")
+    print(f"固定周期: {fixed_requests:,} 次请求, 平均发现延迟 {fixed_delay / 60:.1f} 分钟")
+    print(f"自适应:   {adaptive_requests:,} 次请求, 平均发现延迟 {adaptive_delay / 60:.1f} 分钟")
+    print(f"请求量减少: {1 - adaptive_requests / fixed_requests:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
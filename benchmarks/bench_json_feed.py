@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+JSON Feed快速路径 vs feedparser：解析内容相同的JSON Feed与RSS文档
+
+用法: python benchmarks/bench_json_feed.py [条目数] [重复次数]
+"""
+import sys
+import time
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from news_agent.core.data_sources import json_feed
+from news_agent.core.data_sources.rss import RSSSource
+from test_rss_source import make_rss, make_json_feed
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    source = RSSSource([])
+    rss = make_rss(1, count)
+    feed = make_json_feed(1, count)
+    rss_headers = {'content-type': 'application/rss+xml'}
+    json_headers = {'content-type': 'application/feed+json'}
+
+    rss_time = timed(lambda: source._parse_feed(rss, rss_headers, "bench", ["AI"]), repeat)
+    json_time = timed(lambda: source._parse_feed(feed, json_headers, "bench", ["AI"]), repeat)
+
+    decoder = "orjson" if json_feed.orjson is not None else "json"
+    print(f"条目数: {count}, JSON解码器: {decoder}")
+    print(f"feedparser (RSS):  {rss_time * 1000:.1f}ms ({count / rss_time:,.0f} 条/秒)")
+    print(f"JSON Feed快速路径: {json_time * 1000:.1f}ms ({count / json_time:,.0f} 条/秒)")
+    print(f"加速比: {rss_time / json_time:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
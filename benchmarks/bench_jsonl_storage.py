@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+JSON与JSON Lines存储对比：保存耗时、读取耗时和读取时的峰值内存
+
+JSON Lines 使用 iter_load 逐条读取（只计数，不保留新闻），峰值内存应与条数无关。
+
+用法: python benchmarks/bench_jsonl_storage.py [新闻条数]
+"""
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.storage import jsonl_storage
+from news_agent.storage.json_storage import JSONStorage
+from news_agent.storage.jsonl_storage import JSONLStorage
+
+
+def make_items(count: int):
+    published = datetime(2025, 9, 1)
+    return [
+        NewsItem(title=f"Story {i}", content=f"Body {i} " * 50, url=f"http://example.com/{i}",
+                 published_date=published, source="Bench", keywords=["AI"])
+        for i in range(count)
+    ]
+
+
+def measure(func):
+    """返回 (结果, 耗时秒, 峰值内存MB)；耗时和内存分两次测量，避免tracemalloc拖慢计时"""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    items = make_items(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_storage = JSONStorage(tmp)
+        jsonl = JSONLStorage(tmp)
+
+        start = time.perf_counter()
+        json_path = json_storage.save(items, "news.json")
+        json_save = time.perf_counter() - start
+        start = time.perf_counter()
+        jsonl_path = jsonl.save(items, "news.jsonl")
+        jsonl_save = time.perf_counter() - start
+        json_size = Path(json_path).stat().st_size / 1024 / 1024
+        jsonl_size = Path(jsonl_path).stat().st_size / 1024 / 1024
+        del items
+
+        loaded, json_load, json_peak = measure(lambda: len(json_storage.load("news.json")))
+        assert loaded == count
+        loaded, jsonl_load, jsonl_peak = measure(lambda: len(jsonl.load("news.jsonl")))
+        assert loaded == count
+        streamed, stream_time, stream_peak = measure(lambda: sum(1 for _ in jsonl.iter_load("news.jsonl")))
+        assert streamed == count
+
+    decoder = "orjson" if jsonl_storage.orjson is not None else "json"
+    print(f"{count} 条新闻（JSON Lines编码: {decoder}）")
+    print(f"{'方式':<22}{'文件(MB)':>10}{'保存(s)':>10}{'读取(s)':>10}{'峰值内存(MB)':>14}")
+    print(f"{'json load':<22}{json_size:>10.1f}{json_save:>10.2f}{json_load:>10.2f}{json_peak:>14.2f}")
+    print(f"{'jsonl load':<22}{jsonl_size:>10.1f}{jsonl_save:>10.2f}{jsonl_load:>10.2f}{jsonl_peak:>14.2f}")
+    print(f"{'jsonl iter_load':<22}{'':>10}{'':>10}{stream_time:>10.2f}{stream_peak:>14.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
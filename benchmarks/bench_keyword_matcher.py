@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+关键词匹配性能对比：逐个扫描 vs 预编译匹配器
+
+用法: python benchmarks/bench_keyword_matcher.py [关键词数] [文本数]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from news_agent.core.keyword_matcher import KeywordMatcher
+from test_keyword_matcher import reference_match
+
+WORDS = (
+    "ai model chip market policy energy robot data cloud security startup funding "
+    "人工智能 大模型 芯片 新能源 机器人 数据 云计算 网络安全 融资 监管"
+).split()
+
+
+def build_keywords(count: int, rng: random.Random):
+    keywords = []
+    for i in range(count):
+        term = f"{rng.choice(WORDS)}{i}"
+        if i % 10 == 0:
+            keywords.append(f"-{term}")
+        elif i % 7 == 0:
+            keywords.append(f'"{term} {rng.choice(WORDS)}"')
+        else:
+            keywords.append(term)
+    return keywords
+
+
+def build_texts(count: int, rng: random.Random):
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+        for _ in range(count)
+    ]
+
+
+def main():
+    keyword_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    text_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    rng = random.Random(0)
+    keywords = build_keywords(keyword_count, rng)
+    texts = build_texts(text_count, rng)
+
+    start = time.perf_counter()
+    expected = [reference_match(text, keywords) for text in texts]
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(keywords)
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = [matcher.match(text) for text in texts]
+    new_time = time.perf_counter() - start
+
+    assert actual == expected
+    print(f"关键词数: {keyword_count}, 文本数: {text_count}")
+    print(f"逐个扫描:   {old_time:.3f}s ({text_count / old_time:,.0f} 条/秒)")
+    print(f"预编译匹配: {new_time:.3f}s ({text_count / new_time:,.0f} 条/秒), 编译 {compile_time * 1000:.1f}ms")
+    print(f"加速比: {old_time / new_time:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+多源新闻合并：归并排序+单遍去重（有数量上限时堆归并提前停止）与原先的 set去重 + 内容哈希去重 + 全量排序 对比
+
+用法: python benchmarks/bench_merge.py [源数] [每源条数] [数量上限]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.merge import merge_news
+
+
+def make_streams(feeds: int, per_feed: int):
+    """每个源按时间从新到旧排列；约15%的条目同时出现在其他源中"""
+    rng = random.Random(0)
+    base = datetime(2025, 9, 1)
+    streams = []
+    for feed in range(feeds):
+        stream = []
+        for i in range(per_feed):
+            story = rng.randrange(feeds * per_feed) if rng.random() < 0.15 else feed * per_feed + i
+            stream.append(NewsItem(
+                title=f"Story {story}", content=f"Body of story {story}", url=f"https://example.com/{story}",
+                published_date=base - timedelta(seconds=i * 60 + feed), source=f"Feed{feed}"
+            ))
+        streams.append(stream)
+    return streams
+
+
+def legacy(streams):
+    all_news = [item for stream in streams for item in stream]
+    unique_news = list(set(all_news))
+    if len(unique_news) != len(all_news):
+        content_hashes, final_news = set(), []
+        for item in unique_news:
+            content_hash = item.content_hash64()
+            if content_hash not in content_hashes:
+                content_hashes.add(content_hash)
+                final_news.append(item)
+        unique_news = final_news
+    unique_news.sort(key=lambda x: x.published_date, reverse=True)
+    return unique_news
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    feeds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    per_feed = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    limit = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    streams = make_streams(feeds, per_feed)
+    # 预先计算哈希缓存，两种做法比较的都是合并本身
+    legacy(streams)
+
+    expected, legacy_time = timed(lambda: legacy(streams))
+    (merged, stats), merge_time = timed(lambda: merge_news(streams))
+    (top, top_stats), top_time = timed(lambda: merge_news(streams, limit=limit))
+    assert len(merged) == len(expected) and top == merged[:limit]
+
+    print(f"源数: {feeds}, 每源: {per_feed}, 总条数: {stats.raw:,}, 去重后: {stats.kept:,}")
+    print(f"原做法(set+排序): {legacy_time * 1000:.0f}ms")
+    print(f"归并+单遍去重: {merge_time * 1000:.0f}ms")
+    print(f"堆归并只取最新 {limit} 条: {top_time * 1000:.0f}ms（未处理 {top_stats.skipped:,} 条）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
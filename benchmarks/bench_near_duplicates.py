@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+近似重复检测规模测试：N条新闻中10%为转载（标题加后缀、改动一个词），
+测量分组耗时和召回/误合并情况
+
+用法: python benchmarks/bench_near_duplicates.py [新闻条数]
+"""
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.near_duplicates import NearDuplicateDetector
+
+
+def make_items(total: int):
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(5000)]
+    published = datetime(2025, 9, 1)
+    items, copies = [], 0
+    for i in range(total):
+        if i % 10 == 1:
+            # 转载上一条：标题加来源后缀，正文改动一个词
+            base = items[-1]
+            words = base.content.split()
+            words[rng.randrange(len(words))] = "changed"
+            items.append(NewsItem(title=base.title + " - Wire", content=" ".join(words),
+                                  url=f"http://mirror.com/{i}", published_date=published, source="Bench"))
+            copies += 1
+        else:
+            items.append(NewsItem(title=" ".join(rng.choices(vocab, k=8)),
+                                  content=" ".join(rng.choices(vocab, k=120)),
+                                  url=f"http://example.com/{i}", published_date=published, source="Bench"))
+    return items, copies
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    items, copies = make_items(total)
+    detector = NearDuplicateDetector()
+
+    start = time.perf_counter()
+    kept, groups = detector.dedupe(items)
+    elapsed = time.perf_counter() - start
+
+    merged = sum(len(g.aliases) for g in groups)
+    print(f"新闻条数: {total:,}（其中转载 {copies:,} 条）")
+    print(f"LSH分段: {detector.bands} × {detector.rows}, 阈值 {detector.threshold}")
+    print(f"耗时: {elapsed:.2f}s ({total / elapsed:,.0f} 条/秒)")
+    print(f"合并: {merged:,} 条, {len(groups):,} 组, 保留 {len(kept):,} 条")
+    print(f"召回率: {min(merged, copies) / copies:.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
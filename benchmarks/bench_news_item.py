@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+NewsItem内存占用与去重吞吐：与原先的普通dataclass实现对比
+
+用法: python benchmarks/bench_news_item.py [新闻条数]
+"""
+import gc
+import hashlib
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+
+
+@dataclass
+class LegacyNewsItem:
+    """原先的实现：每次哈希/比较都重新规范化标题，内容哈希每次重新计算md5"""
+    title: str
+    content: str
+    url: str
+    published_date: datetime
+    source: str
+    author: Optional[str] = None
+    summary: Optional[str] = None
+    keywords: List[str] = None
+
+    def __post_init__(self):
+        if self.keywords is None:
+            self.keywords = []
+
+    def __hash__(self):
+        return hash((self.url, self.title.strip().lower()))
+
+    def __eq__(self, other):
+        if not isinstance(other, LegacyNewsItem):
+            return False
+        return (self.url == other.url and
+                self.title.strip().lower() == other.title.strip().lower())
+
+    def get_content_hash(self) -> str:
+        import hashlib
+        content_str = f"{self.title.strip().lower()}{self.content[:500].strip().lower()}"
+        return hashlib.md5(content_str.encode()).hexdigest()
+
+
+def make_fields(total: int):
+    """生成字段（字符串在两种实现间共享，只比较对象本身的开销）；约20%为重复条目"""
+    published = datetime(2025, 9, 1)
+    body = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 12
+    fields = []
+    for i in range(total):
+        j = i - 1 if i % 5 == 4 else i
+        fields.append((f"  Breaking: Story number {j} ", f"{body}{j}", f"https://example.com/news/{j}"))
+    return fields, published
+
+
+def build(cls, fields, published):
+    return [cls(title=t, content=c, url=u, published_date=published, source="Bench") for t, c, u in fields]
+
+
+def dedupe(items, content_hash):
+    """与fetch相同的两步去重：按(url, 标题)去重，再按内容哈希去重（模拟3轮set操作）"""
+    unique = list(set(items))
+    unique = list(set(unique))
+    seen, result = set(), []
+    for item in list(set(unique)):
+        key = content_hash(item)
+        if key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
+
+
+def measure(label, cls, fields, published, content_hash):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = build(cls, fields, published)
+    build_time = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    first = dedupe(items, content_hash)
+    first_time = time.perf_counter() - start
+    start = time.perf_counter()
+    again = dedupe(items, content_hash)
+    again_time = time.perf_counter() - start
+    assert len(first) == len(again)
+
+    print(f"{label}: {memory / len(items):.0f} 字节/条（不含共享字符串）, 构建 {build_time:.2f}s, "
+          f"去重 {first_time:.2f}s, 再次去重 {again_time:.2f}s, 保留 {len(first):,} 条")
+    del items, first, again
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    fields, published = make_fields(total)
+    print(f"新闻条数: {total:,}")
+    measure("原实现(md5)", LegacyNewsItem, fields, published, lambda item: item.get_content_hash())
+    measure("NewsItem(md5)", NewsItem, fields, published, lambda item: item.get_content_hash())
+    measure("NewsItem(64位快速哈希)", NewsItem, fields, published, lambda item: item.content_hash64())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Parquet存储对比：每次保存一个文件 vs 按分区追加的数据集（合并前后）
+
+模拟多次运行各保存一小批新闻，然后测量读取全部新闻和只读取一天新闻的耗时。
+
+用法: python benchmarks/bench_parquet_dataset.py [运行次数] [每次新闻条数]
+"""
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pyarrow.dataset as ds
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.storage.parquet_storage import ParquetStorage
+
+SOURCES = ["BBC", "CNN", "Reuters", "AP", "Guardian"]
+DAYS = 30
+
+
+def make_run(run: int, count: int):
+    base = datetime(2025, 9, 1)
+    return [
+        NewsItem(title=f"Story {run}-{i}", content=f"Body {run}-{i} " * 20,
+                 url=f"http://example.com/{run}/{i}",
+                 published_date=base + timedelta(days=run % DAYS, minutes=i),
+                 source=SOURCES[i % len(SOURCES)], keywords=["AI"])
+        for i in range(count)
+    ]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    batches = [make_run(run, count) for run in range(runs)]
+    day = "2025-09-05"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = ParquetStorage(str(Path(tmp) / "files"))
+        _, save_files = timed(lambda: [single.save(batch, f"news_{run}.parquet") for run, batch in enumerate(batches)])
+        files = single.list_files()
+
+        def load_files():
+            return [item for name in files for item in single.load(name)]
+
+        def load_files_day():
+            return [item for item in load_files() if item.published_date.strftime("%Y-%m-%d") == day]
+
+        all_files, read_files = timed(load_files)
+        day_files, day_read_files = timed(load_files_day)
+
+        dataset = ParquetStorage(str(Path(tmp) / "dataset"), dataset=True)
+        _, save_dataset = timed(lambda: [dataset.save(batch, f"news_{run}.parquet") for run, batch in enumerate(batches)])
+        fragments = len(list(dataset.dataset_path.rglob("*.parquet")))
+        all_dataset, read_dataset = timed(lambda: dataset.load_dataset())
+        day_dataset, day_read_dataset = timed(lambda: dataset.load_dataset(filter=ds.field("date") == day))
+
+        _, compact_time = timed(dataset.compact)
+        compacted = len(list(dataset.dataset_path.rglob("*.parquet")))
+        all_compacted, read_compacted = timed(lambda: dataset.load_dataset())
+        day_compacted, day_read_compacted = timed(lambda: dataset.load_dataset(filter=ds.field("date") == day))
+
+    assert len(all_files) == len(all_dataset) == len(all_compacted)
+    assert len(day_files) == len(day_dataset) == len(day_compacted)
+
+    print(f"{runs} 次运行 × {count} 条新闻 = {runs * count} 条")
+    print(f"{'方式':<16}{'文件数':>8}{'保存(s)':>10}{'读取全部(s)':>14}{'读取一天(s)':>14}")
+    print(f"{'每次一个文件':<14}{len(files):>8}{save_files:>10.3f}{read_files:>14.3f}{day_read_files:>14.3f}")
+    print(f"{'分区数据集':<15}{fragments:>8}{save_dataset:>10.3f}{read_dataset:>14.3f}{day_read_dataset:>14.3f}")
+    print(f"{'合并后':<16}{compacted:>8}{compact_time:>10.3f}{read_compacted:>14.3f}{day_read_compacted:>14.3f}")
+    print("（合并后一行的保存列为合并耗时）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
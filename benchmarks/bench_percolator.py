@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+常驻查询：一次扫描 + 候选主题 与 每个主题各自匹配（每个主题一个KeywordMatcher）的耗时对比
+
+用法: python benchmarks/bench_percolator.py [新闻条数] [主题数...]
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.keyword_matcher import KeywordMatcher
+from news_agent.core.percolator import Percolator
+
+
+def make_vocabulary(rng, size: int):
+    return ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 9))) for _ in range(size)]
+
+
+def make_texts(rng, vocabulary, count: int, words: int = 150):
+    # 词频近似Zipf分布
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [" ".join(rng.choices(vocabulary, weights, k=words)) for _ in range(count)]
+
+
+def make_queries(rng, vocabulary, count: int):
+    queries = {}
+    for i in range(count):
+        keywords = rng.sample(vocabulary, rng.randint(1, 3))
+        if rng.random() < 0.2:
+            keywords.insert(0, '-' + rng.choice(vocabulary))
+        if rng.random() < 0.2:
+            keywords.append('"' + " ".join(rng.sample(vocabulary, 2)) + '"')
+        queries[f"topic{i}"] = keywords
+    return queries
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sizes = [int(n) for n in sys.argv[2:]] or [1000, 5000, 20000]
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng, 30000)
+    texts = make_texts(rng, vocabulary, items)
+    print(f"新闻条数: {items}, 每条约150个词, 词表 {len(vocabulary):,}")
+
+    for size in sizes:
+        queries = make_queries(rng, vocabulary, size)
+
+        start = time.perf_counter()
+        percolator = Percolator(queries)
+        percolator.match("")  # 建立索引
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        matched = [percolator.match(text) for text in texts]
+        percolate_time = time.perf_counter() - start
+
+        naive_time = None
+        if size <= 5000:
+            matchers = {topic: KeywordMatcher(keywords) for topic, keywords in queries.items()}
+            start = time.perf_counter()
+            expected = [[topic for topic, matcher in matchers.items() if matcher.match(text)] for text in texts]
+            naive_time = time.perf_counter() - start
+            assert expected == matched
+
+        hits = sum(len(topics) for topics in matched) / items
+        line = (f"主题 {size:>6,}: 建索引 {build_time:.2f}s, 常驻查询 {percolate_time / items * 1000:.2f}ms/条 "
+                f"(平均命中 {hits:.1f} 个主题)")
+        if naive_time is not None:
+            line += f", 逐个主题匹配 {naive_time / items * 1000:.2f}ms/条"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+布尔查询：解析耗时（缓存前后），以及化简+短路求值与按原始语法树顺序求值的过滤吞吐对比
+
+用法: python benchmarks/bench_query.py [新闻条数]
+"""
+import random
+import string
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.query import Query, QueryDocument, _Parser, compile_query
+
+QUERY = '(AI OR "machine learning" OR llm) AND -crypto AND -(sponsored OR advertisement) title:(openai OR anthropic OR google)'
+
+
+def make_items(total: int):
+    rng = random.Random(0)
+    vocabulary = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8))) for _ in range(5000)]
+    vocabulary += ["ai", "machine learning", "crypto", "openai", "google", "anthropic"]
+    items = []
+    for i in range(total):
+        title = " ".join(rng.choices(vocabulary, k=8))
+        content = " ".join(rng.choices(vocabulary, k=300))
+        items.append(NewsItem(title=title, content=content, url=f"https://example.com/{i}",
+                              published_date=datetime(2025, 9, 1), source="Bench"))
+    return items
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    items = make_items(total)
+
+    runs = 2000
+    start = time.perf_counter()
+    for _ in range(runs):
+        Query.parse(QUERY)
+    parse_time = (time.perf_counter() - start) / runs
+    compile_query(QUERY)
+    start = time.perf_counter()
+    for _ in range(runs):
+        compile_query(QUERY)
+    cached_time = (time.perf_counter() - start) / runs
+
+    optimized = compile_query(QUERY)
+    unoptimized = Query(QUERY, _Parser(QUERY).parse())
+    start = time.perf_counter()
+    expected = [item for item in items if unoptimized.root.evaluate(QueryDocument.from_item(item))]
+    raw_time = time.perf_counter() - start
+    start = time.perf_counter()
+    matched = optimized.filter(items)
+    optimized_time = time.perf_counter() - start
+    assert matched == expected
+
+    print(f"查询: {QUERY}")
+    print(f"化简后: {optimized.root!r}")
+    print(f"解析+化简: {parse_time * 1e6:.0f}µs/次, 缓存命中: {cached_time * 1e6:.2f}µs/次")
+    print(f"过滤 {total:,} 条（每条约300词，命中 {len(matched)} 条）: "
+          f"原始语法树 {raw_time:.2f}s, 化简+按开销排序 {optimized_time:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+跳转链接解析：逐个GET（下载正文）与并发HEAD、持久缓存命中的耗时对比（本地服务器模拟网络延迟）
+
+用法: python benchmarks/bench_redirects.py [链接数] [延迟毫秒]
+"""
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.redirects import RedirectCache, RedirectResolver
+
+BODY = b"x" * 200_000
+
+
+def start_server(delay: float, hosts: int):
+    """每个端口模拟一个主机：/r/<n> 跳转到 /article/<n>"""
+    class Handler(BaseHTTPRequestHandler):
+        def respond(self, with_body):
+            time.sleep(delay)
+            if self.path.startswith('/r/'):
+                self.send_response(302)
+                self.send_header("Location", self.path.replace('/r/', '/article/'))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            if with_body:
+                self.wfile.write(BODY)
+
+        def do_HEAD(self):
+            self.respond(False)
+
+        def do_GET(self):
+            self.respond(True)
+
+        def log_message(self, *args):
+            pass
+
+    servers = []
+    for _ in range(hosts):
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+    return servers
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    delay = (int(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    servers = start_server(delay, hosts=8)
+    urls = [f"http://127.0.0.1:{servers[i % 8].server_address[1]}/r/{i}" for i in range(total)]
+
+    with requests.Session() as session:
+        start = time.perf_counter()
+        for url in urls:
+            session.get(url, timeout=10).url
+        sequential = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = str(Path(tmp) / "redirects.sqlite3")
+        resolver = RedirectResolver(RedirectCache(cache_path), hosts=(), max_workers=16, per_host_limit=2)
+        start = time.perf_counter()
+        mapping = resolver.resolve_urls(urls)
+        concurrent = time.perf_counter() - start
+        assert len(mapping) == total
+        resolver.close()
+
+        cached_resolver = RedirectResolver(RedirectCache(cache_path), hosts=())
+        start = time.perf_counter()
+        assert cached_resolver.resolve_urls(urls) == mapping
+        cached = time.perf_counter() - start
+        cached_resolver.close()
+
+    for httpd in servers:
+        httpd.shutdown()
+    print(f"链接数: {total}, 8个主机, 每次请求延迟 {delay * 1000:.0f}ms")
+    print(f"逐个GET（跟随跳转并下载正文）: {sequential:.2f}s")
+    print(f"并发HEAD（16线程，每主机2个）: {concurrent:.2f}s")
+    print(f"下次运行命中缓存: {cached * 1000:.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+RSS条目处理吞吐量：旧的清理 + 逐条匹配 vs 快速清理 + 子串预筛选
+
+生成带大段HTML正文（content:encoded）的RSS文档，feedparser解析一次后，
+分别用旧流程和新流程把条目转换为NewsItem元组。新流程用 str.replace 还原常见实体
+（旧流程不还原实体），清理后先用子串查找丢弃不含任何正向词项的条目，再做完整匹配。
+
+用法: python benchmarks/bench_rss_entries.py [条目数] [匹配比例]
+"""
+import re
+import sys
+import time
+from pathlib import Path
+
+import feedparser
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.rss import RSSSource
+
+KEYWORDS = ["人工智能", "machine learning", "-crypto"]
+
+
+class LegacyRSSSource(RSSSource):
+    """旧流程：每个条目都先清理全文再做关键词过滤"""
+
+    def _entry_to_row(self, entry, timestamp, keywords=None, matcher=None, feed_title=None):
+        title = getattr(entry, 'title', '')
+        content = self._extract_content(entry)
+        link = getattr(entry, 'link', '')
+        author = getattr(entry, 'author', None)
+        if keywords and not self._match_keywords(title + ' ' + content, keywords):
+            return None
+        summary = getattr(entry, 'summary', '')[:500] + '...' if len(getattr(entry, 'summary', '')) > 500 else getattr(entry, 'summary', '')
+        return (title, content, link, timestamp, author, summary)
+
+    def _clean_html(self, text):
+        clean = re.compile('<.*?>')
+        return re.sub(clean, '', text)
+
+
+def build_feed(count: int, match_every: int) -> bytes:
+    paragraph = "<p>Lorem ipsum <a href='http://example.com'>dolor</a> sit amet &amp; more.</p>\n" * 60
+    items = []
+    for i in range(count):
+        topic = "人工智能" if i % match_every == 0 else "weather"
+        items.append(
+            f"<item><title>Story {i} about {topic}</title>"
+            f"<link>http://example.com/{i}</link><guid>g{i}</guid>"
+            f"<description><![CDATA[<p>Summary {i}: {topic}</p>]]></description>"
+            f"<content:encoded><![CDATA[<div>{paragraph}</div>]]></content:encoded>"
+            f"<pubDate>Mon, 01 Sep 2025 10:00:00 GMT</pubDate></item>"
+        )
+    return (
+        '<?xml version="1.0"?><rss version="2.0" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>'
+        f"<title>Bench</title>{''.join(items)}</channel></rss>"
+    ).encode()
+
+
+def run(source: RSSSource, entries):
+    start = time.perf_counter()
+    parsed = source._parse_entries(entries, "Bench", KEYWORDS)
+    return time.perf_counter() - start, parsed.rows
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    match_ratio = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    match_every = max(1, round(1 / match_ratio))
+
+    feed = feedparser.parse(build_feed(count, match_every))
+    entries = feed.entries
+
+    old_time, old_rows = run(LegacyRSSSource([]), entries)
+    new_time, new_rows = run(RSSSource([]), entries)
+
+    assert [row[2] for row in old_rows] == [row[2] for row in new_rows]
+    print(f"条目数: {len(entries)}, 匹配: {len(new_rows)}")
+    print(f"先清理再过滤: {old_time:.3f}s ({len(entries) / old_time:,.0f} 条/秒)")
+    print(f"清理后预筛选: {new_time:.3f}s ({len(entries) / new_time:,.0f} 条/秒)")
+    print(f"加速比: {old_time / new_time:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
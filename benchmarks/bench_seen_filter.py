@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+已见过滤器规模测试：写入N个键后测量内存占用、批量查询耗时和实际误判率
+
+用法: python benchmarks/bench_seen_filter.py [键数] [误判率]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.storage.seen_filter import SeenFilter
+
+CHUNK = 100_000
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    error_rate = float(sys.argv[2]) if len(sys.argv) > 2 else 0.001
+    rng = np.random.default_rng(0)
+
+    seen = SeenFilter(error_rate=error_rate, capacity=1_000_000, generations=4)
+    start = time.perf_counter()
+    for offset in range(0, total, CHUNK):
+        seen.add(rng.integers(-2 ** 63, 2 ** 63 - 1, size=min(CHUNK, total - offset), dtype=np.int64), now=0)
+    insert_time = time.perf_counter() - start
+
+    probes = rng.integers(-2 ** 63, 2 ** 63 - 1, size=1_000_000, dtype=np.int64)
+    start = time.perf_counter()
+    false_positives = seen.contains(probes).sum()
+    lookup_time = time.perf_counter() - start
+
+    print(f"键数: {total:,}, 设定误判率: {error_rate}")
+    print(f"写入: {insert_time:.2f}s ({total / insert_time:,.0f} 键/秒)")
+    print(f"查询100万个新键: {lookup_time * 1000:.0f}ms, 实际误判率 {false_positives / len(probes):.5f}")
+    print(f"内存: {seen.nbytes / 1024 / 1024:.2f} MB ({seen.nbytes / total * 8:.1f} 位/键, "
+          f"每百万个键 {seen.nbytes / total * 1_000_000 / 1024 / 1024:.2f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
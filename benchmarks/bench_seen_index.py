@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+已保存新闻索引规模测试：写入N条新闻后测量批量查询耗时和磁盘占用
+
+用法: python benchmarks/bench_seen_index.py [新闻条数] [查询批大小]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.storage.seen_index import SeenIndex
+
+CHUNK = 100_000
+
+
+def make_items(start: int, count: int):
+    published = datetime(2025, 9, 1)
+    return [
+        NewsItem(title=f"Story {i}", content=f"Body {i}", url=f"http://example.com/{i}",
+                 published_date=published, source="Bench")
+        for i in range(start, start + count)
+    ]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "seen.db")
+        index = SeenIndex(path)
+
+        start = time.perf_counter()
+        for offset in range(0, total, CHUNK):
+            index.mark_seen(make_items(offset, min(CHUNK, total - offset)))
+        insert_time = time.perf_counter() - start
+
+        # 一半已存在、一半新出现
+        query = make_items(total - batch // 2, batch)
+        rounds = 20
+        start = time.perf_counter()
+        for _ in range(rounds):
+            unseen = index.filter_unseen(query)
+        lookup_time = (time.perf_counter() - start) / rounds
+        assert len(unseen) == batch - batch // 2
+
+        index.close()
+        size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+
+    keys = total * 2
+    print(f"新闻条数: {total:,} ({keys:,} 个键)")
+    print(f"写入: {insert_time:.1f}s ({total / insert_time:,.0f} 条/秒)")
+    print(f"批量查询 {batch} 条: {lookup_time * 1000:.1f}ms ({batch / lookup_time:,.0f} 条/秒)")
+    print(f"磁盘占用: {size / 1024 / 1024:.1f} MB ({size / keys:.1f} 字节/键)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+链接规范化效果：读取已保存的数据文件，比较按原始链接和按规范化链接去重的结果，
+并测量批量规范化的速度
+
+用法: python benchmarks/bench_url_canonical.py [数据目录]
+"""
+import sys
+import time
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.url_canonical import canonicalize_url, canonicalize_urls
+from news_agent.storage.manager import StorageManager
+
+
+def load_all(directory: str):
+    manager = StorageManager(directory)
+    items = []
+    for fmt, files in manager.list_files().items():
+        for filename in sorted(files):
+            try:
+                items.extend(manager.load_news(filename, fmt))
+            except Exception as e:
+                print(f"跳过 {filename}: {e}")
+    return items
+
+
+def report(label: str, urls, keys):
+    unique_urls = len(set(urls))
+    unique_items = len(set(keys))
+    print(f"{label}: {len(keys)} 条, 不同链接 {unique_urls}, 去重后 {unique_items} 条"
+          f"（去重命中 {len(keys) - unique_items} 条, {1 - unique_items / len(keys):.1%}）")
+    return unique_items
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else str(Path(__file__).parent.parent / "data")
+    items = load_all(directory)
+    if not items:
+        print("没有可用的数据")
+        return 1
+
+    # 条目保留原始链接，去重键（identity_key）使用规范化链接
+    before = report("原始链接", [item.url for item in items],
+                    [(item.url, item.title.strip().lower()) for item in items])
+    urls = canonicalize_urls(item.url for item in items)
+    after = report("规范化后", urls, [item.identity_key for item in items])
+    print(f"额外合并: {before - after} 条")
+
+    changed = [(item.url, url) for item, url in zip(items, urls) if item.url != url]
+    print(f"被改写的链接: {len(changed)} 条，示例:")
+    for old, new in changed[:5]:
+        print(f"  {old[:90]}\n    -> {new[:90]}")
+
+    # 批量规范化速度（相同链接只计算一次；清空缓存以测量冷启动）
+    sample = [item.url for item in items] * max(1, 100_000 // len(items))
+    canonicalize_url.cache_clear()
+    start = time.perf_counter()
+    canonicalize_urls(sample)
+    elapsed = time.perf_counter() - start
+    print(f"批量规范化 {len(sample):,} 条: {elapsed * 1000:.1f}ms")
+
+    distinct = [f"https://www.example.com/news/{i}/?utm_source=rss&id={i}" for i in range(100_000)]
+    canonicalize_url.cache_clear()
+    start = time.perf_counter()
+    canonicalize_urls(distinct)
+    elapsed = time.perf_counter() - start
+    print(f"规范化 {len(distinct):,} 条不同链接: {elapsed:.2f}s ({len(distinct) / elapsed:,.0f} 条/秒)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,7 @@
+import json
+import time
+from typing import List
+
 import click
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
@@ -5,10 +9,19 @@ from rich.panel import Panel
 from rich.table import Table
 
 from ..core.config import config
-from ..core.data_sources.rss import RSSSource
+from ..core.data_sources.rss import (
+    RSSSource, FEED_STATUS_NEW, FEED_STATUS_NOT_MODIFIED, FEED_STATUS_UNCHANGED, FEED_STATUS_SKIPPED
+)
+from ..core.feed_state import FeedStateStore
+from ..core.feed_health import FeedHealthRegistry
+from ..core.near_duplicates import NearDuplicateDetector, DuplicateGroup
+from ..core.merge import merge_news
+from ..core.redirects import RedirectResolver
+from ..core.query import QuerySyntaxError, compile_query, is_query
+from ..core.opml import OPMLFeed, parse_opml, build_opml, validate_feeds
 from ..core.data_sources.google_search import GoogleSearchSource, GoogleSearchOptions
 from ..core.data_sources.bing_search import BingSearchSource, BingSearchOptions
-from ..core.scheduler import scheduler
+from ..core.scheduler import get_scheduler
 from ..storage.manager import StorageManager
 
 console = Console()
@@ -22,8 +35,12 @@ def cli():
 
 
 @cli.command()
-@click.option('--keywords', '-k', multiple=True, help='搜索关键词（支持多种模式：普通匹配、"精确匹配"、-排除词、短语匹配）')
-@click.option('--format', '-f', default=None, help='输出格式（json/csv/parquet）')
+@click.option('--keywords', '-k', multiple=True,
+              help='搜索关键词（支持多种模式：普通匹配、"精确匹配"、-排除词、短语匹配）；'
+                   '只指定一个时可以是查询语句，如 \'(AI OR "machine learning") AND -crypto title:OpenAI\'；'
+                   '含有大写的 AND/OR/NOT 或 字段:词（冒号后无空格）时才按查询语句解析，'
+                   '括号只在查询语句中表示分组，单独的括号按普通关键词处理')
+@click.option('--format', '-f', default=None, help='输出格式（json/jsonl/csv/parquet）')
 @click.option('--output', '-o', help='输出文件名')
 @click.option('--source', '-s', default='rss', help='数据源类型（rss/google/bing）')
 @click.option('--sites', multiple=True, help='Google搜索限制网站 (例如: --sites cnn.com --sites bbc.com)')
@@ -31,13 +48,23 @@ def cli():
 @click.option('--before', help='Google搜索日期限制，之前 (格式: YYYY-MM-DD)')
 @click.option('--exclude', multiple=True, help='Google搜索排除词')
 @click.option('--recent-days', type=int, help='搜索最近N天的内容')
-def fetch(keywords, format, output, source, sites, after, before, exclude, recent_days):
+@click.option('--conditional', is_flag=True, help='RSS条件请求：跳过自上次使用相同关键词获取后未更新的源')
+@click.option('--since-last', is_flag=True, help='RSS增量获取：只处理上次使用相同关键词获取之后的新条目')
+@click.option('--include-seen', is_flag=True, help='同时保存以前运行中使用相同关键词已保存过的新闻')
+@click.option('--limit', type=int, help='最多保留的新闻条数（RSS保留最新的N条）')
+@click.option('--resolve-redirects', is_flag=True, help='联网解析跳转链接和短链接，得到文章的最终URL后再去重')
+@click.option('--near-duplicates', is_flag=True, help='合并近似重复的新闻（不同网站转载的同一篇报道），只保留一条')
+def fetch(keywords, format, output, source, sites, after, before, exclude, recent_days, conditional, since_last,
+          include_seen, limit, resolve_redirects, near_duplicates):
     """获取新闻数据"""
     if not keywords:
         console.print("[red]错误: 请至少指定一个关键词[/red]")
         return
     
     keywords_list = list(keywords)
+    if not _check_query(keywords_list):
+        return
+    resolver = _redirect_resolver(resolve_redirects)
     
     # 显示任务信息面板
     info_panel = Panel(
@@ -54,7 +81,7 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
     format_name = format or storage_config.format
     
     # 初始化存储管理器
-    storage_manager = StorageManager(storage_config.directory)
+    storage_manager = StorageManager.from_config(storage_config)
     
     if source == 'rss':
         # 检查RSS配置
@@ -64,7 +91,20 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
             return
         
         # 创建RSS数据源
-        rss_source = RSSSource(ds_config.rss_sources, ds_config.rss_timeout)
+        cache_store = None
+        if conditional:
+            cache_store = FeedStateStore.for_name(
+                ds_config.rss_state_dir, RSSSource.state_name('cache', keywords_list)
+            )
+        cursor_store = None
+        if since_last:
+            cursor_store = FeedStateStore.for_name(
+                ds_config.rss_state_dir, RSSSource.state_name('cursor', keywords_list)
+            )
+        health = FeedHealthRegistry.from_config(ds_config) if ds_config.rss_circuit_breaker else None
+        rss_source = RSSSource.from_config(
+            ds_config, cache_store=cache_store, cursor_store=cursor_store, health=health
+        )
         
         try:
             # 使用进度条显示获取进度
@@ -82,44 +122,47 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
                     total=len(ds_config.rss_sources)
                 )
                 
-                all_news = []
+                feed_streams = []
                 successful_sources = 0
                 failed_sources = []
+                status_counts = {}
+                bytes_saved = 0
+                parse_time_saved = 0.0
+                skipped_entries = 0
+                json_feeds = []
                 
-                # 逐个处理RSS源
-                raw_news_count = 0
-                for i, url in enumerate(ds_config.rss_sources):
-                    progress.update(main_task, description=f"处理RSS源 {i+1}/{len(ds_config.rss_sources)}: {url[:50]}...")
+                # 并发处理RSS源，按完成顺序更新进度
+                for i, result in enumerate(rss_source.iter_fetch(keywords_list)):
+                    progress.update(
+                        main_task, advance=1,
+                        description=f"已完成RSS源 {i+1}/{len(ds_config.rss_sources)}: {result.url[:50]}..."
+                    )
                     
-                    try:
-                        news_items = rss_source._fetch_from_url(url, keywords_list)
-                        all_news.extend(news_items)
-                        raw_news_count += len(news_items)
-                        successful_sources += 1
-                        progress.update(main_task, advance=1)
-                    except Exception as e:
-                        failed_sources.append((url, str(e)))
-                        progress.update(main_task, advance=1)
+                    status_counts[result.status] = status_counts.get(result.status, 0) + 1
+                    bytes_saved += result.bytes_saved
+                    parse_time_saved += result.parse_time_saved
+                    skipped_entries += result.skipped_entries
+                    
+                    if result.status == FEED_STATUS_SKIPPED:
                         continue
+                    if result.json_feed:
+                        json_feeds.append(result.url)
+                    if result.ok:
+                        feed_streams.append(result.items)
+                        successful_sources += 1
+                    else:
+                        failed_sources.append((result.url, result.error))
                 
-                # 进行去重处理
-                progress.update(main_task, description="正在去重和排序...")
-                unique_news = list(set(all_news))
+                if resolver is not None:
+                    progress.update(main_task, description="正在解析跳转链接...")
+                    feed_streams = resolver.resolve_streams(feed_streams)
                 
-                # 内容哈希去重
-                if len(unique_news) != len(all_news):
-                    content_hashes = set()
-                    final_news = []
-                    for item in unique_news:
-                        content_hash = item.get_content_hash()
-                        if content_hash not in content_hashes:
-                            content_hashes.add(content_hash)
-                            final_news.append(item)
-                    unique_news = final_news
+                # 各源的新闻按时间归并，同时去重，达到数量上限即停止
+                progress.update(main_task, description="正在去重和排序...")
+                all_news, merge_stats = merge_news(feed_streams, limit=limit)
                 
-                # 按时间排序
-                unique_news.sort(key=lambda x: x.published_date, reverse=True)
-                all_news = unique_news
+                # 合并近似重复（不同RSS源转载的同一篇报道）
+                all_news, near_groups = _collapse_near_duplicates(all_news, near_duplicates)
                 
                 progress.update(main_task, description="数据处理完成")
             
@@ -130,31 +173,52 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
             
             result_table.add_row("成功RSS源", str(successful_sources))
             result_table.add_row("失败RSS源", str(len(failed_sources)))
-            result_table.add_row("原始新闻数", str(raw_news_count))
+            if status_counts.get(FEED_STATUS_SKIPPED):
+                result_table.add_row("熔断跳过", str(status_counts[FEED_STATUS_SKIPPED]))
+            if conditional:
+                result_table.add_row("有更新", str(status_counts.get(FEED_STATUS_NEW, 0)))
+                result_table.add_row("未修改(304)", str(status_counts.get(FEED_STATUS_NOT_MODIFIED, 0)))
+                result_table.add_row("内容未变", str(status_counts.get(FEED_STATUS_UNCHANGED, 0)))
+                result_table.add_row("节省下载", f"{bytes_saved / 1024:.1f} KB")
+                result_table.add_row("节省解析时间", f"{parse_time_saved:.2f} 秒")
+            if since_last:
+                result_table.add_row("跳过已处理条目", str(skipped_entries))
+            if json_feeds:
+                result_table.add_row("JSON Feed快速解析", str(len(json_feeds)))
+            _add_redirect_rows(result_table, resolver)
+            result_table.add_row("原始新闻数", str(merge_stats.raw))
             result_table.add_row("去重后新闻数", str(len(all_news)))
-            if raw_news_count > len(all_news):
-                result_table.add_row("去重数量", str(raw_news_count - len(all_news)))
+            if merge_stats.removed:
+                result_table.add_row("去重数量", str(merge_stats.removed))
+            if merge_stats.stopped_early:
+                result_table.add_row("超出数量上限未处理", str(merge_stats.skipped))
+            if near_groups:
+                result_table.add_row("近似重复合并", str(sum(len(g.aliases) for g in near_groups)))
+            if storage_manager.seen_index is not None and not include_seen:
+                result_table.add_row("以前未保存的新闻", str(len(storage_manager.filter_unseen(all_news, keywords_list))))
             
             console.print(result_table)
             
+            # 显示走JSON Feed快速路径的RSS源
+            if json_feeds:
+                console.print("\n[cyan]以下RSS源为JSON Feed，已跳过feedparser直接解析:[/cyan]")
+                for url in json_feeds:
+                    console.print(f"  [green]⚡[/green] {url}")
+            
             # 显示失败的RSS源
             if failed_sources:
                 console.print("\n[yellow]警告: 以下RSS源获取失败:[/yellow]")
                 for url, error in failed_sources:
                     console.print(f"  [red]×[/red] {url}: {error}")
             
+            _print_near_duplicates(near_groups)
+            
             if not all_news:
                 console.print("[yellow]未找到匹配的新闻[/yellow]")
                 return
             
             # 保存数据
-            with console.status("[bold green]正在保存数据..."):
-                filename = output or None
-                saved_path = storage_manager.save_news(
-                    all_news, keywords_list, format_name, filename
-                )
-            
-            console.print(f"\n[bold green]✓ 新闻已保存至: {saved_path}[/bold green]")
+            _save_news(storage_manager, all_news, keywords_list, format_name, output, include_seen)
             
         except Exception as e:
             console.print(f"[red]获取新闻时出错: {e}[/red]")
@@ -199,7 +263,8 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
                 delay=ds_config.google_search_delay,
                 max_results=ds_config.google_search_max_results,
                 headless=ds_config.google_search_headless,
-                proxy_config=proxy_config
+                proxy_config=proxy_config,
+                redirect_resolver=resolver
             )
             
             # 显示搜索选项
@@ -220,30 +285,31 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
             
             # 获取新闻
             with console.status("[bold blue]正在进行Google搜索..."):
-                all_news = google_source.fetch_news(keywords_list, search_options=search_options)
+                all_news = google_source.fetch_news(keywords_list, search_options=search_options, limit=limit)
             
             if not all_news:
                 console.print("[yellow]未找到匹配的新闻[/yellow]")
                 return
             
+            found_count = len(all_news)
+            all_news, near_groups = _collapse_near_duplicates(all_news, near_duplicates)
+            
             # 显示结果统计
             result_table = Table(title="Google搜索结果")
             result_table.add_column("项目", style="cyan")
             result_table.add_column("数量", style="green")
             
-            result_table.add_row("找到新闻数", str(len(all_news)))
+            result_table.add_row("找到新闻数", str(found_count))
+            _add_redirect_rows(result_table, resolver)
+            if near_groups:
+                result_table.add_row("近似重复合并", str(found_count - len(all_news)))
             result_table.add_row("搜索关键词", ", ".join(keywords_list))
             
             console.print(result_table)
+            _print_near_duplicates(near_groups)
             
             # 保存数据
-            with console.status("[bold green]正在保存数据..."):
-                filename = output or None
-                saved_path = storage_manager.save_news(
-                    all_news, keywords_list, format_name, filename
-                )
-            
-            console.print(f"\n[bold green]✓ 新闻已保存至: {saved_path}[/bold green]")
+            _save_news(storage_manager, all_news, keywords_list, format_name, output, include_seen)
             
         except Exception as e:
             console.print(f"[red]Google搜索时出错: {e}[/red]")
@@ -292,7 +358,8 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
                 max_results=getattr(ds_config, 'bing_search_max_results', 50),
                 market=getattr(ds_config, 'bing_search_market', 'zh-CN'),
                 safe_search=getattr(ds_config, 'bing_search_safe_search', 'Moderate'),
-                proxy_config=proxy_config
+                proxy_config=proxy_config,
+                redirect_resolver=resolver
             )
             
             # 显示搜索选项
@@ -313,31 +380,32 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
             
             # 获取新闻
             with console.status("[bold blue]正在进行Bing搜索..."):
-                all_news = bing_source.fetch_news(keywords_list, search_options=search_options)
+                all_news = bing_source.fetch_news(keywords_list, search_options=search_options, limit=limit)
             
             if not all_news:
                 console.print("[yellow]未找到匹配的新闻[/yellow]")
                 return
             
+            found_count = len(all_news)
+            all_news, near_groups = _collapse_near_duplicates(all_news, near_duplicates)
+            
             # 显示结果统计
             result_table = Table(title="Bing搜索结果")
             result_table.add_column("项目", style="cyan")
             result_table.add_column("数量", style="green")
             
-            result_table.add_row("找到新闻数", str(len(all_news)))
+            result_table.add_row("找到新闻数", str(found_count))
+            _add_redirect_rows(result_table, resolver)
+            if near_groups:
+                result_table.add_row("近似重复合并", str(found_count - len(all_news)))
             result_table.add_row("搜索关键词", ", ".join(keywords_list))
             result_table.add_row("使用API", "是" if api_key else "否")
             
             console.print(result_table)
+            _print_near_duplicates(near_groups)
             
             # 保存数据
-            with console.status("[bold green]正在保存数据..."):
-                filename = output or None
-                saved_path = storage_manager.save_news(
-                    all_news, keywords_list, format_name, filename
-                )
-            
-            console.print(f"\n[bold green]✓ 新闻已保存至: {saved_path}[/bold green]")
+            _save_news(storage_manager, all_news, keywords_list, format_name, output, include_seen)
             
         except Exception as e:
             console.print(f"[red]Bing搜索时出错: {e}[/red]")
@@ -347,6 +415,68 @@ def fetch(keywords, format, output, source, sites, after, before, exclude, recen
         console.print("[cyan]支持的数据源: rss, google, bing[/cyan]")
 
 
+def _save_news(storage_manager: StorageManager, all_news, keywords_list, format_name, output, include_seen):
+    """保存新闻（默认跳过以前运行中已保存过的新闻）并输出结果"""
+    with console.status("[bold green]正在保存数据..."):
+        saved_path = storage_manager.save_news(
+            all_news, keywords_list, format_name, output or None, skip_seen=not include_seen
+        )
+    
+    if saved_path is None:
+        console.print("\n[yellow]没有新的新闻，所有新闻均已在以前保存过（使用 --include-seen 强制保存）[/yellow]")
+        return
+    console.print(f"\n[bold green]✓ 新闻已保存至: {saved_path}[/bold green]")
+
+
+def _check_query(keywords_list) -> bool:
+    """单个参数为查询语句时检查语法，出错时打印错误并返回False"""
+    if not is_query(keywords_list):
+        return True
+    try:
+        compile_query(keywords_list[0])
+    except QuerySyntaxError as e:
+        console.print(f"[red]查询语句错误: {e}[/red]")
+        return False
+    return True
+
+
+def _redirect_resolver(enabled: bool = False):
+    """按命令行参数或配置创建跳转链接解析器，未启用时返回None"""
+    if not (enabled or config.search.resolve_redirects):
+        return None
+    return RedirectResolver.from_config(config.search, config.storage)
+
+
+def _add_redirect_rows(table: Table, resolver):
+    """在结果统计表中加入跳转链接解析的统计"""
+    if resolver is None or not resolver.stats.candidates:
+        return
+    stats = resolver.stats
+    table.add_row("跳转链接", f"{stats.candidates}（缓存命中 {stats.cached}，解析 {stats.resolved}，失败 {stats.failed}）")
+    table.add_row("替换为最终URL", str(stats.changed))
+
+
+def _collapse_near_duplicates(all_news, enabled: bool = False):
+    """按命令行参数或配置合并近似重复的新闻，返回 (保留的新闻, 含别名的重复组)"""
+    search_config = config.search
+    if not (enabled or search_config.near_duplicates) or len(all_news) < 2:
+        return all_news, []
+    return NearDuplicateDetector.from_config(search_config).dedupe(all_news)
+
+
+def _print_near_duplicates(groups: List[DuplicateGroup], limit: int = 10):
+    """列出被合并的近似重复组（最多limit组）"""
+    if not groups:
+        return
+    console.print("\n[cyan]以下新闻与其他来源的报道近似重复，只保留一条:[/cyan]")
+    for group in groups[:limit]:
+        console.print(f"  [green]≈[/green] {group.representative.title[:60]}（另有 {len(group.aliases)} 条）")
+        for url in group.alias_urls:
+            console.print(f"      {url}")
+    if len(groups) > limit:
+        console.print(f"  ... 另有 {len(groups) - limit} 组")
+
+
 @cli.group()
 def config_cmd():
     """配置管理"""
@@ -399,8 +529,160 @@ def list_rss():
         click.echo(f"  {i}. {source}")
 
 
+@config_cmd.command('import-opml')
+@click.argument('opml_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--no-validate', is_flag=True, help='不校验，直接导入所有RSS源')
+@click.option('--min-entries', type=int, default=1, help='校验时至少包含多少条目才导入（默认1）')
+@click.option('--replace', is_flag=True, help='替换现有RSS源列表（默认追加）')
+@click.option('--workers', type=int, help='并发校验的RSS源数量（默认使用配置中的max_workers）')
+@click.option('--json', 'as_json', is_flag=True, help='以JSON输出校验报告')
+def import_opml(opml_file, no_validate, min_entries, replace, workers, as_json):
+    """从OPML文件批量导入RSS源"""
+    with open(opml_file, 'rb') as f:
+        try:
+            feeds = parse_opml(f.read())
+        except ValueError as e:
+            console.print(f"[red]错误: {e}[/red]")
+            return
+    
+    current_sources = config.get('data_sources.rss.sources', []) or []
+    existing = set() if replace else set(current_sources)
+    new_urls = [feed.url for feed in feeds if feed.url not in existing]
+    
+    report = []
+    accepted = new_urls
+    if new_urls and not no_validate:
+        ds_config = config.data_sources
+        options = {'max_retries': 1}
+        if workers:
+            options['max_workers'] = workers
+        rss_source = RSSSource.from_config(ds_config, **options)
+        
+        results = {}
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console,
+            disable=as_json
+        ) as progress:
+            task = progress.add_task(f"正在校验 {len(new_urls)} 个RSS源...", total=len(new_urls))
+            for validation in validate_feeds(rss_source, new_urls):
+                if validation.ok and validation.entries < min_entries:
+                    validation.ok = False
+                    validation.error = f"条目数不足 ({validation.entries} < {min_entries})"
+                results[validation.url] = validation
+                progress.update(task, advance=1)
+        
+        report = [results[url] for url in new_urls]
+        accepted = [v.url for v in report if v.ok]
+    
+    # 一次写入配置
+    merged = list(dict.fromkeys(([] if replace else current_sources) + accepted))
+    if accepted or replace:
+        config.set_user_config('data_sources.rss.sources', merged)
+    
+    if as_json:
+        click.echo(json.dumps({
+            'total': len(feeds),
+            'existing': len(feeds) - len(new_urls),
+            'imported': len(accepted),
+            'rejected': len(new_urls) - len(accepted),
+            'feeds': [v.to_dict() for v in report]
+        }, ensure_ascii=False, indent=2))
+        return
+    
+    if report:
+        table = Table(title="RSS源校验结果")
+        table.add_column("RSS源", style="cyan", overflow="fold")
+        table.add_column("标题", overflow="fold")
+        table.add_column("状态")
+        table.add_column("条目数", justify="right")
+        table.add_column("耗时", justify="right")
+        table.add_column("错误", overflow="fold")
+        for v in sorted(report, key=lambda v: (v.ok, v.elapsed)):
+            table.add_row(
+                v.url,
+                v.title or "-",
+                "[green]通过[/green]" if v.ok else "[red]失败[/red]",
+                str(v.entries),
+                f"{v.elapsed:.2f}秒",
+                (v.error or "-")[:80]
+            )
+        console.print(table)
+    
+    console.print(
+        f"OPML中共 {len(feeds)} 个RSS源，已存在 {len(feeds) - len(new_urls)} 个，"
+        f"导入 [green]{len(accepted)}[/green] 个，跳过 [red]{len(new_urls) - len(accepted)}[/red] 个"
+    )
+
+
+@config_cmd.command('export-opml')
+@click.argument('opml_file', type=click.Path(dir_okay=False), required=False)
+def export_opml(opml_file):
+    """将已配置的RSS源导出为OPML（未指定文件时输出到终端）"""
+    sources = config.get('data_sources.rss.sources', []) or []
+    content = build_opml(OPMLFeed(url=url) for url in sources)
+    
+    if not opml_file:
+        click.echo(content, nl=False)
+        return
+    
+    with open(opml_file, 'w', encoding='utf-8') as f:
+        f.write(content)
+    click.echo(f"已导出 {len(sources)} 个RSS源至: {opml_file}")
+
+
+@config_cmd.command('rss-health')
+@click.option('--all', 'show_all', is_flag=True, help='显示所有RSS源（默认只显示失败和较慢的源）')
+@click.option('--slow', type=float, default=5.0, help='平均耗时超过多少秒视为较慢（默认5秒）')
+def rss_health(show_all, slow):
+    """查看RSS源健康状况（熔断、失败和较慢的源）"""
+    registry = FeedHealthRegistry.from_config(config.data_sources)
+    rows = registry.report()
+    if not show_all:
+        rows = [r for r in rows if r['state'] != 'ok' or (r['latency_ewma'] or 0) >= slow]
+    
+    if not rows:
+        console.print("[green]所有RSS源状态正常[/green]" if registry.store.urls() else "暂无RSS源健康记录")
+        return
+    
+    state_labels = {
+        'open': '[red]熔断中[/red]',
+        'failing': '[yellow]失败[/yellow]',
+        'ok': '[green]正常[/green]'
+    }
+    table = Table(title="RSS源健康状况")
+    table.add_column("RSS源", style="cyan", overflow="fold")
+    table.add_column("状态")
+    table.add_column("连续失败", justify="right")
+    table.add_column("成功/失败", justify="right")
+    table.add_column("平均耗时", justify="right")
+    table.add_column("最近错误", overflow="fold")
+    table.add_column("恢复时间")
+    
+    for row in rows:
+        latency = row['latency_ewma']
+        latency_text = f"{latency:.2f}秒" if latency is not None else "-"
+        if latency is not None and latency >= slow:
+            latency_text = f"[yellow]{latency_text}[/yellow]"
+        error = row['last_error'] if row['state'] != 'ok' else None
+        table.add_row(
+            row['url'],
+            state_labels[row['state']],
+            str(row['failures']),
+            f"{row['total_successes']}/{row['total_failures']}",
+            latency_text,
+            (error or "-")[:80],
+            row['open_until'] or "-"
+        )
+    
+    console.print(table)
+
+
 @config_cmd.command('set-format')
-@click.argument('format_name', type=click.Choice(['json', 'csv', 'parquet']))
+@click.argument('format_name', type=click.Choice(['json', 'jsonl', 'csv', 'parquet']))
 def set_format(format_name):
     """设置默认存储格式"""
     config.set_user_config('storage.format', format_name)
@@ -665,6 +947,48 @@ def list_files(format):
                 click.echo(f"  - {file}")
 
 
+@cli.command()
+@click.option('--format', '-f', help='文件格式过滤')
+@click.option('--threshold', type=float, help='相似度阈值（默认使用配置中的near_duplicate_threshold）')
+@click.option('--limit', type=int, default=10, help='最多列出多少组（默认10）')
+def duplicates(format, threshold, limit):
+    """查找已保存新闻中的近似重复"""
+    storage_config = config.storage
+    storage_manager = StorageManager(storage_config.directory)
+    
+    all_news = []
+    for fmt, file_list in storage_manager.list_files(format).items():
+        for filename in file_list:
+            try:
+                all_news.extend(storage_manager.load_news(filename, fmt))
+            except Exception as e:
+                console.print(f"[yellow]跳过无法读取的文件 {filename}: {e}[/yellow]")
+    
+    if not all_news:
+        click.echo("未找到任何已保存的新闻")
+        return
+    
+    detector = NearDuplicateDetector.from_config(config.search)
+    if threshold is not None:
+        detector = NearDuplicateDetector(threshold=threshold)
+    
+    start = time.perf_counter()
+    _, groups = detector.dedupe(all_news)
+    elapsed = time.perf_counter() - start
+    
+    table = Table(title="近似重复检测结果")
+    table.add_column("项目", style="cyan")
+    table.add_column("数量", style="green")
+    table.add_row("已保存新闻数", str(len(all_news)))
+    table.add_row("重复组数", str(len(groups)))
+    table.add_row("可合并条目", str(sum(len(g.aliases) for g in groups)))
+    table.add_row("耗时", f"{elapsed:.2f} 秒")
+    console.print(table)
+    
+    groups.sort(key=lambda g: len(g.aliases), reverse=True)
+    _print_near_duplicates(groups, limit)
+
+
 @cli.group()
 def schedule_cmd():
     """调度任务管理"""
@@ -678,9 +1002,11 @@ def schedule_cmd():
 def add_schedule(keywords, interval, time):
     """添加定时任务"""
     keywords_list = list(keywords)
+    if not _check_query(keywords_list):
+        return
     
     try:
-        job_id = scheduler.add_rss_job(keywords_list, interval, time)
+        job_id = get_scheduler().add_rss_job(keywords_list, interval, time)
         click.echo(f"已添加定时任务 #{job_id}")
         click.echo(f"关键词: {', '.join(keywords_list)}")
         if interval:
@@ -694,7 +1020,7 @@ def add_schedule(keywords, interval, time):
 @schedule_cmd.command('list')
 def list_schedules():
     """列出所有定时任务"""
-    jobs = scheduler.list_jobs()
+    jobs = get_scheduler().list_jobs()
     
     if not jobs:
         click.echo("无定时任务")
@@ -709,6 +1035,7 @@ def list_schedules():
 def start_scheduler():
     """启动调度器"""
     try:
+        scheduler = get_scheduler()
         scheduler.start()
         click.echo("调度器已启动")
         click.echo(f"下次运行时间: {scheduler.get_next_run_time()}")
@@ -719,14 +1046,14 @@ def start_scheduler():
 @schedule_cmd.command('stop')
 def stop_scheduler():
     """停止调度器"""
-    scheduler.stop()
+    get_scheduler().stop()
     click.echo("调度器已停止")
 
 
 @schedule_cmd.command('clear')
 def clear_schedules():
     """清除所有任务"""
-    scheduler.clear_jobs()
+    get_scheduler().clear_jobs()
     click.echo("已清除所有任务")
 
 
@@ -4,12 +4,30 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 
+from .redirects import DEFAULT_REDIRECT_HOSTS
+
 
 @dataclass
 class DataSourceConfig:
     rss_enabled: bool = True
     rss_sources: List[str] = field(default_factory=list)
     rss_timeout: int = 30
+    rss_max_workers: int = 8
+    rss_per_host_limit: int = 2
+    rss_connect_timeout: int = 10
+    rss_max_bytes: int = 10 * 1024 * 1024
+    rss_conditional_get: bool = True
+    rss_state_dir: str = "data/.state"
+    rss_parse_workers: int = 0
+    rss_stream_parse: bool = False
+    rss_stream_max_items: int = 0
+    rss_stream_max_age_days: int = 0
+    rss_adaptive_schedule: bool = True
+    rss_min_poll_minutes: int = 30
+    rss_max_poll_minutes: int = 7 * 24 * 60
+    rss_circuit_breaker: bool = True
+    rss_circuit_failures: int = 3
+    rss_circuit_cooldown_minutes: int = 30
     
     news_api_enabled: bool = False
     news_api_key: str = ""
@@ -34,6 +52,20 @@ class StorageConfig:
     format: str = "json"
     directory: str = "data"
     filename_template: str = "news_{date}_{keyword}.{format}"
+    seen_index: bool = True
+    seen_index_path: str = ""
+    seen_track_times: bool = True
+    seen_filter: bool = False
+    seen_filter_error_rate: float = 0.001
+    seen_filter_capacity: int = 1_000_000
+    seen_filter_window_days: int = 30
+    seen_filter_generations: int = 4
+    seen_filter_path: str = ""
+    seen_filter_snapshot_minutes: int = 10
+    parquet_dataset: bool = False
+    parquet_dataset_name: str = "news_dataset.parquet"
+    parquet_partition_by: List[str] = field(default_factory=lambda: ["date", "source"])
+    parquet_row_group_size: int = 65536
 
 
 @dataclass
@@ -48,6 +80,15 @@ class SchedulerConfig:
 class SearchConfig:
     default_keywords: List[str] = field(default_factory=list)
     max_results: int = 100
+    near_duplicates: bool = False
+    near_duplicate_threshold: float = 0.8
+    resolve_redirects: bool = False
+    redirect_hosts: List[str] = field(default_factory=lambda: list(DEFAULT_REDIRECT_HOSTS))
+    redirect_cache_path: str = ""
+    redirect_cache_ttl_days: int = 30
+    redirect_max_workers: int = 8
+    redirect_per_host_limit: int = 2
+    redirect_timeout: int = 10
 
 
 @dataclass
@@ -136,6 +177,22 @@ class ConfigManager:
             rss_enabled=rss_config.get('enabled', True),
             rss_sources=rss_config.get('sources', []),
             rss_timeout=rss_config.get('timeout', 30),
+            rss_max_workers=rss_config.get('max_workers', 8),
+            rss_per_host_limit=rss_config.get('per_host_limit', 2),
+            rss_connect_timeout=rss_config.get('connect_timeout', 10),
+            rss_max_bytes=rss_config.get('max_bytes', 10 * 1024 * 1024),
+            rss_conditional_get=rss_config.get('conditional_get', True),
+            rss_state_dir=rss_config.get('state_dir', 'data/.state'),
+            rss_parse_workers=rss_config.get('parse_workers', 0),
+            rss_stream_parse=rss_config.get('stream_parse', False),
+            rss_stream_max_items=rss_config.get('stream_max_items', 0),
+            rss_stream_max_age_days=rss_config.get('stream_max_age_days', 0),
+            rss_adaptive_schedule=rss_config.get('adaptive_schedule', True),
+            rss_min_poll_minutes=rss_config.get('min_poll_minutes', 30),
+            rss_max_poll_minutes=rss_config.get('max_poll_minutes', 7 * 24 * 60),
+            rss_circuit_breaker=rss_config.get('circuit_breaker', True),
+            rss_circuit_failures=rss_config.get('circuit_failures', 3),
+            rss_circuit_cooldown_minutes=rss_config.get('circuit_cooldown_minutes', 30),
             news_api_enabled=api_config.get('enabled', False),
             news_api_key=api_config.get('api_key', ''),
             google_search_enabled=google_config.get('enabled', False),
@@ -158,7 +215,21 @@ class ConfigManager:
         return StorageConfig(
             format=storage_config.get('format', 'json'),
             directory=storage_config.get('directory', 'data'),
-            filename_template=storage_config.get('filename_template', 'news_{date}_{keyword}.{format}')
+            filename_template=storage_config.get('filename_template', 'news_{date}_{keyword}.{format}'),
+            seen_index=storage_config.get('seen_index', True),
+            seen_index_path=storage_config.get('seen_index_path', ''),
+            seen_track_times=storage_config.get('seen_track_times', True),
+            seen_filter=storage_config.get('seen_filter', False),
+            seen_filter_error_rate=storage_config.get('seen_filter_error_rate', 0.001),
+            seen_filter_capacity=storage_config.get('seen_filter_capacity', 1_000_000),
+            seen_filter_window_days=storage_config.get('seen_filter_window_days', 30),
+            seen_filter_generations=storage_config.get('seen_filter_generations', 4),
+            seen_filter_path=storage_config.get('seen_filter_path', ''),
+            seen_filter_snapshot_minutes=storage_config.get('seen_filter_snapshot_minutes', 10),
+            parquet_dataset=storage_config.get('parquet_dataset', False),
+            parquet_dataset_name=storage_config.get('parquet_dataset_name', 'news_dataset.parquet'),
+            parquet_partition_by=storage_config.get('parquet_partition_by', ['date', 'source']),
+            parquet_row_group_size=storage_config.get('parquet_row_group_size', 65536)
         )
     
     @property
@@ -178,7 +249,16 @@ class ConfigManager:
         search_config = self.get('search', {})
         return SearchConfig(
             default_keywords=search_config.get('default_keywords', []),
-            max_results=search_config.get('max_results', 100)
+            max_results=search_config.get('max_results', 100),
+            near_duplicates=search_config.get('near_duplicates', False),
+            near_duplicate_threshold=search_config.get('near_duplicate_threshold', 0.8),
+            resolve_redirects=search_config.get('resolve_redirects', False),
+            redirect_hosts=search_config.get('redirect_hosts', list(DEFAULT_REDIRECT_HOSTS)),
+            redirect_cache_path=search_config.get('redirect_cache_path', ''),
+            redirect_cache_ttl_days=search_config.get('redirect_cache_ttl_days', 30),
+            redirect_max_workers=search_config.get('redirect_max_workers', 8),
+            redirect_per_host_limit=search_config.get('redirect_per_host_limit', 2),
+            redirect_timeout=search_config.get('redirect_timeout', 10)
         )
     
     @property
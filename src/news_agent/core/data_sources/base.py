@@ -1,10 +1,17 @@
+import hashlib
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
+from ..url_canonical import canonicalize_url
 
-@dataclass
+
+# 内容哈希使用的正文长度
+CONTENT_HASH_CHARS = 500
+
+
+@dataclass(slots=True, eq=False)
 class NewsItem:
     title: str
     content: str
@@ -15,26 +22,64 @@ class NewsItem:
     summary: Optional[str] = None
     keywords: List[str] = None
     
+    # 身份键、哈希值和内容哈希在首次使用时计算并缓存；
+    # 之后不应再修改title/url/content（需要修改时用dataclasses.replace生成新对象）
+    _identity: Optional[Tuple[str, str]] = field(default=None, init=False, repr=False)
+    _hash: Optional[int] = field(default=None, init=False, repr=False)
+    _content_hash: Optional[str] = field(default=None, init=False, repr=False)
+    _content_hash64: Optional[int] = field(default=None, init=False, repr=False)
+    
     def __post_init__(self):
         if self.keywords is None:
             self.keywords = []
     
+    def __getstate__(self):
+        # 不序列化缓存：str的hash在不同进程中不同
+        return tuple(getattr(self, name) for name in _STATE_FIELDS)
+    
+    def __setstate__(self, state):
+        for name, value in zip(_STATE_FIELDS, state):
+            setattr(self, name, value)
+        self._identity = self._hash = self._content_hash = self._content_hash64 = None
+    
+    @property
+    def identity_key(self) -> Tuple[str, str]:
+        """唯一标识：规范化的URL（canonicalize_url）和规范化（去空白、小写）后的标题"""
+        if self._identity is None:
+            self._identity = (canonicalize_url(self.url), self.title.strip().lower())
+        return self._identity
+    
     def __hash__(self):
         # 使用URL和标题的组合作为唯一标识
-        return hash((self.url, self.title.strip().lower()))
+        if self._hash is None:
+            self._hash = hash(self.identity_key)
+        return self._hash
     
     def __eq__(self, other):
         if not isinstance(other, NewsItem):
             return False
+        if self is other:
+            return True
         # 基于URL和标题判断是否为同一条新闻
-        return (self.url == other.url and 
-                self.title.strip().lower() == other.title.strip().lower())
+        return self.__hash__() == other.__hash__() and self.identity_key == other.identity_key
+    
+    def _content_string(self) -> str:
+        return f"{self.identity_key[1]}{self.content[:CONTENT_HASH_CHARS].strip().lower()}"
     
     def get_content_hash(self) -> str:
-        """获取内容哈希，用于更精确的去重"""
-        import hashlib
-        content_str = f"{self.title.strip().lower()}{self.content[:500].strip().lower()}"
-        return hashlib.md5(content_str.encode()).hexdigest()
+        """获取内容哈希（md5十六进制），用于更精确的去重"""
+        if self._content_hash is None:
+            self._content_hash = hashlib.md5(self._content_string().encode()).hexdigest()
+        return self._content_hash
+    
+    def content_hash64(self) -> int:
+        """与get_content_hash基于相同内容的快速非加密哈希（Python内置hash）
+        
+        只在同一进程内可比较，用于一批新闻内的去重；需要持久化时使用get_content_hash。
+        """
+        if self._content_hash64 is None:
+            self._content_hash64 = hash(self._content_string())
+        return self._content_hash64
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -47,6 +92,26 @@ class NewsItem:
             'summary': self.summary,
             'keywords': self.keywords
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NewsItem':
+        """由to_dict的结果（例如JSON文件中的条目）构建"""
+        published_date = data.get('published_date')
+        if isinstance(published_date, str):
+            published_date = datetime.fromisoformat(published_date)
+        return cls(
+            title=data.get('title', ''),
+            content=data.get('content', ''),
+            url=data.get('url', ''),
+            published_date=published_date,
+            source=data.get('source', ''),
+            author=data.get('author'),
+            summary=data.get('summary'),
+            keywords=data.get('keywords', [])
+        )
+
+
+_STATE_FIELDS = ('title', 'content', 'url', 'published_date', 'source', 'author', 'summary', 'keywords')
 
 
 class DataSource(ABC):
@@ -7,6 +7,9 @@ from urllib.parse import quote_plus
 import re
 
 from .base import DataSource, NewsItem
+from ..merge import merge_news
+from ..redirects import RedirectResolver
+from ..query import compile_query, is_query
 
 
 class BingSearchSource(DataSource):
@@ -22,7 +25,7 @@ class BingSearchSource(DataSource):
     
     def __init__(self, api_key: str = None, delay: int = 1, max_results: int = 50, 
                  market: str = "zh-CN", safe_search: str = "Moderate", 
-                 proxy_config: Dict[str, Any] = None):
+                 proxy_config: Dict[str, Any] = None, redirect_resolver: RedirectResolver = None):
         super().__init__("Bing Search")
         self.api_key = api_key
         self.delay = delay
@@ -30,6 +33,7 @@ class BingSearchSource(DataSource):
         self.market = market  # 市场设置，影响搜索结果的语言和地区
         self.safe_search = safe_search  # Off, Moderate, Strict
         self.proxy_config = proxy_config or {}  # 代理配置
+        self.redirect_resolver = redirect_resolver  # 跳转链接解析，为None时保留原链接
         
         # Bing搜索API端点
         self.search_url = "https://api.bing.microsoft.com/v7.0/search"
@@ -143,7 +147,19 @@ class BingSearchSource(DataSource):
         }
     
     def fetch_news(self, keywords: List[str] = None, **kwargs) -> List[NewsItem]:
-        """获取新闻数据"""
+        """获取新闻数据，按相关度顺序去重，limit: 最多保留的条数"""
+        results = self._search(keywords, **kwargs)
+        if keywords and is_query(keywords):
+            query = compile_query(keywords[0])
+            if not query.to_engine_query('bing')[1]:
+                results = query.filter(results)
+        if self.redirect_resolver is not None:
+            results = self.redirect_resolver.resolve_items(results)
+        news, _ = merge_news([results], limit=kwargs.get('limit'), newest_first=False)
+        return news
+    
+    def _search(self, keywords: List[str] = None, **kwargs) -> List[NewsItem]:
+        """执行搜索，返回未去重的结果"""
         if not keywords:
             return []
         
@@ -166,10 +182,14 @@ class BingSearchSource(DataSource):
         """构建Bing搜索查询语句"""
         query_parts = []
         
-        # 基础关键词
-        for keyword in keywords:
-            if keyword.strip():
-                query_parts.append(keyword.strip())
+        if is_query(keywords):
+            # 查询语句下推为引擎语法，引擎不支持的条件在本地过滤
+            query_parts.append(compile_query(keywords[0]).to_engine_query('bing')[0])
+        else:
+            # 基础关键词
+            for keyword in keywords:
+                if keyword.strip():
+                    query_parts.append(keyword.strip())
         
         base_query = " ".join(query_parts)
         
@@ -12,6 +12,10 @@ from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
 
 from .base import DataSource, NewsItem
+from ..url_canonical import unwrap_redirect
+from ..merge import merge_news
+from ..redirects import RedirectResolver
+from ..query import compile_query, is_query
 
 
 class GoogleSearchSource(DataSource):
@@ -29,13 +33,15 @@ class GoogleSearchSource(DataSource):
     """
     
     def __init__(self, delay: int = 3, max_results: int = 50, headless: bool = True, 
-                 proxy_config: Dict[str, Any] = None, use_requests: bool = True):
+                 proxy_config: Dict[str, Any] = None, use_requests: bool = True,
+                 redirect_resolver: RedirectResolver = None):
         super().__init__("Google Search")
         self.delay = delay  # 请求间隔，避免被封
         self.max_results = max_results
         self.headless = headless
         self.proxy_config = proxy_config or {}
         self.use_requests = use_requests  # 优先使用requests，失败时fallback到playwright
+        self.redirect_resolver = redirect_resolver  # 跳转链接解析，为None时保留原链接
         
         # 用户代理池，模拟真实浏览器
         self.user_agents = [
@@ -46,7 +52,19 @@ class GoogleSearchSource(DataSource):
         ]
     
     def fetch_news(self, keywords: List[str] = None, **kwargs) -> List[NewsItem]:
-        """获取新闻数据"""
+        """获取新闻数据，按相关度顺序去重，limit: 最多保留的条数"""
+        results = self._search(keywords, **kwargs)
+        if keywords and is_query(keywords):
+            query = compile_query(keywords[0])
+            if not query.to_engine_query('google')[1]:
+                results = query.filter(results)
+        if self.redirect_resolver is not None:
+            results = self.redirect_resolver.resolve_items(results)
+        news, _ = merge_news([results], limit=kwargs.get('limit'), newest_first=False)
+        return news
+    
+    def _search(self, keywords: List[str] = None, **kwargs) -> List[NewsItem]:
+        """执行搜索，返回未去重的结果"""
         if not keywords:
             return []
         
@@ -79,10 +97,14 @@ class GoogleSearchSource(DataSource):
         """构建Google搜索查询语句"""
         query_parts = []
         
-        # 基础关键词
-        for keyword in keywords:
-            if keyword.strip():
-                query_parts.append(keyword.strip())
+        if is_query(keywords):
+            # 查询语句下推为引擎语法，引擎不支持的条件在本地过滤
+            query_parts.append(compile_query(keywords[0]).to_engine_query('google')[0])
+        else:
+            # 基础关键词
+            for keyword in keywords:
+                if keyword.strip():
+                    query_parts.append(keyword.strip())
         
         base_query = " ".join(query_parts)
         
@@ -296,12 +318,8 @@ class GoogleSearchSource(DataSource):
                     continue
                 
                 # 清理Google重定向URL
-                if url.startswith('/url?q='):
-                    import urllib.parse
-                    try:
-                        url = urllib.parse.unquote(url.split('/url?q=')[1].split('&')[0])
-                    except:
-                        continue
+                if url.startswith('/url?'):
+                    url = unwrap_redirect(url)
                 elif url.startswith('/search') or url.startswith('#') or 'google.com' in url:
                     print(f"  跳过内部链接: {url[:50]}")
                     continue
@@ -555,9 +573,9 @@ class GoogleSearchSource(DataSource):
                     continue
                 
                 url = link_element['href']
-                if url.startswith('/url?q='):
+                if url.startswith('/url?'):
                     # 提取真实URL
-                    url = url.split('/url?q=')[1].split('&')[0]
+                    url = unwrap_redirect(url)
                 
                 # 提取摘要
                 summary_element = item.find('span', {'data-ved': True})
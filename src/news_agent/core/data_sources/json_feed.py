@@ -0,0 +1,104 @@
+import json
+import time
+from types import SimpleNamespace
+from typing import List, Tuple, Optional
+
+from .rss_stream import _parse_iso8601
+
+try:
+    import orjson  # 可选依赖，比标准库json快数倍
+except ImportError:
+    orjson = None
+
+
+JSON_FEED_CONTENT_TYPES = ('application/feed+json', 'application/json')
+
+# 嗅探时检查的文档开头长度
+SNIFF_BYTES = 4096
+
+
+class InvalidJSONFeed(Exception):
+    """不是有效的JSON Feed文档"""
+    pass
+
+
+def is_json_feed(content: bytes, content_type: str = '') -> bool:
+    """根据Content-Type或文档开头判断是否为JSON Feed（jsonfeed.org）"""
+    head = content[:SNIFF_BYTES].lstrip()
+    if head.startswith(b'\xef\xbb\xbf'):
+        head = head[3:].lstrip()
+    if not head.startswith(b'{'):
+        return False
+    if content_type in JSON_FEED_CONTENT_TYPES:
+        return True
+    # 服务器常把JSON Feed标成text/plain等类型，按version字段嗅探
+    return b'jsonfeed.org/version' in head
+
+
+def loads(content: bytes):
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def parse_json_feed(content: bytes) -> Tuple[Optional[str], List[SimpleNamespace]]:
+    """解析JSON Feed，返回 (源标题, 条目列表)
+
+    条目对象与feedparser的entry字段兼容（title/link/id/author/summary/
+    content/published_parsed/updated_parsed），可直接交给RSSSource的条目处理逻辑。
+
+    Raises:
+        InvalidJSONFeed: JSON格式错误或缺少items
+    """
+    try:
+        document = loads(content)
+    except ValueError as e:
+        raise InvalidJSONFeed(f"JSON Feed解析错误: {e}")
+    if not isinstance(document, dict) or not isinstance(document.get('items'), list):
+        raise InvalidJSONFeed("JSON Feed缺少items列表")
+
+    feed_author = _author_name(document)
+    entries = []
+    for item in document['items']:
+        if not isinstance(item, dict):
+            continue
+        fields = {}
+        if item.get('title') is not None:
+            fields['title'] = str(item['title']).strip()
+        link = item.get('url') or item.get('external_url')
+        if link:
+            fields['link'] = link
+        if item.get('id') is not None:
+            fields['id'] = str(item['id'])
+        author = _author_name(item) or feed_author
+        if author:
+            fields['author'] = author
+        if item.get('summary'):
+            fields['summary'] = item['summary']
+        content_value = item.get('content_html') or item.get('content_text')
+        if content_value:
+            fields['content'] = [SimpleNamespace(value=content_value)]
+        published = _parse_date(item.get('date_published'))
+        if published:
+            fields['published_parsed'] = published
+        updated = _parse_date(item.get('date_modified'))
+        if updated:
+            fields['updated_parsed'] = updated
+        entries.append(SimpleNamespace(**fields))
+
+    return document.get('title'), entries
+
+
+def _parse_date(value) -> Optional[time.struct_time]:
+    return _parse_iso8601(value) if isinstance(value, str) else None
+
+
+def _author_name(obj: dict) -> Optional[str]:
+    # 1.1版本为authors列表，1.0版本为author对象
+    authors = obj.get('authors')
+    if isinstance(authors, list) and authors and isinstance(authors[0], dict):
+        return authors[0].get('name')
+    author = obj.get('author')
+    if isinstance(author, dict):
+        return author.get('name')
+    return None
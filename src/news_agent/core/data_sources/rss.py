@@ -1,145 +1,623 @@
 import feedparser
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterator, Union
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+import heapq
 import time
 import re
 import html
+import hashlib
 import requests
 from urllib.parse import urlparse
 import socket
 
 from .base import DataSource, NewsItem
+from .rss_stream import StreamingFeedReader, UnsupportedFeedFormat
+from .json_feed import is_json_feed, parse_json_feed
+from ..merge import merge_news
+from ..redirects import RedirectResolver
+from ..keyword_matcher import KeywordMatcher
+from ..query import Query, compile_filter
+from ..http_client import HTTPClient, FetchResponse, ResponseTooLargeError
+from ..feed_state import FeedStateStore
+from ..feed_schedule import FeedCadence
+from ..feed_health import FeedHealthRegistry
+
+
+# 单个RSS源的获取状态
+FEED_STATUS_NEW = 'new'  # 有更新，已解析
+FEED_STATUS_NOT_MODIFIED = 'not_modified'  # 服务器返回304
+FEED_STATUS_UNCHANGED = 'unchanged'  # 内容哈希与上次相同，跳过解析
+FEED_STATUS_ERROR = 'error'
+FEED_STATUS_SKIPPED = 'skipped'  # 熔断冷却中，本次跳过
+
+# HTML标签（允许跨行）
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+
+# 正文中常见的实体，用 str.replace 还原（比 html.unescape 逐个回调快得多）；&amp; 最后还原
+_COMMON_ENTITIES = (('&lt;', '<'), ('&gt;', '>'), ('&quot;', '"'), ('&#39;', "'"), ('&#039;', "'"),
+                    ('&apos;', "'"), ('&nbsp;', '\xa0'), ('&#160;', '\xa0'))
+# 其余实体（数字实体、&eacute;、缺少分号的 &amp 等）交给 html.unescape
+_OTHER_ENTITY_RE = re.compile(r'&(?!amp;)[#\w]')
+
+
+@dataclass
+class FeedResult:
+    """单个RSS源的获取结果"""
+    url: str
+    items: List[NewsItem] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    status: str = FEED_STATUS_NEW
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0  # 因条件请求/内容未变而节省的下载量（按上次大小估算）
+    parse_time_saved: float = 0.0  # 因跳过解析而节省的时间（按上次耗时估算）
+    skipped_entries: int = 0  # 游标之前、未经处理直接跳过的条目数
+    newest: Optional[float] = None  # 源中最新条目的发布时间（epoch秒）
+    feed_title: Optional[str] = None
+    json_feed: bool = False  # 通过JSON Feed快速路径解析（未经过feedparser）
+    attempts: int = 1
+    retry_after: Optional[float] = None  # 网络错误时等待多少秒后重试（由调度循环处理）
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ParsedFeed:
+    """解析结果的紧凑形式，条目为元组以减少跨进程传输的开销
+    
+    rows: (title, content, link, published_timestamp, author, summary)
+    """
+    feed_title: str
+    rows: List[tuple] = field(default_factory=list)
+    entry_ids: List[str] = field(default_factory=list)
+    newest: Optional[float] = None
+    skipped: int = 0
+    json_feed: bool = False  # 通过JSON Feed快速路径解析
 
 
 class RSSSource(DataSource):
-    def __init__(self, rss_urls: List[str], timeout: int = 30, max_retries: int = 3):
+    # 游标中为每个源保留的最近条目ID数量
+    CURSOR_MAX_IDS = 500
+    
+    def __init__(self, rss_urls: List[str], timeout: int = 30, max_retries: int = 3,
+                 max_workers: int = 8, per_host_limit: int = 2,
+                 connect_timeout: float = 10, max_bytes: int = 10 * 1024 * 1024,
+                 http_client: HTTPClient = None, cache_store: FeedStateStore = None,
+                 cursor_store: FeedStateStore = None, parse_workers: int = 0,
+                 stream_parse: bool = False, stream_max_items: int = 0,
+                 stream_max_age_days: int = 0, cadence: FeedCadence = None,
+                 health: FeedHealthRegistry = None, redirect_resolver: RedirectResolver = None):
         super().__init__("RSS")
         self.rss_urls = rss_urls
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_workers = max(1, max_workers)  # 全局并发数
+        self.per_host_limit = max(1, per_host_limit)  # 单个主机的并发上限
+        
+        # 所有RSS源共用一个keep-alive会话
+        self.http = http_client or HTTPClient(
+            connect_timeout=connect_timeout,
+            read_timeout=timeout,
+            max_bytes=max_bytes,
+            pool_size=max(self.max_workers, self.per_host_limit)
+        )
+        
+        # 条件请求缓存（ETag / Last-Modified / 内容哈希），为None时每次完整获取
+        self.cache_store = cache_store
+        
+        # 增量游标（每个源最新发布时间和最近的条目ID），为None时处理全部条目
+        self.cursor_store = cursor_store
+        
+        # 解析进程数，大于0时网络I/O留在线程中，feedparser解析放到进程池
+        self.parse_workers = max(0, parse_workers)
+        self._parse_pool = None
+        
+        # 流式解析：边下载边解析RSS 2.0 / Atom，达到条目上限或截止时间后停止，
+        # 其他格式回退到feedparser。流式模式下解析在下载线程中进行。
+        self.stream_parse = stream_parse
+        self.stream_max_items = max(0, stream_max_items)
+        self.stream_max_age_days = max(0, stream_max_age_days)
+        
+        # 自适应检查周期，为None时不记录更新历史
+        self.cadence = cadence
+        
+        # 源健康记录与熔断器，为None时不跳过任何源
+        self.health = health
+        
+        # 跳转链接解析（聚合器/短链接 → 文章URL），为None时保留原链接
+        self.redirect_resolver = redirect_resolver
+    
+    @classmethod
+    def from_config(cls, ds_config, **kwargs) -> 'RSSSource':
+        """根据DataSourceConfig创建RSS数据源"""
+        options = dict(
+            timeout=ds_config.rss_timeout,
+            max_workers=ds_config.rss_max_workers,
+            per_host_limit=ds_config.rss_per_host_limit,
+            connect_timeout=ds_config.rss_connect_timeout,
+            max_bytes=ds_config.rss_max_bytes,
+            parse_workers=ds_config.rss_parse_workers,
+            stream_parse=ds_config.rss_stream_parse,
+            stream_max_items=ds_config.rss_stream_max_items,
+            stream_max_age_days=ds_config.rss_stream_max_age_days
+        )
+        options.update(kwargs)
+        return cls(ds_config.rss_sources, **options)
+    
+    @staticmethod
+    def state_name(kind: str, keywords: List[str] = None) -> str:
+        """RSS状态存储的名称（kind: cache/cursor/schedule），不同关键词组合各自独立保存
+
+        关键词之间用 \\x1f 分隔，["a_b"] 与 ["a", "b"] 得到不同的名称。
+        """
+        return f"rss_{kind}_" + ("\x1f".join(keywords) if keywords else "all")
     
     def fetch_news(self, keywords: List[str] = None, **kwargs) -> List[NewsItem]:
-        all_news = []
+        """获取并合并所有源的新闻，按发布时间从新到旧排列
+
+        urls: 只获取指定的源（如调度器中已到期的源）
+        limit: 只保留最新的limit条
+        """
+        streams = []
+        for result in self.iter_fetch(keywords, kwargs.get('urls')):
+            if result.ok:
+                streams.append(result.items)
+            else:
+                print(f"警告: 无法获取RSS源 {result.url} 的数据: {result.error}")
         
-        for url in self.rss_urls:
-            try:
-                news_items = self._fetch_from_url(url, keywords)
-                all_news.extend(news_items)
-            except Exception as e:
-                print(f"警告: 无法获取RSS源 {url} 的数据: {e}")
+        if self.redirect_resolver is not None:
+            streams = self.redirect_resolver.resolve_streams(streams)
+        
+        # 各源分别有序，堆归并的同时去重并在达到数量上限时停止
+        news, _ = merge_news(streams, limit=kwargs.get('limit'))
+        return news
+    
+    def due_urls(self, now: float = None) -> List[str]:
+        """按自适应检查周期返回已到期的源（未启用时返回全部）"""
+        if self.cadence is None:
+            return list(self.rss_urls)
+        return self.cadence.due_urls(self.rss_urls, now)
+    
+    def iter_fetch(self, keywords: List[str] = None, urls: List[str] = None) -> Iterator[FeedResult]:
+        """并发获取RSS源，按完成顺序逐个返回结果
+        
+        使用有界线程池，同一主机同时进行的请求数不超过 per_host_limit，
+        超出的源在该主机有空闲名额后再提交，不占用工作线程。
+        网络错误的重试不在工作线程中等待，而是在退避时间到达后重新排队，
+        不会阻塞其他源；熔断冷却中的源直接返回 skipped 结果。
+        """
+        urls = list(self.rss_urls if urls is None else urls)
+        
+        # 按主机分组排队，队列元素为 (url, 第几次尝试)
+        pending_by_host: Dict[str, deque] = {}
+        skipped = []
+        for url in urls:
+            if self.health is not None and not self.health.allow(url):
+                skipped.append(url)
                 continue
+            host = urlparse(url).netloc.lower()
+            pending_by_host.setdefault(host, deque()).append((url, 0))
         
-        # 去重 - 使用set自动去重，依赖NewsItem的__hash__和__eq__方法
-        unique_news = list(set(all_news))
+        active_by_host: Dict[str, int] = {}
+        running = {}
+        retry_heap = []  # (重试时间, 序号, url, 第几次尝试)
         
-        # 如果需要更精确的去重，使用内容哈希
-        if len(unique_news) != len(all_news):
-            content_hashes = set()
-            final_news = []
-            for item in unique_news:
-                content_hash = item.get_content_hash()
-                if content_hash not in content_hashes:
-                    content_hashes.add(content_hash)
-                    final_news.append(item)
-            unique_news = final_news
+        if self.parse_workers and self._parse_pool is None:
+            # 使用spawn，避免在已有线程的进程中fork
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
         
-        # 按发布时间排序
-        unique_news.sort(key=lambda x: x.published_date, reverse=True)
-        return unique_news
+        try:
+            for url in skipped:
+                yield FeedResult(url=url, status=FEED_STATUS_SKIPPED)
+            
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                def submit_ready():
+                    for host, queue in pending_by_host.items():
+                        while (queue and len(running) < self.max_workers and
+                               active_by_host.get(host, 0) < self.per_host_limit):
+                            url, attempt = queue.popleft()
+                            active_by_host[host] = active_by_host.get(host, 0) + 1
+                            future = executor.submit(self._fetch_result, url, keywords, attempt)
+                            running[future] = (host, url, attempt)
+                
+                submit_ready()
+                while running or retry_heap:
+                    # 退避时间已到的源重新排到所在主机队列的最前面
+                    now = time.monotonic()
+                    while retry_heap and retry_heap[0][0] <= now:
+                        _, _, url, attempt = heapq.heappop(retry_heap)
+                        host = urlparse(url).netloc.lower()
+                        pending_by_host.setdefault(host, deque()).appendleft((url, attempt))
+                    submit_ready()
+                    
+                    timeout = max(0.0, retry_heap[0][0] - now) if retry_heap else None
+                    if not running:
+                        # 只剩等待重试的源
+                        time.sleep(timeout)
+                        continue
+                    
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        host, url, attempt = running.pop(future)
+                        active_by_host[host] -= 1
+                        result = future.result()
+                        if result.retry_after is not None:
+                            print(f"网络错误，{result.retry_after}秒后重试 "
+                                  f"(尝试 {attempt + 1}/{self.max_retries}): {result.error}")
+                            heapq.heappush(retry_heap, (
+                                time.monotonic() + result.retry_after, id(future), url, attempt + 1
+                            ))
+                            continue
+                        yield result
+                    submit_ready()
+        finally:
+            for store in (self.cache_store, self.cursor_store,
+                          self.cadence.store if self.cadence else None,
+                          self.health.store if self.health else None):
+                if store:
+                    store.save()
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown()
+                self._parse_pool = None
+    
+    def _fetch_result(self, url: str, keywords: List[str] = None, attempt: int = 0) -> FeedResult:
+        """获取单个RSS源（单次尝试），将异常转换为FeedResult
+        
+        可重试的网络错误且未用完重试次数时，返回带 retry_after 的结果，
+        由调用方稍后重新提交；其他情况为最终结果，记录到健康记录和检查周期。
+        """
+        start = time.monotonic()
+        try:
+            result = self._fetch_feed(url, keywords)
+        except requests.exceptions.HTTPError as e:
+            # 服务器已响应（4xx/5xx），不按网络错误重试
+            result = FeedResult(url=url, error=str(e), status=FEED_STATUS_ERROR)
+        except (socket.timeout, requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError, OSError) as e:
+            if attempt < self.max_retries - 1:
+                # 指数退避
+                return FeedResult(url=url, error=str(e), status=FEED_STATUS_ERROR,
+                                  elapsed=time.monotonic() - start, attempts=attempt + 1,
+                                  retry_after=2 ** attempt)
+            result = FeedResult(url=url, error=f"网络连接失败，已重试{self.max_retries}次: {e}",
+                                status=FEED_STATUS_ERROR)
+        except Exception as e:
+            result = FeedResult(url=url, error=str(e), status=FEED_STATUS_ERROR)
+        result.elapsed = time.monotonic() - start
+        result.attempts = attempt + 1
+        
+        if self.health is not None:
+            if result.ok:
+                self.health.record_success(url, result.elapsed)
+            else:
+                self.health.record_failure(url, result.error, result.elapsed)
+        if self.cadence is not None:
+            self.cadence.record(
+                url,
+                updated=result.status == FEED_STATUS_NEW,
+                newest=result.newest,
+                failed=not result.ok
+            )
+        return result
     
     def _fetch_from_url(self, url: str, keywords: List[str] = None) -> List[NewsItem]:
-        """带重试机制的RSS获取"""
-        last_exception = None
+        """获取单个RSS源的新闻条目"""
+        return self._fetch_feed(url, keywords).items
+    
+    def _fetch_feed(self, url: str, keywords: List[str] = None) -> FeedResult:
+        """获取并解析单个RSS源"""
+        # 条件请求头
+        cached = self.cache_store.get(url) if self.cache_store else {}
+        request_headers = {}
+        if cached.get('etag'):
+            request_headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            request_headers['If-Modified-Since'] = cached['last_modified']
         
-        for attempt in range(self.max_retries):
-            try:
-                # 验证URL格式
-                parsed_url = urlparse(url)
-                if not parsed_url.scheme or not parsed_url.netloc:
-                    raise ValueError(f"无效的URL格式: {url}")
-                
-                # 设置feedparser的超时和用户代理
-                feedparser.USER_AGENT = "News Agent 1.0 (https://github.com/example/news-agent)"
-                
-                # 解析RSS
-                feed = feedparser.parse(url, resolve_relative_uris=False, sanitize_html=False)
-                
-                # 检查网络错误
-                if hasattr(feed, 'status'):
-                    if feed.status >= 400:
-                        raise requests.exceptions.HTTPError(f"HTTP {feed.status}")
-                
-                # 检查解析错误
-                if feed.bozo and hasattr(feed, 'bozo_exception'):
-                    # 严重错误：完全无法解析
-                    if not hasattr(feed, 'entries') or len(feed.entries) == 0:
-                        error_msg = str(feed.bozo_exception)
-                        if "timed out" in error_msg.lower():
-                            raise socket.timeout(f"请求超时: {url}")
-                        elif "connection" in error_msg.lower():
-                            raise requests.exceptions.ConnectionError(f"连接错误: {error_msg}")
-                        else:
-                            raise Exception(f"RSS解析错误: {error_msg}")
-                    else:
-                        # 轻微错误：有内容但有警告
-                        print(f"RSS警告 (尝试 {attempt + 1}/{self.max_retries}) - {url}: {feed.bozo_exception}")
-                
-                # 成功获取，跳出重试循环
-                break
-                
-            except (socket.timeout, requests.exceptions.Timeout, 
-                    requests.exceptions.ConnectionError, OSError) as e:
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    wait_time = 2 ** attempt  # 指数退避
-                    print(f"网络错误，{wait_time}秒后重试 (尝试 {attempt + 1}/{self.max_retries}): {e}")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise Exception(f"网络连接失败，已重试{self.max_retries}次: {e}")
-            
-            except Exception as e:
-                # 非网络错误，不重试
-                raise e
-        
-        news_items = []
-        
-        for entry in feed.entries:
-            # 提取基本信息
-            title = getattr(entry, 'title', '')
-            content = self._extract_content(entry)
-            link = getattr(entry, 'link', '')
-            author = getattr(entry, 'author', None)
-            
-            # 解析发布时间
-            published_date = self._parse_date(entry)
+        if self.stream_parse:
+            return self._fetch_feed_streaming(url, keywords, request_headers, cached)
+        
+        response = self._download(url, request_headers)
+        
+        # 未修改，无需下载和解析
+        if response.status == 304:
+            return FeedResult(
+                url=url,
+                status=FEED_STATUS_NOT_MODIFIED,
+                bytes_saved=cached.get('size', 0),
+                parse_time_saved=cached.get('parse_time', 0.0)
+            )
+        
+        # 服务器不支持条件请求时，用内容哈希判断是否变化
+        content_hash = hashlib.sha1(response.content).hexdigest()
+        if cached.get('hash') == content_hash:
+            self._update_cache(url, response.headers, content_hash, len(response.content),
+                               cached.get('parse_time', 0.0))
+            return FeedResult(
+                url=url,
+                status=FEED_STATUS_UNCHANGED,
+                bytes_downloaded=len(response.content),
+                parse_time_saved=cached.get('parse_time', 0.0)
+            )
+        
+        # 解析RSS（启用进程池时在子进程中解析）
+        parse_start = time.monotonic()
+        cursor = self.cursor_store.get(url) if self.cursor_store else None
+        if self._parse_pool is not None and not is_json_feed(response.content, response.content_type):
+            # JSON Feed解析开销很小，直接在当前线程中完成
+            parsed = self._parse_pool.submit(
+                _parse_feed_in_worker, response.content, response.headers, url, keywords, cursor
+            ).result()
+        else:
+            parsed = self._parse_feed(response.content, response.headers, url, keywords, cursor)
+        
+        items = self._build_items(parsed, keywords)
+        parse_time = time.monotonic() - parse_start
+        
+        self._update_cursor(url, parsed)
+        self._update_cache(url, response.headers, content_hash, len(response.content), parse_time)
+        
+        return FeedResult(
+            url=url,
+            items=items,
+            status=FEED_STATUS_NEW,
+            bytes_downloaded=len(response.content),
+            skipped_entries=parsed.skipped,
+            newest=parsed.newest,
+            feed_title=parsed.feed_title,
+            json_feed=parsed.json_feed
+        )
+    
+    def _fetch_feed_streaming(self, url: str, keywords: List[str],
+                              request_headers: Dict[str, str], cached: Dict[str, Any]) -> FeedResult:
+        """流式获取并解析单个RSS源，读到截止时间或条目上限后立即停止下载"""
+        parsed_url = urlparse(url)
+        if not parsed_url.scheme or not parsed_url.netloc:
+            raise ValueError(f"无效的URL格式: {url}")
+        
+        cutoff = None
+        if self.stream_max_age_days:
+            cutoff = datetime.now() - timedelta(days=self.stream_max_age_days)
+        
+        # 单次尝试，重试由 iter_fetch 调度
+        with self.http.stream(url, headers=request_headers or None) as response:
+            if response.status == 304:
+                return FeedResult(
+                    url=url,
+                    status=FEED_STATUS_NOT_MODIFIED,
+                    bytes_saved=cached.get('size', 0),
+                    parse_time_saved=cached.get('parse_time', 0.0)
+                )
+            if response.status >= 400:
+                raise requests.exceptions.HTTPError(f"HTTP {response.status}")
             
-            # 获取RSS源名称
-            feed_title = getattr(feed.feed, 'title', url)
+            counter = _ByteCounter(response.chunks)
+            parse_start = time.monotonic()
+            cursor = self.cursor_store.get(url) if self.cursor_store else None
+            reader = StreamingFeedReader(counter, max_items=self.stream_max_items, cutoff=cutoff)
+            try:
+                parsed = self._parse_entries(reader, url, keywords, cursor)
+                parsed.feed_title = reader.feed_title or url
+            except UnsupportedFeedFormat:
+                # 非常见格式，读完整个文档交给feedparser
+                content = _read_limited(reader.remaining_chunks(), self.http.max_bytes, url)
+                parsed = self._parse_feed(content, response.headers, url, keywords, cursor)
             
-            # 关键词过滤
-            if keywords and not self._match_keywords(title + ' ' + content, keywords):
-                continue
+            items = self._build_items(parsed, keywords)
+            parse_time = time.monotonic() - parse_start
             
-            # 提取摘要
-            summary = getattr(entry, 'summary', '')[:500] + '...' if len(getattr(entry, 'summary', '')) > 500 else getattr(entry, 'summary', '')
+            self._update_cursor(url, parsed)
+            # 提前停止时没有完整内容，不记录内容哈希
+            self._update_cache(url, response.headers, None, counter.size, parse_time)
             
-            news_item = NewsItem(
-                title=title,
-                content=content,
-                url=link,
-                published_date=published_date,
-                source=feed_title,
-                author=author,
-                summary=summary,
-                keywords=keywords or []
+            return FeedResult(
+                url=url,
+                items=items,
+                status=FEED_STATUS_NEW,
+                bytes_downloaded=counter.size,
+                skipped_entries=parsed.skipped,
+                newest=parsed.newest,
+                feed_title=parsed.feed_title,
+                json_feed=parsed.json_feed
             )
+    
+    def _update_cursor(self, url: str, parsed: 'ParsedFeed'):
+        """记录增量游标"""
+        if not self.cursor_store:
+            return
+        self.cursor_store.update(
+            url,
+            newest=datetime.fromtimestamp(parsed.newest).isoformat() if parsed.newest else None,
+            recent_ids=parsed.entry_ids[:self.CURSOR_MAX_IDS]
+        )
+    
+    def _download(self, url: str, request_headers: Dict[str, str]) -> FetchResponse:
+        """下载RSS源（单次尝试，重试由 iter_fetch 调度）"""
+        # 验证URL格式
+        parsed_url = urlparse(url)
+        if not parsed_url.scheme or not parsed_url.netloc:
+            raise ValueError(f"无效的URL格式: {url}")
+        
+        # 通过共享会话下载（应用超时和大小上限）
+        response = self.http.fetch(url, headers=request_headers or None)
+        
+        # 检查网络错误
+        if response.status >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {response.status}")
+        
+        return response
+    
+    def _update_cache(self, url: str, headers: Dict[str, str], content_hash: Optional[str],
+                      size: int, parse_time: float):
+        """记录条件请求所需的信息"""
+        if not self.cache_store:
+            return
+        self.cache_store.update(
+            url,
+            etag=headers.get('etag'),
+            last_modified=headers.get('last-modified'),
+            hash=content_hash,
+            size=size,
+            parse_time=round(parse_time, 4),
+            checked_at=datetime.now().isoformat()
+        )
+    
+    def _parse_feed(self, content: bytes, headers: Dict[str, str], url: str,
+                    keywords: List[str] = None, cursor: Dict[str, Any] = None) -> 'ParsedFeed':
+        """解析RSS文档，返回紧凑的ParsedFeed（可在子进程中执行）
+        
+        JSON Feed文档直接解码JSON，不经过feedparser。
+        """
+        content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+        if is_json_feed(content, content_type):
+            feed_title, entries = parse_json_feed(content)
+            parsed = self._parse_entries(entries, feed_title or url, keywords, cursor)
+            parsed.json_feed = True
+            return parsed
+        
+        feed = feedparser.parse(
+            content,
+            response_headers=headers,
+            resolve_relative_uris=False,
+            sanitize_html=False
+        )
+        
+        # 检查解析错误
+        if feed.bozo and hasattr(feed, 'bozo_exception'):
+            # 严重错误：完全无法解析
+            if not hasattr(feed, 'entries') or len(feed.entries) == 0:
+                raise Exception(f"RSS解析错误: {feed.bozo_exception}")
+            else:
+                # 轻微错误：有内容但有警告
+                print(f"RSS警告 - {url}: {feed.bozo_exception}")
+        
+        # 获取RSS源名称
+        feed_title = getattr(feed.feed, 'title', url)
+        return self._parse_entries(feed.entries, feed_title, keywords, cursor)
+    
+    def _parse_entries(self, entries, feed_title: str, keywords: List[str] = None,
+                       cursor: Dict[str, Any] = None) -> 'ParsedFeed':
+        """将条目（feedparser或流式解析器的entry）转换为紧凑的条目元组"""
+        parsed = ParsedFeed(feed_title=feed_title)
+        
+        # 读取增量游标（cursor为None时不过滤）
+        use_cursor = cursor is not None
+        cursor = cursor or {}
+        cursor_newest = datetime.fromisoformat(cursor['newest']).timestamp() if cursor.get('newest') else None
+        cursor_ids = set(cursor.get('recent_ids', []))
+        newest = cursor_newest
+        
+        # 关键词（或查询语句）只编译一次
+        matcher = compile_filter(keywords) if keywords else None
+        
+        for entry in entries:
+            # 游标过滤：在任何内容处理之前丢弃已处理过的条目
+            entry_id = getattr(entry, 'id', None) or getattr(entry, 'link', '')
+            entry_date = self._entry_timestamp(entry)
+            timestamp = entry_date.timestamp() if entry_date else None
+            if timestamp and (newest is None or timestamp > newest):
+                newest = timestamp
+            if use_cursor:
+                if entry_id:
+                    parsed.entry_ids.append(entry_id)
+                if (entry_id and entry_id in cursor_ids) or \
+                        (cursor_newest and timestamp and timestamp <= cursor_newest):
+                    parsed.skipped += 1
+                    continue
             
-            news_items.append(news_item)
+            row = self._entry_to_row(entry, timestamp, keywords, matcher, feed_title)
+            if row is not None:
+                parsed.rows.append(row)
+        
+        parsed.newest = newest
+        return parsed
+    
+    def _entry_to_row(self, entry, timestamp: Optional[float], keywords: List[str] = None,
+                      matcher: Union[KeywordMatcher, Query] = None, feed_title: str = None) -> Optional[tuple]:
+        """提取条目内容并做关键词过滤，不匹配时返回None
+        
+        先清理内容（去标签、还原实体，都按整段文本完成），再用子串查找做预筛选：
+        标题 + 清理后的内容中没有任何正向词项的条目直接丢弃，不再做完整匹配。
+        预筛选与最终匹配使用同一段文本，结果是最终匹配的超集。
+        """
+        # 提取基本信息
+        title = getattr(entry, 'title', '')
+        raw_summary = getattr(entry, 'summary', '')
+        content = self._clean_html(self._raw_content(entry))
+        
+        if keywords:
+            matcher = matcher or compile_filter(keywords)
+            if not matcher.may_match(title + ' ' + content):
+                return None
+        
+        link = getattr(entry, 'link', '')
+        author = getattr(entry, 'author', None)
+        
+        # 提取摘要
+        summary = raw_summary[:500] + '...' if len(raw_summary) > 500 else raw_summary
+        
+        # 关键词过滤（查询语句可以限定标题、来源、网址等字段）：
+        # 各字段与保存的NewsItem相同（摘要为截断后的），常驻查询按已获取的新闻匹配时结果一致
+        if keywords and not matcher.match_fields(title, content, summary=summary, source=feed_title,
+                                                 author=author, url=link):
+            return None
+        
+        return (title, content, link, timestamp, author, summary)
+    
+    def _build_items(self, parsed: 'ParsedFeed', keywords: List[str] = None) -> List[NewsItem]:
+        """由紧凑的条目元组构建NewsItem"""
+        return [self._row_to_item(row, parsed.feed_title, keywords) for row in parsed.rows]
+    
+    def _row_to_item(self, row: tuple, feed_title: str, keywords: List[str] = None) -> NewsItem:
+        title, content, link, timestamp, author, summary = row
+        return NewsItem(
+            title=title,
+            content=content,
+            url=link,
+            # 无法解析发布时间时使用当前时间
+            published_date=datetime.fromtimestamp(timestamp) if timestamp else datetime.now(),
+            source=feed_title,
+            author=author,
+            summary=summary,
+            keywords=keywords or []
+        )
+    
+    def iter_stream_news(self, url: str, keywords: List[str] = None) -> Iterator[NewsItem]:
+        """流式读取单个RSS源，边下载边逐条返回NewsItem
         
-        return news_items
+        仅支持RSS 2.0 / Atom，遇到其他格式时抛出UnsupportedFeedFormat。
+        不使用条件请求缓存和增量游标。
+        """
+        cutoff = None
+        if self.stream_max_age_days:
+            cutoff = datetime.now() - timedelta(days=self.stream_max_age_days)
+        
+        with self.http.stream(url) as response:
+            if response.status >= 400:
+                raise requests.exceptions.HTTPError(f"HTTP {response.status}")
+            
+            reader = StreamingFeedReader(response.chunks, max_items=self.stream_max_items, cutoff=cutoff)
+            for entry in reader:
+                entry_date = self._entry_timestamp(entry)
+                row = self._entry_to_row(entry, entry_date.timestamp() if entry_date else None, keywords,
+                                         feed_title=reader.feed_title or url)
+                if row is not None:
+                    yield self._row_to_item(row, reader.feed_title or url, keywords)
     
     def _extract_content(self, entry) -> str:
+        return self._clean_html(self._raw_content(entry))
+    
+    def _raw_content(self, entry) -> str:
+        """条目的原始内容（未清理HTML）"""
         # 尝试多种内容字段
         content_fields = ['content', 'summary', 'description']
         
@@ -149,19 +627,27 @@ class RSSSource(DataSource):
                 if isinstance(content, list) and len(content) > 0:
                     content = content[0]
                     if hasattr(content, 'value'):
-                        return self._clean_html(content.value)
+                        return content.value
                 elif isinstance(content, str):
-                    return self._clean_html(content)
+                    return content
         
         return ""
     
     def _clean_html(self, text: str) -> str:
-        # 简单的HTML标签清理
-        import re
-        clean = re.compile('<.*?>')
-        return re.sub(clean, '', text)
+        """去除HTML标签并还原实体（&amp; -> &），结果与 html.unescape 相同"""
+        if not text:
+            return text
+        if '<' in text:
+            text = _HTML_TAG_RE.sub('', text)
+        if '&' in text:
+            text = _unescape(text)
+        return text
     
     def _parse_date(self, entry) -> datetime:
+        # 如果无法解析，使用当前时间
+        return self._entry_timestamp(entry) or datetime.now()
+    
+    def _entry_timestamp(self, entry) -> Optional[datetime]:
         # 尝试解析多种时间格式
         date_fields = ['published_parsed', 'updated_parsed']
         
@@ -171,46 +657,19 @@ class RSSSource(DataSource):
                 if time_struct:
                     return datetime.fromtimestamp(time.mktime(time_struct))
         
-        # 如果无法解析，使用当前时间
-        return datetime.now()
+        return None
     
     def _match_keywords(self, text: str, keywords: List[str]) -> bool:
-        """增强的关键词匹配，支持多种匹配模式"""
+        """增强的关键词匹配，支持多种匹配模式
+        
+        1. 精确匹配（引号包围） 2. 排除关键词（负号开头）
+        3. 短语匹配（包含空格） 4. 普通包含匹配
+        关键词列表编译一次后缓存，文本只扫描一次。
+        """
         if not keywords:
             return True
         
-        text_lower = text.lower()
-        
-        for keyword in keywords:
-            keyword_lower = keyword.lower().strip()
-            
-            # 1. 精确匹配（引号包围）
-            if keyword_lower.startswith('"') and keyword_lower.endswith('"'):
-                exact_keyword = keyword_lower[1:-1]
-                if exact_keyword in text_lower:
-                    return True
-                continue
-            
-            # 2. 排除关键词（负号开头）
-            if keyword_lower.startswith('-'):
-                exclude_keyword = keyword_lower[1:]
-                if exclude_keyword in text_lower:
-                    return False
-                continue
-            
-            # 3. 短语匹配（包含空格）
-            if ' ' in keyword_lower:
-                if keyword_lower in text_lower:
-                    return True
-                continue
-            
-            # 4. 普通包含匹配
-            if keyword_lower in text_lower:
-                return True
-        
-        # 如果有排除关键词但没有匹配的正向关键词，返回False
-        has_positive_keywords = any(not k.strip().startswith('-') for k in keywords)
-        return not has_positive_keywords
+        return compile_filter(keywords).match(text)
     
     def is_available(self) -> bool:
         return len(self.rss_urls) > 0
@@ -228,6 +687,63 @@ class RSSSource(DataSource):
         info.update({
             'rss_urls': self.rss_urls,
             'url_count': len(self.rss_urls),
-            'timeout': self.timeout
+            'timeout': self.timeout,
+            'max_bytes': self.http.max_bytes,
+            'parse_workers': self.parse_workers,
+            'max_workers': self.max_workers,
+            'per_host_limit': self.per_host_limit
         })
-        return info
\ No newline at end of file
+        return info
+
+
+class _ByteCounter:
+    """统计已读取字节数的块迭代器"""
+    
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self.size = 0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self) -> bytes:
+        chunk = next(self._chunks)
+        self.size += len(chunk)
+        return chunk
+
+
+def _read_limited(chunks, max_bytes: int, url: str) -> bytes:
+    """读取剩余数据，超过大小上限时中止"""
+    data = []
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if max_bytes and size > max_bytes:
+            raise ResponseTooLargeError(f"响应体超过上限 {max_bytes} 字节: {url}")
+        data.append(chunk)
+    return b"".join(data)
+
+
+# 解析子进程中复用的RSSSource实例（只用到解析相关的方法）
+_worker_source: Optional[RSSSource] = None
+
+
+def _parse_feed_in_worker(content: bytes, headers: Dict[str, str], url: str,
+                          keywords: List[str] = None, cursor: Dict[str, Any] = None) -> ParsedFeed:
+    """进程池入口：解析RSS文档字节"""
+    global _worker_source
+    if _worker_source is None:
+        _worker_source = RSSSource([], max_workers=1)
+    return _worker_source._parse_feed(content, headers, url, keywords, cursor)
+
+
+def _unescape(text: str) -> str:
+    """还原HTML实体：只含常见实体时用 str.replace，否则用 html.unescape"""
+    decoded = text
+    for entity, char in _COMMON_ENTITIES:
+        # 还原 &amp; 之前，&amp;lt; 中不会出现 &lt;，不会被重复还原
+        if entity in decoded:
+            decoded = decoded.replace(entity, char)
+    if _OTHER_ENTITY_RE.search(decoded):
+        return html.unescape(text)
+    return decoded.replace('&amp;', '&')
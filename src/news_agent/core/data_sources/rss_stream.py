@@ -0,0 +1,218 @@
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_tz, mktime_tz
+from types import SimpleNamespace
+from typing import Iterable, Iterator, Optional, List
+
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+CONTENT_NS = '{http://purl.org/rss/1.0/modules/content/}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+
+
+class UnsupportedFeedFormat(Exception):
+    """不是流式解析器支持的RSS 2.0 / Atom格式，需要回退到feedparser"""
+    pass
+
+
+class StreamingFeedReader:
+    """增量解析RSS 2.0 / Atom文档，逐条返回条目
+
+    数据按块喂给XMLPullParser，每个条目处理完后立即从树中移除，
+    因此内存占用只与单个条目的大小有关，而与整个文档无关。
+
+    返回的条目对象与feedparser的entry字段兼容（title/link/id/author/
+    summary/content/published_parsed/updated_parsed），可直接交给
+    RSSSource的条目处理逻辑。
+
+    Args:
+        chunks: 文档字节块（如 response.iter_content()）
+        max_items: 最多返回的条目数，0表示不限制
+        cutoff: 遇到发布时间早于该时间的条目时停止（假定条目按时间倒序）
+    """
+
+    def __init__(self, chunks: Iterable[bytes], max_items: int = 0,
+                 cutoff: Optional[datetime] = None):
+        self._chunks = iter(chunks)
+        self.max_items = max_items
+        self.cutoff = cutoff.timestamp() if cutoff else None
+        self.feed_title: Optional[str] = None
+        self.format: Optional[str] = None  # 'rss' 或 'atom'
+        self.buffered: List[bytes] = []  # 识别格式前读到的数据，回退时使用
+        self.stopped_early = False
+
+    def __iter__(self) -> Iterator[SimpleNamespace]:
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        stack: List[ET.Element] = []
+        count = 0
+
+        for chunk in self._chunks:
+            if self.format is None:
+                self.buffered.append(chunk)
+            try:
+                parser.feed(chunk)
+                events = parser.read_events()
+                for event, elem in events:
+                    if event == 'start':
+                        if self.format is None:
+                            self._detect_format(elem.tag)
+                            self.buffered = []
+                        stack.append(elem)
+                        continue
+
+                    stack.pop()
+                    parent = stack[-1] if stack else None
+
+                    if self._is_feed_title(elem, parent):
+                        self.feed_title = (elem.text or '').strip()
+                    elif self._is_entry(elem):
+                        entry = self._build_entry(elem)
+                        # 移除已处理的条目，释放内存
+                        if parent is not None:
+                            parent.remove(elem)
+                        elem.clear()
+
+                        timestamp = self._entry_epoch(entry)
+                        if self.cutoff is not None and timestamp is not None and timestamp < self.cutoff:
+                            self.stopped_early = True
+                            return
+
+                        yield entry
+                        count += 1
+                        if self.max_items and count >= self.max_items:
+                            self.stopped_early = True
+                            return
+            except ET.ParseError as e:
+                if self.format is None:
+                    raise UnsupportedFeedFormat(f"无法流式解析: {e}")
+                raise Exception(f"RSS解析错误: {e}")
+
+        if self.format is None:
+            raise UnsupportedFeedFormat("文档为空或格式无法识别")
+
+    def remaining_chunks(self) -> Iterator[bytes]:
+        """回退时使用：已缓冲的数据加上尚未读取的数据"""
+        yield from self.buffered
+        yield from self._chunks
+
+    def _detect_format(self, root_tag: str):
+        if root_tag == 'rss':
+            self.format = 'rss'
+        elif root_tag == f'{ATOM_NS}feed':
+            self.format = 'atom'
+        else:
+            raise UnsupportedFeedFormat(f"不支持流式解析的根元素: {root_tag}")
+
+    def _is_entry(self, elem: ET.Element) -> bool:
+        if self.format == 'rss':
+            return elem.tag == 'item'
+        return elem.tag == f'{ATOM_NS}entry'
+
+    def _is_feed_title(self, elem: ET.Element, parent: Optional[ET.Element]) -> bool:
+        if parent is None or self.feed_title is not None:
+            return False
+        if self.format == 'rss':
+            return elem.tag == 'title' and parent.tag == 'channel'
+        return elem.tag == f'{ATOM_NS}title' and parent.tag == f'{ATOM_NS}feed'
+
+    def _build_entry(self, elem: ET.Element) -> SimpleNamespace:
+        if self.format == 'rss':
+            return self._build_rss_entry(elem)
+        return self._build_atom_entry(elem)
+
+    def _build_rss_entry(self, elem: ET.Element) -> SimpleNamespace:
+        fields = {}
+        title = elem.findtext('title')
+        if title is not None:
+            fields['title'] = title.strip()
+        link = elem.findtext('link')
+        if link:
+            fields['link'] = link.strip()
+        guid = elem.findtext('guid')
+        if guid:
+            fields['id'] = guid.strip()
+        author = elem.findtext('author') or elem.findtext(f'{DC_NS}creator')
+        if author:
+            fields['author'] = author.strip()
+        description = elem.findtext('description')
+        if description is not None:
+            fields['summary'] = description
+            fields['description'] = description
+        encoded = elem.findtext(f'{CONTENT_NS}encoded')
+        if encoded:
+            fields['content'] = [SimpleNamespace(value=encoded)]
+        published = _parse_rfc822(elem.findtext('pubDate')) or _parse_iso8601(elem.findtext(f'{DC_NS}date'))
+        if published:
+            fields['published_parsed'] = published
+        return SimpleNamespace(**fields)
+
+    def _build_atom_entry(self, elem: ET.Element) -> SimpleNamespace:
+        fields = {}
+        title = elem.find(f'{ATOM_NS}title')
+        if title is not None:
+            fields['title'] = _element_text(title).strip()
+        for link in elem.findall(f'{ATOM_NS}link'):
+            if link.get('rel', 'alternate') == 'alternate' and link.get('href'):
+                fields['link'] = link.get('href')
+                break
+        entry_id = elem.findtext(f'{ATOM_NS}id')
+        if entry_id:
+            fields['id'] = entry_id.strip()
+        author = elem.findtext(f'{ATOM_NS}author/{ATOM_NS}name')
+        if author:
+            fields['author'] = author.strip()
+        summary = elem.find(f'{ATOM_NS}summary')
+        if summary is not None:
+            fields['summary'] = _element_text(summary)
+        content = elem.find(f'{ATOM_NS}content')
+        if content is not None:
+            fields['content'] = [SimpleNamespace(value=_element_text(content))]
+        published = _parse_iso8601(elem.findtext(f'{ATOM_NS}published'))
+        if published:
+            fields['published_parsed'] = published
+        updated = _parse_iso8601(elem.findtext(f'{ATOM_NS}updated'))
+        if updated:
+            fields['updated_parsed'] = updated
+        return SimpleNamespace(**fields)
+
+    @staticmethod
+    def _entry_epoch(entry: SimpleNamespace) -> Optional[float]:
+        time_struct = getattr(entry, 'published_parsed', None) or getattr(entry, 'updated_parsed', None)
+        # 与RSSSource._entry_timestamp保持一致（按本地时间解释）
+        return time.mktime(time_struct) if time_struct else None
+
+
+def _element_text(elem: ET.Element) -> str:
+    """元素文本；type="xhtml"等包含子元素时返回内部XML"""
+    if len(elem) == 0:
+        return elem.text or ''
+    parts = [elem.text or '']
+    parts.extend(ET.tostring(child, encoding='unicode') for child in elem)
+    return ''.join(parts)
+
+
+def _parse_rfc822(value: Optional[str]) -> Optional[time.struct_time]:
+    """解析RSS的pubDate，返回UTC的struct_time（与feedparser一致）"""
+    if not value:
+        return None
+    parsed = parsedate_tz(value.strip())
+    if not parsed:
+        return None
+    try:
+        return time.gmtime(mktime_tz(parsed))
+    except (OverflowError, ValueError):
+        return None
+
+
+def _parse_iso8601(value: Optional[str]) -> Optional[time.struct_time]:
+    """解析Atom/dc:date的ISO 8601时间，返回UTC的struct_time"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.timetuple()
+    return time.gmtime(parsed.timestamp())
@@ -0,0 +1,128 @@
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable
+
+from .feed_state import FeedStateStore
+
+
+class FeedHealthRegistry:
+    """RSS源健康记录与熔断器
+
+    每个源记录连续失败次数、最近一次错误和耗时的指数移动平均（EWMA）。
+    连续失败达到 failure_threshold 次后熔断：冷却期内直接跳过该源，
+    冷却期结束后放行一次试探请求，成功则恢复，失败则冷却期加倍（不超过 max_cooldown）。
+
+    状态保存在FeedStateStore中，每个源一条记录：
+        failures: 连续失败次数
+        total_failures / total_successes: 累计次数
+        last_error / last_error_at: 最近一次错误及时间
+        last_success_at: 最近一次成功时间
+        latency_ewma: 耗时EWMA（秒）
+        open_until: 熔断冷却结束时间（epoch秒），未熔断时为None
+    """
+
+    def __init__(self, store: FeedStateStore, failure_threshold: int = 3,
+                 cooldown: float = 30 * 60, max_cooldown: float = 24 * 3600,
+                 ewma_alpha: float = 0.3):
+        self.store = store
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = max(0, cooldown)
+        self.max_cooldown = max(self.cooldown, max_cooldown)
+        self.ewma_alpha = ewma_alpha
+
+    @classmethod
+    def from_config(cls, ds_config) -> 'FeedHealthRegistry':
+        """根据DataSourceConfig创建（所有关键词共用一份健康记录）"""
+        return cls(
+            FeedStateStore.for_name(ds_config.rss_state_dir, 'rss_health'),
+            failure_threshold=ds_config.rss_circuit_failures,
+            cooldown=ds_config.rss_circuit_cooldown_minutes * 60
+        )
+
+    def allow(self, url: str, now: Optional[float] = None) -> bool:
+        """熔断冷却期内返回False"""
+        now = time.time() if now is None else now
+        open_until = self.store.get(url).get('open_until')
+        return open_until is None or open_until <= now
+
+    def allowed_urls(self, urls: Iterable[str], now: Optional[float] = None) -> List[str]:
+        now = time.time() if now is None else now
+        return [url for url in urls if self.allow(url, now)]
+
+    def record_success(self, url: str, latency: float, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        record = self.store.get(url)
+        self.store.update(
+            url,
+            failures=0,
+            total_successes=record.get('total_successes', 0) + 1,
+            last_success_at=now,
+            latency_ewma=self._ewma(record.get('latency_ewma'), latency),
+            open_until=None
+        )
+
+    def record_failure(self, url: str, error: str, latency: float = 0.0,
+                       now: Optional[float] = None) -> Optional[float]:
+        """记录失败，触发熔断时返回冷却结束时间"""
+        now = time.time() if now is None else now
+        record = self.store.get(url)
+        failures = record.get('failures', 0) + 1
+
+        open_until = None
+        if failures >= self.failure_threshold:
+            # 每多失败一次冷却期加倍
+            cooldown = self.cooldown * (2 ** min(failures - self.failure_threshold, 16))
+            open_until = now + min(self.max_cooldown, cooldown)
+
+        self.store.update(
+            url,
+            failures=failures,
+            total_failures=record.get('total_failures', 0) + 1,
+            last_error=error,
+            last_error_at=now,
+            latency_ewma=self._ewma(record.get('latency_ewma'), latency),
+            open_until=open_until
+        )
+        return open_until
+
+    def report(self, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """所有源的健康状况，熔断中和失败的源排在前面，其余按耗时从高到低"""
+        now = time.time() if now is None else now
+        rows = []
+        for url, record in self.store.items().items():
+            open_until = record.get('open_until')
+            if open_until and open_until > now:
+                state = 'open'
+            elif record.get('failures', 0):
+                state = 'failing'
+            else:
+                state = 'ok'
+            rows.append({
+                'url': url,
+                'state': state,
+                'failures': record.get('failures', 0),
+                'total_failures': record.get('total_failures', 0),
+                'total_successes': record.get('total_successes', 0),
+                'latency_ewma': record.get('latency_ewma'),
+                'last_error': record.get('last_error'),
+                'last_error_at': _format_time(record.get('last_error_at')),
+                'last_success_at': _format_time(record.get('last_success_at')),
+                'open_until': _format_time(open_until) if state == 'open' else None,
+            })
+        order = {'open': 0, 'failing': 1, 'ok': 2}
+        rows.sort(key=lambda r: (order[r['state']], -(r['latency_ewma'] or 0)))
+        return rows
+
+    def save(self):
+        self.store.save()
+
+    def _ewma(self, previous: Optional[float], value: float) -> float:
+        if previous is None:
+            return round(value, 4)
+        return round(self.ewma_alpha * value + (1 - self.ewma_alpha) * previous, 4)
+
+
+def _format_time(timestamp: Optional[float]) -> Optional[str]:
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
@@ -0,0 +1,101 @@
+import time
+from typing import List, Optional, Iterable
+
+from .feed_state import FeedStateStore
+
+
+class FeedCadence:
+    """根据更新历史为每个RSS源推算下次检查时间
+
+    每次检查后记录结果：源有新条目时把最新条目的发布时间（没有时用检查时间）
+    记入更新历史。更新周期取最近几次更新间隔的中位数，下次检查安排在
+    预计的下一次更新时间；超过预计时间仍没有更新的源，按沉寂时长的一半
+    逐步放慢检查。等待时间始终限制在 [min_interval, max_interval] 内。
+
+    状态保存在FeedStateStore中，每个源一条记录：
+        updates: 最近的更新时间（epoch秒）
+        checked_at: 上次检查时间
+        interval: 学到的更新周期（秒）
+        next_due: 下次到期时间
+    """
+
+    # 每个源保留的更新时间数量
+    MAX_HISTORY = 20
+
+    def __init__(self, store: FeedStateStore, min_interval: float = 30 * 60,
+                 max_interval: float = 7 * 24 * 3600):
+        self.store = store
+        self.min_interval = max(0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+
+    def is_due(self, url: str, now: Optional[float] = None) -> bool:
+        """从未检查过的源总是到期"""
+        now = time.time() if now is None else now
+        next_due = self.store.get(url).get('next_due')
+        return next_due is None or next_due <= now
+
+    def due_urls(self, urls: Iterable[str], now: Optional[float] = None) -> List[str]:
+        now = time.time() if now is None else now
+        return [url for url in urls if self.is_due(url, now)]
+
+    def next_due(self, url: str) -> Optional[float]:
+        return self.store.get(url).get('next_due')
+
+    def record(self, url: str, updated: bool, newest: Optional[float] = None,
+               failed: bool = False, now: Optional[float] = None) -> float:
+        """记录一次检查结果，返回距下次检查的等待时间（秒）
+
+        Args:
+            updated: 源是否有新内容（304或内容未变时为False）
+            newest: 源中最新条目的发布时间（epoch秒）
+            failed: 获取失败，按最小间隔尽快重试，不影响已学到的间隔
+        """
+        now = time.time() if now is None else now
+        record = self.store.get(url)
+        updates = list(record.get('updates', []))
+
+        if failed:
+            interval = self.min_interval
+            self.store.update(url, checked_at=now, next_due=now + interval)
+            return interval
+
+        if updated:
+            # 发布时间不晚于已记录的更新时，视为内容变化但没有新条目
+            update_time = min(newest, now) if newest else now
+            if not updates or update_time > updates[-1]:
+                updates.append(update_time)
+                updates = updates[-self.MAX_HISTORY:]
+
+        interval = self._estimate_interval(updates)
+        wait = self._next_wait(updates, interval, now)
+        self.store.update(
+            url,
+            updates=updates,
+            checked_at=now,
+            interval=interval,
+            next_due=now + wait
+        )
+        return wait
+
+    def _estimate_interval(self, updates: List[float]) -> float:
+        """更新周期：最近几次更新间隔的中位数"""
+        if len(updates) < 2:
+            # 历史不足时从最小间隔开始
+            return self.min_interval
+        gaps = sorted(b - a for a, b in zip(updates, updates[1:]))
+        return min(self.max_interval, max(self.min_interval, gaps[len(gaps) // 2]))
+
+    def _next_wait(self, updates: List[float], interval: float, now: float) -> float:
+        if not updates:
+            return self.min_interval
+
+        # 按预计的下一次更新时间安排检查，而不是从本次检查时间起算
+        wait = updates[-1] + interval - now
+        if wait <= 0:
+            # 超过预计时间仍未更新，随沉寂时长逐步放慢检查
+            wait = (now - updates[-1]) / 2
+
+        return min(self.max_interval, max(self.min_interval, wait))
+
+    def save(self):
+        self.store.save()
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+class FeedStateStore:
+    """RSS源状态的本地持久化存储
+
+    以JSON文件保存，每个RSS源一条记录（按URL索引），记录中的字段由调用方决定。
+    写入采用临时文件 + 原子替换，进程崩溃时不会留下半写的文件。
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def for_name(cls, state_dir: str, name: str) -> 'FeedStateStore':
+        """按名称在状态目录下创建存储，如 for_name('data/.state', 'rss_cache_AI')
+
+        文件名中不能使用的字符替换为 _，并总是附加原始名称的哈希：
+        "AI" 与 AI、c++ 与 c 等清理后相同的名称各自使用独立的文件。
+        """
+        safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in name) or "default"
+        digest = hashlib.md5(name.encode()).hexdigest()[:12]
+        return cls(str(Path(state_dir) / f"{safe_name[:80]}_{digest}.json"))
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._records = data.get('feeds', {})
+        except (OSError, ValueError) as e:
+            # 状态文件损坏时从空状态开始，不影响正常获取
+            print(f"警告: 无法读取RSS状态文件 {self.path}: {e}")
+            self._records = {}
+
+    def get(self, url: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._records.get(url, {}))
+
+    def update(self, url: str, **fields):
+        with self._lock:
+            self._records.setdefault(url, {}).update(fields)
+            self._dirty = True
+
+    def remove(self, url: str):
+        with self._lock:
+            if self._records.pop(url, None) is not None:
+                self._dirty = True
+
+    def urls(self) -> List[str]:
+        with self._lock:
+            return list(self._records.keys())
+
+    def items(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {url: dict(record) for url, record in self._records.items()}
+
+    def save(self, force: bool = False) -> Optional[str]:
+        """保存到磁盘（无变化时跳过）"""
+        with self._lock:
+            if not self._dirty and not force:
+                return None
+            data = {'feeds': self._records}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        return str(self.path)
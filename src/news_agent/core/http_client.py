@@ -0,0 +1,179 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Iterator
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_USER_AGENT = "News Agent 1.0 (https://github.com/example/news-agent)"
+
+# 永久重定向状态码
+PERMANENT_REDIRECT_CODES = (301, 308)
+
+
+class ResponseTooLargeError(Exception):
+    """响应体超过大小上限"""
+    pass
+
+
+@dataclass
+class FetchResponse:
+    """一次HTTP请求的结果"""
+    url: str  # 最终URL（跟随重定向之后）
+    status: int
+    content: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('content-type', '').split(';')[0].strip().lower()
+
+
+@dataclass
+class StreamResponse:
+    """流式读取的响应，chunks在连接关闭前有效"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    chunks: Iterator[bytes]
+
+
+class HTTPClient:
+    """共享的keep-alive HTTP客户端
+
+    - 连接池复用TCP/TLS连接
+    - 分别设置连接超时和读取超时，并限制整体耗时
+    - 流式读取响应体，超过 max_bytes 立即中止
+    - 记住永久重定向（301/308），后续请求直接访问新地址
+    """
+
+    def __init__(self, connect_timeout: float = 10, read_timeout: float = 30,
+                 max_bytes: int = 10 * 1024 * 1024, pool_size: int = 16,
+                 user_agent: str = DEFAULT_USER_AGENT, proxies: Dict[str, str] = None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_bytes = max_bytes
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+        })
+        if proxies:
+            self.session.proxies.update(proxies)
+
+        self._permanent_redirects: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, url: str) -> str:
+        """按已记录的永久重定向解析URL"""
+        seen = set()
+        with self._lock:
+            while url in self._permanent_redirects and url not in seen:
+                seen.add(url)
+                url = self._permanent_redirects[url]
+        return url
+
+    def get_permanent_redirects(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._permanent_redirects)
+
+    def fetch(self, url: str, headers: Dict[str, str] = None,
+              max_bytes: Optional[int] = None) -> FetchResponse:
+        """下载URL内容
+
+        Raises:
+            requests.exceptions.RequestException: 网络错误或超时
+            ResponseTooLargeError: 响应体超过大小上限
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        target = self.resolve(url)
+        start = time.monotonic()
+
+        response = self.session.get(
+            target,
+            headers=headers,
+            timeout=(self.connect_timeout, self.read_timeout),
+            stream=True,
+            allow_redirects=True
+        )
+
+        try:
+            self._remember_redirects(target, response)
+
+            content_length = response.headers.get('content-length')
+            if max_bytes and content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                raise ResponseTooLargeError(f"响应体过大: {content_length} 字节 (上限 {max_bytes})")
+
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise ResponseTooLargeError(f"响应体超过上限 {max_bytes} 字节: {url}")
+                # read_timeout只限制单次读取，这里额外限制整体耗时
+                if time.monotonic() - start > self.read_timeout:
+                    raise requests.exceptions.ReadTimeout(f"读取超时 ({self.read_timeout}秒): {url}")
+                chunks.append(chunk)
+
+            return FetchResponse(
+                url=response.url,
+                status=response.status_code,
+                content=b"".join(chunks),
+                headers={k.lower(): v for k, v in response.headers.items()},
+                elapsed=time.monotonic() - start
+            )
+        finally:
+            response.close()
+
+    @contextmanager
+    def stream(self, url: str, headers: Dict[str, str] = None,
+               chunk_size: int = 64 * 1024) -> Iterator['StreamResponse']:
+        """以流的方式打开URL，调用方逐块读取响应体
+
+        只应用连接超时和单次读取超时，不限制总大小和总耗时，
+        适合由调用方自行决定何时停止读取的大文档。
+        """
+        target = self.resolve(url)
+        response = self.session.get(
+            target,
+            headers=headers,
+            timeout=(self.connect_timeout, self.read_timeout),
+            stream=True,
+            allow_redirects=True
+        )
+        try:
+            self._remember_redirects(target, response)
+            yield StreamResponse(
+                url=response.url,
+                status=response.status_code,
+                headers={k.lower(): v for k, v in response.headers.items()},
+                chunks=response.iter_content(chunk_size=chunk_size)
+            )
+        finally:
+            response.close()
+
+    def _remember_redirects(self, url: str, response: requests.Response):
+        """记录重定向链开头连续的永久重定向"""
+        current = url
+        for hop in response.history:
+            if hop.status_code not in PERMANENT_REDIRECT_CODES:
+                break
+            location = hop.headers.get('location')
+            if not location:
+                break
+            target = urljoin(hop.url, location)
+            with self._lock:
+                self._permanent_redirects[current] = target
+            current = target
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,169 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# 预筛选时正向词项不超过这个数目则逐个做子串查找，否则用合并的正则扫描
+SUBSTRING_SCAN_TERMS = 16
+
+
+class KeywordMatcher:
+    """预编译的关键词匹配器
+
+    与 RSSSource._match_keywords 的语义完全一致：
+    - "精确匹配"（引号包围）、短语匹配和普通匹配都是子串包含
+    - -排除词 命中时返回False
+    - 按关键词顺序，第一个在文本中出现的关键词决定结果
+    - 没有任何关键词命中时，若存在正向关键词返回False，否则返回True
+
+    所有关键词合并成一个按前缀共享的正则（字符trie），对文本只扫描一次，
+    找出所有关键词可能开始的位置，再用字典查出这些位置上命中的关键词。
+    中文等无空格文本同样适用。
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+
+        # 每个词项取最靠前的关键词位置作为优先级
+        self._priority: Dict[str, int] = {}
+        self._exclude: List[bool] = []
+        empty_priority = None
+
+        for index, keyword in enumerate(self.keywords):
+            term, is_exclude = self.parse_keyword(keyword)
+            self._exclude.append(is_exclude)
+            if not term:
+                # 空词项总是被包含
+                if empty_priority is None:
+                    empty_priority = index
+                continue
+            if term not in self._priority:
+                self._priority[term] = index
+
+        self._empty_priority = empty_priority
+        # 决定结果时为正向关键词的词项（用于预筛选）
+        self._positive_terms = {term for term, index in self._priority.items() if not self._exclude[index]}
+        self._positive_empty = any(
+            not self._exclude[index] and not self.parse_keyword(k)[0]
+            for index, k in enumerate(self.keywords)
+        )
+        self._has_positive = any(not k.strip().startswith('-') for k in self.keywords)
+        self._lengths = sorted({len(term) for term in self._priority})
+        self._pattern = None
+        if self._priority:
+            self._pattern = re.compile(f"(?=(?:{_trie_pattern(self._priority)}))")
+
+    @staticmethod
+    def parse_keyword(keyword: str) -> Tuple[str, bool]:
+        """解析关键词，返回 (小写词项, 是否为排除词)"""
+        keyword_lower = keyword.lower().strip()
+
+        # 1. 精确匹配（引号包围）
+        if keyword_lower.startswith('"') and keyword_lower.endswith('"'):
+            return keyword_lower[1:-1], False
+
+        # 2. 排除关键词（负号开头）
+        if keyword_lower.startswith('-'):
+            return keyword_lower[1:], True
+
+        # 3. 短语匹配 / 4. 普通包含匹配
+        return keyword_lower, False
+
+    def first_match(self, text_lower: str) -> Optional[int]:
+        """返回文本（已转小写）中命中的最靠前关键词的位置，没有命中返回None"""
+        best = self._empty_priority
+        if best == 0 or self._pattern is None:
+            return best
+
+        priority = self._priority
+        lengths = self._lengths
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            for length in lengths:
+                index = priority.get(text_lower[start:start + length])
+                if index is not None and (best is None or index < best):
+                    best = index
+            if best == 0:
+                break
+        return best
+
+    def match(self, text: str) -> bool:
+        if not self.keywords:
+            return True
+
+        best = self.first_match(text.lower())
+        if best is None:
+            # 如果有排除关键词但没有匹配的正向关键词，返回False
+            return not self._has_positive
+        return not self._exclude[best]
+
+    def match_fields(self, title: str = "", content: str = "", **fields) -> bool:
+        """按字段匹配（与查询语句的接口一致）；关键词只在标题 + 内容中匹配"""
+        return self.match(title + ' ' + content)
+
+    def may_match(self, text: str) -> bool:
+        """预筛选：文本中出现任一正向词项时返回True（不考虑排除词）
+
+        返回False时 match() 对该文本本身及其任何子串必然也返回False。
+        只有当 match() 将要匹配的文本是传入文本的子串时才能据此丢弃条目：
+        不能用摘要代替正文，清理HTML（去标签、还原实体）得到的文本
+        也不是原始HTML的子串。
+        """
+        if not self._has_positive or self._positive_empty:
+            return True
+        if self._pattern is None:
+            return False
+        text_lower = text.lower()
+        if len(self._positive_terms) <= SUBSTRING_SCAN_TERMS:
+            # 词项不多时逐个用子串查找比逐位置尝试正则快得多
+            return any(term in text_lower for term in self._positive_terms)
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            for length in self._lengths:
+                if text_lower[start:start + length] in self._positive_terms:
+                    return True
+        return False
+
+    def terms_in(self, text_lower: str) -> List[str]:
+        """返回文本（已转小写）中出现的所有词项"""
+        if self._pattern is None:
+            return []
+        found = set()
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            for length in self._lengths:
+                term = text_lower[start:start + length]
+                if term in self._priority:
+                    found.add(term)
+        return list(found)
+
+
+@lru_cache(maxsize=256)
+def _compile(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def compile_keywords(keywords: Sequence[str]) -> KeywordMatcher:
+    """编译关键词列表（结果按关键词元组缓存）"""
+    return _compile(tuple(keywords))
+
+
+def _trie_pattern(terms) -> str:
+    """将词项集合构造成共享前缀的正则表达式"""
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}  # 词项结束标记
+    return _node_pattern(trie)
+
+
+def _node_pattern(node: Dict[str, dict]) -> str:
+    # 只需找出词项可能开始的位置：任意词项结束即可匹配成功
+    if '' in node:
+        return ''
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items())]
+    if len(branches) == 1:
+        return branches[0]
+    return f"(?:{'|'.join(branches)})"
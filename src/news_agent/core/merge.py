@@ -0,0 +1,81 @@
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:  # 数据源模块会导入本模块，运行时不反向导入
+    from .data_sources.base import NewsItem
+
+
+@dataclass
+class MergeStats:
+    """合并阶段的统计"""
+    raw: int = 0  # 输入的新闻总数
+    duplicates: int = 0  # 按 (URL, 标题) 重复而去掉的条数
+    content_duplicates: int = 0  # 按内容哈希重复而去掉的条数
+    kept: int = 0  # 保留的条数
+    skipped: int = 0  # 达到数量上限后未处理的条数
+
+    @property
+    def removed(self) -> int:
+        return self.duplicates + self.content_duplicates
+
+    @property
+    def stopped_early(self) -> bool:
+        return self.skipped > 0
+
+
+def _published(item: 'NewsItem'):
+    return item.published_date
+
+
+def merge_news(streams: Iterable[Iterable['NewsItem']], limit: Optional[int] = None,
+               newest_first: bool = True) -> Tuple[List['NewsItem'], MergeStats]:
+    """合并多个来源（如每个RSS源）的新闻，同一遍中完成去重、排序和截断
+
+    newest_first为True时按发布时间从新到旧处理：有limit时先把每个来源排好序
+    （各RSS源本身基本有序，Timsort接近线性），再用堆做k路归并，取够limit条即停止；
+    为False时按输入顺序依次处理（搜索引擎结果按相关度排列，不应按时间重排）。
+
+    同一 (URL, 规范化标题) 或同一内容哈希只保留最先出现的一条（按时间排序时即最新的一条）。
+    limit不为空时保留limit条后立即停止，剩余条目不再去重。
+
+    Returns:
+        (合并后的新闻列表, 统计)
+    """
+    streams = [list(stream) for stream in streams]
+    stats = MergeStats(raw=sum(len(stream) for stream in streams))
+
+    if newest_first and limit is None:
+        # 需要全部条目时，Timsort识别各源已有序的片段并在C中归并，比逐条出堆更快
+        ordered = sorted(itertools.chain.from_iterable(streams), key=_published, reverse=True)
+    elif newest_first:
+        ordered = heapq.merge(
+            *(sorted(stream, key=_published, reverse=True) for stream in streams),
+            key=_published, reverse=True
+        )
+    else:
+        ordered = itertools.chain.from_iterable(streams)
+
+    seen_keys = set()
+    seen_content = set()
+    merged: List['NewsItem'] = []
+    examined = 0
+    for item in ordered:
+        if limit is not None and len(merged) >= limit:
+            break
+        examined += 1
+        if item in seen_keys:
+            stats.duplicates += 1
+            continue
+        seen_keys.add(item)
+        content_hash = item.content_hash64()
+        if content_hash in seen_content:
+            stats.content_duplicates += 1
+            continue
+        seen_content.add(content_hash)
+        merged.append(item)
+
+    stats.kept = len(merged)
+    stats.skipped = stats.raw - examined
+    return merged, stats
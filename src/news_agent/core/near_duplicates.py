@@ -0,0 +1,323 @@
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from .data_sources.base import NewsItem
+
+
+# 拼接相邻词的哈希时使用的奇数乘子
+_SHINGLE_MULTIPLIERS = (
+    np.uint64(0x9E3779B97F4A7C15),
+    np.uint64(0xC2B2AE3D27D4EB4F),
+    np.uint64(0x165667B19E3779F9),
+    np.uint64(0x85EBCA77C2B2AE63),
+)
+
+# 词哈希（多项式哈希）的底数及其模2^64的逆元
+_TOKEN_BASE = 0x100000001B3
+_TOKEN_BASE_INV = pow(_TOKEN_BASE, -1, 2 ** 64)
+
+# 中日韩文字的码点范围，每个字单独作为一个词
+_CJK_RANGES = ((0x3040, 0x30FF), (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xAC00, 0xD7AF))
+
+
+def _is_word_char(code: int) -> bool:
+    """字母、数字（任意文字）以及附加在其上的组合符号（如天城文的元音符号）"""
+    char = chr(code)
+    return char.isalnum() or unicodedata.category(char).startswith('M')
+
+
+@lru_cache(maxsize=1)
+def _bmp_word_table() -> np.ndarray:
+    """基本多文种平面（U+0000..U+FFFF）每个码点是否为词字符，首次使用时生成"""
+    return np.fromiter(map(_is_word_char, range(0x10000)), dtype=bool, count=0x10000)
+
+
+# 每批处理的字符数上限（控制内存占用）
+_CHUNK_CHARS = 200_000
+
+# 平均每个词按多少字符估算，用于提前截断过长的正文
+_CHARS_PER_TOKEN = 16
+
+
+@dataclass
+class DuplicateGroup:
+    """一组相似的新闻：保留的代表条目和其余的别名条目"""
+    representative: NewsItem
+    aliases: List[NewsItem] = field(default_factory=list)
+
+    @property
+    def alias_urls(self) -> List[str]:
+        return [item.url for item in self.aliases]
+
+
+class NearDuplicateDetector:
+    """基于MinHash LSH的近似重复新闻检测
+
+    标题和正文开头（最多max_tokens个词）规范化后切成相邻词的shingle，
+    计算num_perm个MinHash值；再按LSH分段（bands × rows）分桶，
+    同桶的条目估算Jaccard相似度，超过阈值的用并查集合并成组。
+
+    切词和哈希在numpy中批量完成，每个桶只与桶内第一条比较，
+    整体开销随条目数线性增长。
+
+    Args:
+        threshold: Jaccard相似度阈值
+        num_perm: MinHash值个数
+        shingle_size: 每个shingle包含的相邻词数
+        max_tokens: 每条新闻参与计算的最多词数（标题 + 正文开头）
+        prefer: 代表条目的选择方式：'longest'（正文最长）、'earliest'（发布最早）、'first'（输入顺序）
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, shingle_size: int = 3,
+                 max_tokens: int = 200, prefer: str = 'longest', seed: int = 1):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"相似度阈值必须在(0, 1]之间: {threshold}")
+        if prefer not in ('longest', 'earliest', 'first'):
+            raise ValueError(f"不支持的代表条目选择方式: {prefer}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = max(1, min(shingle_size, len(_SHINGLE_MULTIPLIERS)))
+        self.max_tokens = max_tokens
+        self.prefer = prefer
+        self.bands, self.rows = self._choose_bands(threshold, num_perm)
+
+        rng = np.random.default_rng(seed)
+        # 乘法-移位哈希族：((a * x + b) mod 2^64) >> 32，a为奇数
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        self._powers = self._inverse_powers = np.empty(0, dtype=np.uint64)
+
+    @classmethod
+    def from_config(cls, search_config) -> 'NearDuplicateDetector':
+        """根据SearchConfig创建"""
+        return cls(threshold=search_config.near_duplicate_threshold)
+
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """选择LSH分段，使 (1/bands)^(1/rows) 不高于且最接近阈值（宁可多召回再校验）"""
+        best = (num_perm, 1)
+        best_gap = None
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            approx = (1 / bands) ** (1 / rows)
+            if approx <= threshold and (best_gap is None or threshold - approx < best_gap):
+                best, best_gap = (bands, rows), threshold - approx
+        return best
+
+    def _text(self, item: NewsItem) -> str:
+        text = f"{item.title} {item.content or ''}"
+        return text[:self.max_tokens * _CHARS_PER_TOKEN].lower()
+
+    def _token_powers(self, size: int) -> Tuple[np.ndarray, np.ndarray]:
+        """返回底数及其逆元的 0..size-1 次幂（模2^64）"""
+        if len(self._powers) < size:
+            size = max(size, 2 * len(self._powers))
+            powers = np.empty(size, dtype=np.uint64)
+            inverse = np.empty(size, dtype=np.uint64)
+            powers[0] = inverse[0] = 1
+            np.cumprod(np.full(size - 1, _TOKEN_BASE, dtype=np.uint64), out=powers[1:])
+            np.cumprod(np.full(size - 1, _TOKEN_BASE_INV, dtype=np.uint64), out=inverse[1:])
+            self._powers, self._inverse_powers = powers, inverse
+        return self._powers, self._inverse_powers
+
+    def _shingle_hashes(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """切词并计算一批文本的shingle哈希
+
+        任意文字的字母数字（拉丁、西里尔、希腊、阿拉伯等）按连续的字母数字切词，
+        中日韩文字按单字切词，每条最多max_tokens个词。字符分类查表完成
+        （补充平面的码点逐个判断），其余全部在numpy中完成；哈希与进程无关。
+
+        Returns:
+            (shingle哈希, 每条文本的第一个shingle在数组中的下标, 每条文本是否有词)。
+            每条文本至少一个shingle；没有任何词的文本的shingle只是占位，不能用于比较
+        """
+        count = len(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=count) + 1
+        # 用\0分隔各条文本，分隔符不属于任何词
+        joined = '\0'.join(texts) + '\0'
+        codes = np.frombuffer(joined.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+        is_word = _bmp_word_table()[np.minimum(codes, 0xFFFF)]
+        astral = np.flatnonzero(codes > 0xFFFF)
+        if len(astral):
+            unique_codes, inverse = np.unique(codes[astral], return_inverse=True)
+            is_word[astral] = np.fromiter(map(_is_word_char, unique_codes.tolist()), dtype=bool,
+                                          count=len(unique_codes))[inverse]
+        is_cjk = np.zeros(len(codes), dtype=bool)
+        for low, high in _CJK_RANGES:
+            is_cjk |= (codes >= low) & (codes <= high)
+        is_word &= ~is_cjk
+        starts = is_cjk.copy()
+        starts[0] |= is_word[0]
+        starts[1:] |= is_word[1:] & ~is_word[:-1]
+
+        positions = np.flatnonzero(is_word | is_cjk)
+        start_positions = np.flatnonzero(starts)
+
+        k = self.shingle_size
+        if len(positions):
+            # 多项式哈希：sum(c_i * B^i) 按词求和后乘以 B^-start 归一化到词首
+            powers, inverse = self._token_powers(len(codes))
+            weighted = codes[positions].astype(np.uint64) * powers[positions]
+            token_offsets = np.flatnonzero(starts[positions])
+            tokens = np.add.reduceat(weighted, token_offsets) * inverse[start_positions]
+            tokens ^= tokens >> np.uint64(33)
+            tokens *= np.uint64(0xFF51AFD7ED558CCD)
+            tokens ^= tokens >> np.uint64(33)
+        else:
+            tokens = np.empty(0, dtype=np.uint64)
+        token_text = np.searchsorted(np.cumsum(lengths), start_positions, side='right')
+
+        # 每条文本只保留前max_tokens个词
+        first_token = np.searchsorted(token_text, np.arange(count))
+        rank = np.arange(len(tokens)) - first_token[token_text]
+        keep = rank < self.max_tokens
+        tokens, token_text = tokens[keep], token_text[keep]
+        token_counts = np.bincount(token_text, minlength=count)
+        first_token = np.searchsorted(token_text, np.arange(count))
+
+        # 相邻k个词组成一个shingle，不跨越文本边界
+        windows = max(len(tokens) - k + 1, 0)
+        shingles = tokens[:windows] * _SHINGLE_MULTIPLIERS[0]
+        for i in range(1, k):
+            shingles ^= tokens[i:windows + i] * _SHINGLE_MULTIPLIERS[i]
+        valid = token_text[:windows] == token_text[k - 1:k - 1 + windows]
+        shingles, shingle_text = shingles[valid], token_text[:windows][valid]
+
+        # 不足k个词的文本整体作为一个shingle
+        short = np.flatnonzero(token_counts < k)
+        if len(short):
+            combined = np.zeros(len(short), dtype=np.uint64)
+            for i in range(k - 1):
+                has = token_counts[short] > i
+                combined[has] ^= tokens[first_token[short[has]] + i] * _SHINGLE_MULTIPLIERS[i]
+            shingles = np.concatenate([shingles, combined])
+            shingle_text = np.concatenate([shingle_text, short])
+            order = np.argsort(shingle_text, kind='stable')
+            shingles, shingle_text = shingles[order], shingle_text[order]
+
+        return shingles, np.searchsorted(shingle_text, np.arange(count)), token_counts > 0
+
+    def signatures(self, items: List[NewsItem]) -> np.ndarray:
+        """计算MinHash签名，返回 (条目数, num_perm) 的uint32矩阵"""
+        return self._signatures(items)[0]
+
+    def _signatures(self, items: List[NewsItem]) -> Tuple[np.ndarray, np.ndarray]:
+        """返回 (MinHash签名, 每条新闻是否有词)；没有词的新闻签名相同，不能参与比较"""
+        texts = [self._text(item) for item in items]
+        signatures = np.empty((len(items), self.num_perm), dtype=np.uint32)
+        has_tokens = np.empty(len(items), dtype=bool)
+        shift = np.uint64(32)
+        with np.errstate(over='ignore'):
+            start = 0
+            while start < len(texts):
+                # 按字符数分块
+                end, total = start, 0
+                while end < len(texts) and (end == start or total < _CHUNK_CHARS):
+                    total += len(texts[end])
+                    end += 1
+                shingles, offsets, has_tokens[start:end] = self._shingle_hashes(texts[start:end])
+                # (num_perm, shingle数) 的连续数组，沿行求分段最小值比按列快得多；
+                # 先取最小值再右移与先右移再取最小值结果相同
+                values = self._a[:, None] * shingles[None, :]
+                values += self._b[:, None]
+                minimums = np.minimum.reduceat(values, offsets, axis=1) >> shift
+                signatures[start:end] = minimums.T
+                start = end
+        return signatures, has_tokens
+
+    def find_pairs(self, signatures: np.ndarray) -> List[Tuple[int, int]]:
+        """返回相似度不低于阈值的条目对"""
+        count = len(signatures)
+        if count < 2:
+            return []
+        pairs_a, pairs_b = [], []
+        for band in range(self.bands):
+            segment = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows])
+            keys = segment.view(np.dtype((np.void, segment.dtype.itemsize * self.rows))).ravel()
+            _, inverse = np.unique(keys, return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            sorted_buckets = inverse[order]
+            # 每个桶的第一条
+            starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+            heads = np.repeat(order[starts], np.diff(np.r_[starts, count]))
+            mask = heads != order
+            pairs_a.append(heads[mask])
+            pairs_b.append(order[mask])
+
+        a = np.concatenate(pairs_a)
+        b = np.concatenate(pairs_b)
+        if len(a) == 0:
+            return []
+        # 同一对可能在多个分段中出现
+        unique = np.unique(np.stack([a, b], axis=1), axis=0)
+        a, b = unique[:, 0], unique[:, 1]
+        similarity = (signatures[a] == signatures[b]).mean(axis=1)
+        keep = similarity >= self.threshold
+        return list(zip(a[keep].tolist(), b[keep].tolist()))
+
+    def group(self, items: List[NewsItem]) -> List[DuplicateGroup]:
+        """将新闻分组，每组选出代表条目，顺序与各组代表在输入中首次出现的顺序一致"""
+        items = list(items)
+        parent = list(range(len(items)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # 没有词的新闻（空文本、只有标点）无从比较，各自单独成组
+        signatures, has_tokens = self._signatures(items)
+        comparable = np.flatnonzero(has_tokens)
+        for a, b in self.find_pairs(signatures[comparable]):
+            a, b = int(comparable[a]), int(comparable[b])
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        members: Dict[int, List[int]] = {}
+        for i in range(len(items)):
+            members.setdefault(find(i), []).append(i)
+
+        groups = []
+        for indexes in members.values():
+            best = min(indexes, key=lambda i: self._rank(items[i], i))
+            groups.append(DuplicateGroup(
+                representative=items[best],
+                aliases=[items[i] for i in indexes if i != best]
+            ))
+        return groups
+
+    def dedupe(self, items: List[NewsItem]) -> Tuple[List[NewsItem], List[DuplicateGroup]]:
+        """返回 (代表条目列表, 含别名的重复组)"""
+        groups = self.group(items)
+        return [g.representative for g in groups], [g for g in groups if g.aliases]
+
+    def dedupe_against(self, items: List[NewsItem], corpus: List[NewsItem]) -> List[NewsItem]:
+        """去掉与已有数据（corpus）近似重复的新闻，新闻之间的重复也会合并"""
+        items = list(items)
+        corpus = list(corpus)
+        combined = items + corpus
+        in_corpus = {id(item) for item in corpus}
+        result = []
+        for group in self.group(combined):
+            members = [group.representative] + group.aliases
+            if any(id(member) in in_corpus for member in members):
+                continue
+            result.append(group.representative)
+        return result
+
+    def _rank(self, item: NewsItem, index: int) -> tuple:
+        if self.prefer == 'longest':
+            return (-len(item.content or ''), index)
+        if self.prefer == 'earliest':
+            return (item.published_date, index)
+        return (index,)
+
@@ -0,0 +1,112 @@
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from .data_sources.rss import RSSSource, FeedResult
+
+
+@dataclass
+class OPMLFeed:
+    """OPML中的一个订阅"""
+    url: str
+    title: Optional[str] = None
+    category: Optional[str] = None  # 所在分组（嵌套分组用 / 连接）
+
+
+@dataclass
+class FeedValidation:
+    """单个RSS源的校验结果"""
+    url: str
+    ok: bool
+    title: Optional[str] = None
+    entries: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['elapsed'] = round(self.elapsed, 3)
+        return data
+
+
+def parse_opml(content: bytes) -> List[OPMLFeed]:
+    """解析OPML文档，返回所有带xmlUrl的订阅（按URL去重，保留文档顺序）
+
+    Raises:
+        ValueError: 不是有效的OPML文档
+    """
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        raise ValueError(f"OPML解析错误: {e}")
+    if root.tag != 'opml':
+        raise ValueError(f"不是OPML文档: 根元素为 {root.tag}")
+
+    body = root.find('body')
+    if body is None:
+        return []
+
+    feeds: List[OPMLFeed] = []
+    seen = set()
+
+    def walk(parent: ET.Element, path: List[str]):
+        for outline in parent.findall('outline'):
+            url = (outline.get('xmlUrl') or '').strip()
+            title = outline.get('title') or outline.get('text')
+            if url:
+                if url not in seen:
+                    seen.add(url)
+                    feeds.append(OPMLFeed(url=url, title=title, category='/'.join(path) or None))
+            else:
+                walk(outline, path + [title] if title else path)
+            if url and len(outline):
+                walk(outline, path)
+
+    walk(body, [])
+    return feeds
+
+
+def build_opml(feeds: Iterable[OPMLFeed], title: str = "News Agent RSS源") -> str:
+    """生成OPML 2.0文档，有分组的订阅放在对应的分组outline下"""
+    root = ET.Element('opml', version='2.0')
+    head = ET.SubElement(root, 'head')
+    ET.SubElement(head, 'title').text = title
+    ET.SubElement(head, 'dateCreated').text = datetime.now().strftime('%a, %d %b %Y %H:%M:%S')
+    body = ET.SubElement(root, 'body')
+
+    groups: Dict[str, ET.Element] = {}
+    for feed in feeds:
+        parent = body
+        if feed.category:
+            path = ''
+            for name in feed.category.split('/'):
+                path = f"{path}/{name}" if path else name
+                if path not in groups:
+                    groups[path] = ET.SubElement(parent, 'outline', text=name, title=name)
+                parent = groups[path]
+        text = feed.title or feed.url
+        ET.SubElement(parent, 'outline', type='rss', text=text, title=text, xmlUrl=feed.url)
+
+    ET.indent(root)
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(root, encoding='unicode') + '\n'
+
+
+def validate_feeds(source: RSSSource, urls: List[str] = None) -> Iterator[FeedValidation]:
+    """并发获取并解析RSS源，按完成顺序返回校验结果
+
+    复用RSSSource的并发获取（单主机并发上限、超时、大小上限），不做关键词过滤。
+    """
+    for result in source.iter_fetch(urls=urls):
+        yield _to_validation(result)
+
+
+def _to_validation(result: FeedResult) -> FeedValidation:
+    return FeedValidation(
+        url=result.url,
+        ok=result.ok,
+        title=result.feed_title,
+        entries=len(result.items),
+        elapsed=result.elapsed,
+        error=result.error
+    )
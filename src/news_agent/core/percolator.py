@@ -0,0 +1,156 @@
+import itertools
+import re
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .data_sources.base import NewsItem
+from .keyword_matcher import KeywordMatcher, _trie_pattern
+from .query import Query, compile_query, is_query
+
+
+class Percolator:
+    """常驻查询（percolator）：把每条新闻与大量保存的主题查询一次性匹配
+
+    每个主题是一组关键词，语法和匹配语义与 KeywordMatcher 完全一致
+    （"精确匹配"、短语、-排除词，按关键词顺序第一个出现的决定结果）。
+
+    主题也可以是一条查询语句（见 news_agent.core.query），按其必需词项
+    （命中时至少出现其中一个的词项集合）建立索引，求值时使用各字段。
+
+    主题查询只有在文本中出现至少一个正向词项时才可能命中，因此按正向词项
+    建立倒排索引；没有正向词项的查询（只有排除词、空查询）总是作为候选。
+    所有主题的词项合并成一个共享前缀的正则，每条新闻只扫描一次得到出现的词项，
+    再只对这些词项对应的候选主题判断结果，耗时与命中的主题数相关，
+    而不随主题总数线性增长。
+    """
+
+    def __init__(self, queries: Optional[Mapping[Hashable, Sequence[str]]] = None):
+        self._queries: Dict[Hashable, Tuple[Tuple[str, bool], ...]] = {}
+        self._boolean: Dict[Hashable, Query] = {}
+        self._has_positive: Dict[Hashable, bool] = {}
+        self._postings: Dict[str, List[Hashable]] = {}
+        self._always: List[Hashable] = []
+        self._order: Dict[Hashable, int] = {}
+        self._counter = itertools.count()
+        self._terms: Set[str] = set()
+        self._pattern = None
+        self._lengths: List[int] = []
+        self._dirty = False
+        for topic, keywords in (queries or {}).items():
+            self.add(topic, keywords)
+
+    def add(self, topic: Hashable, keywords: Sequence[str]):
+        """添加或替换一个主题查询"""
+        if topic in self._queries:
+            self.remove(topic)
+        if is_query(keywords):
+            self._boolean[topic] = compile_query(keywords[0])
+        self._queries[topic] = tuple(KeywordMatcher.parse_keyword(keyword) for keyword in keywords)
+        self._has_positive[topic] = any(not keyword.strip().startswith('-') for keyword in keywords)
+        self._order[topic] = next(self._counter)
+        self._dirty = True
+
+    def remove(self, topic: Hashable):
+        self._queries.pop(topic, None)
+        self._boolean.pop(topic, None)
+        self._has_positive.pop(topic, None)
+        self._order.pop(topic, None)
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def __contains__(self, topic: Hashable) -> bool:
+        return topic in self._queries
+
+    @property
+    def topics(self) -> List[Hashable]:
+        return list(self._queries)
+
+    def _build(self):
+        """重建倒排索引和词项正则（主题变化后在下一次匹配时进行）"""
+        postings: Dict[str, List[Hashable]] = {}
+        always = []
+        terms: Set[str] = set()
+        for topic, parsed in self._queries.items():
+            if topic in self._boolean:
+                required = self._boolean[topic].required_terms
+                positive = set(required) if required is not None else set()
+                terms.update(positive)
+            else:
+                positive = {term for term, is_exclude in parsed if not is_exclude}
+                terms.update(term for term, _ in parsed if term)
+            if not positive or '' in positive:
+                # 没有正向词项时是否命中取决于排除词；空词项总是出现
+                always.append(topic)
+                continue
+            for term in positive:
+                postings.setdefault(term, []).append(topic)
+        self._postings = postings
+        self._always = always
+        self._terms = terms
+        self._lengths = sorted({len(term) for term in terms})
+        self._pattern = re.compile(f"(?=(?:{_trie_pattern(terms)}))") if terms else None
+        self._dirty = False
+
+    def terms_in(self, text_lower: str) -> Set[str]:
+        """返回文本（已转小写）中出现的所有主题词项"""
+        if self._dirty:
+            self._build()
+        found = set()
+        if self._pattern is None:
+            return found
+        terms = self._terms
+        lengths = self._lengths
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            for length in lengths:
+                term = text_lower[start:start + length]
+                if term in terms:
+                    found.add(term)
+        return found
+
+    def match(self, text: str) -> List[Hashable]:
+        """返回文本命中的主题（按添加顺序）"""
+        return self._match(text)
+
+    def _match(self, text: str, item: NewsItem = None) -> List[Hashable]:
+        if self._dirty:
+            self._build()
+        present = self.terms_in(text.lower())
+        present.add('')
+
+        candidates = set(self._always)
+        postings = self._postings
+        for term in present:
+            topics = postings.get(term)
+            if topics:
+                candidates.update(topics)
+
+        matched = [topic for topic in candidates if self._evaluate(topic, present, text, item)]
+        matched.sort(key=self._order.__getitem__)
+        return matched
+
+    def _evaluate(self, topic: Hashable, present: Set[str], text: str, item: NewsItem = None) -> bool:
+        """与 KeywordMatcher.match 相同：第一个出现的关键词决定结果"""
+        query = self._boolean.get(topic)
+        if query is not None:
+            return query.matches(item) if item is not None else query.match(text)
+        parsed = self._queries[topic]
+        if not parsed:
+            return True
+        for term, is_exclude in parsed:
+            if term in present:
+                return not is_exclude
+        return not self._has_positive[topic]
+
+    def match_item(self, item: NewsItem) -> List[Hashable]:
+        """返回新闻命中的主题，匹配文本与RSS关键词过滤相同（标题 + 内容，查询语句的各字段取新闻上保存的值）"""
+        return self._match(item.title + ' ' + item.content, item)
+
+    def percolate(self, items: Iterable[NewsItem]) -> Dict[Hashable, List[NewsItem]]:
+        """把一批新闻分配到各自命中的主题，返回 {主题: 新闻列表}（没有命中的主题不在结果中）"""
+        by_topic: Dict[Hashable, List[NewsItem]] = {}
+        for item in items:
+            for topic in self.match_item(item):
+                by_topic.setdefault(topic, []).append(item)
+        return by_topic
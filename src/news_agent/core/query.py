@@ -0,0 +1,516 @@
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlparse
+
+from .keyword_matcher import KeywordMatcher, compile_keywords
+
+
+class QuerySyntaxError(ValueError):
+    """查询语句语法错误"""
+    pass
+
+
+# 可用的字段；None表示不限字段（标题 + 内容，与RSS关键词过滤相同）
+FIELDS = ('title', 'content', 'summary', 'source', 'author', 'url', 'site')
+
+# 包含在"标题 + 内容"中的字段，只有这些字段的词项可以用于预筛选
+TEXT_FIELDS = (None, 'title', 'content')
+
+# 字段的大致匹配开销（文本越短越便宜），用于AND/OR中子句的求值顺序
+FIELD_COST = {'title': 1, 'site': 1, 'source': 1, 'author': 1, 'url': 1, 'summary': 2, 'content': 3, None: 4}
+
+# 各搜索引擎支持下推的字段及其运算符
+ENGINE_FIELDS = {
+    'google': {None: '', 'title': 'intitle:', 'url': 'inurl:', 'site': 'site:'},
+    'bing': {None: '', 'title': 'intitle:', 'site': 'site:'},
+}
+
+_TOKEN_RE = re.compile(r'\s*(?:(?P<lparen>\()|(?P<rparen>\))|(?P<phrase>-?"[^"]*"?)|(?P<word>[^\s()"]+))')
+_FIELD_RE = re.compile(rf"^(-?)({'|'.join(FIELDS)}):(.*)$", re.IGNORECASE)
+_OPERATORS = ('AND', 'OR', 'NOT')
+# 运算符区分大小写（与搜索引擎一致），避免把 "rock and roll" 这样的关键词当作查询；
+# 字段限定要求冒号后紧跟词项（"title: 新闻" 不是查询），单独的括号（如 "GPT (OpenAI)"）也不是
+_QUERY_HINT_RE = re.compile(rf"\b(?:AND|OR|NOT)\b|(?:^|[\s(-])(?:{'|'.join(FIELDS)}):(?=[^\s)])")
+
+
+class Node:
+    """查询语法树节点"""
+    cost = 1
+
+    def evaluate(self, doc: 'QueryDocument') -> bool:
+        raise NotImplementedError
+
+
+class Const(Node):
+    cost = 0
+
+    def __init__(self, value: bool):
+        self.value = value
+
+    def evaluate(self, doc: 'QueryDocument') -> bool:
+        return self.value
+
+    def __eq__(self, other):
+        return isinstance(other, Const) and other.value == self.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return "TRUE" if self.value else "FALSE"
+
+
+TRUE = Const(True)
+FALSE = Const(False)
+
+
+class Term(Node):
+    """词项：字段（已转小写）中包含该子串，site字段为主机名或其子域名"""
+
+    def __init__(self, text: str, field: Optional[str] = None):
+        self.text = text.lower()
+        self.field = field
+        self.cost = FIELD_COST[field]
+
+    def evaluate(self, doc: 'QueryDocument') -> bool:
+        if self.field == 'site':
+            host = doc.get('site')
+            return host == self.text or host.endswith('.' + self.text)
+        return self.text in doc.get(self.field)
+
+    def __eq__(self, other):
+        return isinstance(other, Term) and other.text == self.text and other.field == self.field
+
+    def __hash__(self):
+        return hash((self.text, self.field))
+
+    def __repr__(self):
+        text = f'"{self.text}"' if _needs_quotes(self.text) else self.text
+        return f"{self.field}:{text}" if self.field else text
+
+
+class Not(Node):
+    def __init__(self, child: Node):
+        self.child = child
+        self.cost = child.cost
+
+    def evaluate(self, doc: 'QueryDocument') -> bool:
+        return not self.child.evaluate(doc)
+
+    def __eq__(self, other):
+        return isinstance(other, Not) and other.child == self.child
+
+    def __hash__(self):
+        return hash(('not', self.child))
+
+    def __repr__(self):
+        return f"-{self.child!r}" if isinstance(self.child, Term) else f"NOT ({self.child!r})"
+
+
+class And(Node):
+    def __init__(self, children: Sequence[Node]):
+        self.children = tuple(children)
+        self.cost = sum(child.cost for child in self.children)
+
+    def evaluate(self, doc: 'QueryDocument') -> bool:
+        # 按开销从低到高排列，遇到False立即返回
+        for child in self.children:
+            if not child.evaluate(doc):
+                return False
+        return True
+
+    def __eq__(self, other):
+        return type(other) is type(self) and set(other.children) == set(self.children)
+
+    def __hash__(self):
+        return hash((type(self).__name__, frozenset(self.children)))
+
+    def __repr__(self):
+        return " AND ".join(_group(child) for child in self.children)
+
+
+class Or(And):
+    def evaluate(self, doc: 'QueryDocument') -> bool:
+        # 遇到True立即返回
+        for child in self.children:
+            if child.evaluate(doc):
+                return True
+        return False
+
+    def __repr__(self):
+        return " OR ".join(_group(child) for child in self.children)
+
+
+def _group(node: Node) -> str:
+    return f"({node!r})" if isinstance(node, And) else repr(node)
+
+
+def _needs_quotes(text: str) -> bool:
+    return not text or any(c.isspace() or c in '()":' for c in text) or text.upper() in _OPERATORS
+
+
+class QueryDocument:
+    """被查询的一条新闻：各字段按需取值并转小写，每个字段只处理一次"""
+
+    def __init__(self, title: str = "", content: str = "", summary: str = None,
+                 source: str = None, author: str = None, url: str = None):
+        self._raw = {'title': title or "", 'content': content or "", 'summary': summary or "",
+                     'source': source or "", 'author': author or "", 'url': url or ""}
+        self._lower: Dict[Optional[str], str] = {}
+
+    @classmethod
+    def from_item(cls, item) -> 'QueryDocument':
+        return cls(item.title, item.content, item.summary, item.source, item.author, item.url)
+
+    def get(self, field: Optional[str]) -> str:
+        value = self._lower.get(field)
+        if value is None:
+            if field is None:
+                value = (self._raw['title'] + ' ' + self._raw['content']).lower()
+            elif field == 'site':
+                value = urlparse(self._raw['url']).netloc.lower().rsplit('@', 1)[-1].split(':', 1)[0]
+            else:
+                value = self._raw[field].lower()
+            self._lower[field] = value
+        return value
+
+
+class _Parser:
+    """递归下降解析：
+        query   := or_expr
+        or_expr := and_expr ("OR" and_expr)*
+        and_expr:= unary (["AND"] unary)*        相邻的子句默认为AND
+        unary   := ("NOT" | "-") unary | primary
+        primary := "(" or_expr ")" | [field ":"] (word | "phrase" | "(" or_expr ")")
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = self._tokenize(text)
+        self.pos = 0
+
+    def _tokenize(self, text: str) -> List[Tuple[str, str]]:
+        tokens = []
+        pos = 0
+        while pos < len(text):
+            match = _TOKEN_RE.match(text, pos)
+            if match is None or match.end() == pos:
+                if text[pos:].strip():
+                    raise QuerySyntaxError(f"无法解析的位置 {pos}: {text[pos:]!r}")
+                break
+            pos = match.end()
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == 'phrase' and (len(value.lstrip('-')) < 2 or not value.endswith('"')):
+                raise QuerySyntaxError(f"引号未闭合: {value!r}")
+            tokens.append((kind, value))
+        return tokens
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise QuerySyntaxError(f"查询意外结束: {self.text!r}")
+        self.pos += 1
+        return token
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            return TRUE
+        node = self.or_expr()
+        if self.peek() is not None:
+            raise QuerySyntaxError(f"多余的 {self.peek()[1]!r}: {self.text!r}")
+        return node
+
+    def or_expr(self) -> Node:
+        children = [self.and_expr()]
+        while self.peek() == ('word', 'OR'):
+            self.next()
+            children.append(self.and_expr())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def and_expr(self) -> Node:
+        children = [self.unary()]
+        while True:
+            token = self.peek()
+            if token is None or token[0] == 'rparen' or token == ('word', 'OR'):
+                break
+            if token == ('word', 'AND'):
+                self.next()
+            children.append(self.unary())
+        return children[0] if len(children) == 1 else And(children)
+
+    def unary(self) -> Node:
+        kind, value = self.next()
+        if (kind, value) == ('word', 'NOT'):
+            return Not(self.unary())
+        if kind == 'word' and value == '-':
+            return Not(self.unary())
+        if kind == 'lparen':
+            node = self.or_expr()
+            if self.next()[0] != 'rparen':
+                raise QuerySyntaxError(f"括号未闭合: {self.text!r}")
+            return node
+        if kind == 'rparen':
+            raise QuerySyntaxError(f"多余的右括号: {self.text!r}")
+        if kind == 'word' and value in _OPERATORS:
+            raise QuerySyntaxError(f"运算符 {value} 缺少操作数: {self.text!r}")
+
+        negate = value.startswith('-') and len(value) > 1
+        if negate:
+            value = value[1:]
+        node = self.term(kind, value)
+        return Not(node) if negate else node
+
+    def term(self, kind: str, value: str) -> Node:
+        if kind == 'phrase':
+            return Term(value[1:-1])
+        match = _FIELD_RE.match(value)
+        if match is None:
+            return Term(value)
+        _, field, rest = match.groups()
+        field = field.lower()
+        if rest:
+            if rest.startswith('"'):
+                if len(rest) < 2 or not rest.endswith('"'):
+                    raise QuerySyntaxError(f"引号未闭合: {value!r}")
+                rest = rest[1:-1]
+            return Term(rest, field)
+        # field:"短语" 或 field:(...)
+        kind, value = self.next()
+        if kind == 'phrase' and not value.startswith('-'):
+            return Term(value[1:-1], field)
+        if kind == 'lparen':
+            node = self.or_expr()
+            if self.next()[0] != 'rparen':
+                raise QuerySyntaxError(f"括号未闭合: {self.text!r}")
+            return _with_field(node, field)
+        raise QuerySyntaxError(f"字段 {field}: 后缺少词项: {self.text!r}")
+
+
+def _with_field(node: Node, field: str) -> Node:
+    """把 field:(a OR b) 展开为 field:a OR field:b"""
+    if isinstance(node, Term):
+        return Term(node.text, field) if node.field is None else node
+    if isinstance(node, Not):
+        return Not(_with_field(node.child, field))
+    if isinstance(node, And):
+        return type(node)([_with_field(child, field) for child in node.children])
+    return node
+
+
+def optimize(node: Node) -> Node:
+    """化简语法树：消去双重否定、合并同类嵌套、常量折叠、去掉重复子句，
+    并把开销低的子句排在前面以便尽早短路"""
+    if isinstance(node, Not):
+        child = optimize(node.child)
+        if isinstance(child, Not):
+            return child.child
+        if isinstance(child, Const):
+            return FALSE if child.value else TRUE
+        return Not(child)
+    if isinstance(node, And):
+        kind = type(node)
+        # AND中的FALSE、OR中的TRUE决定整个结果；另一个常量可以去掉
+        absorbing, neutral = (TRUE, FALSE) if kind is Or else (FALSE, TRUE)
+        children = []
+        for child in node.children:
+            child = optimize(child)
+            if child == absorbing:
+                return absorbing
+            if child == neutral:
+                continue
+            children.extend(child.children if type(child) is kind else [child])
+        children = list(dict.fromkeys(children))
+        # x AND -x 为FALSE，x OR -x 为TRUE
+        if any(Not(child) in children for child in children if not isinstance(child, Not)):
+            return absorbing
+        if not children:
+            return neutral
+        if len(children) == 1:
+            return children[0]
+        children.sort(key=lambda child: child.cost)
+        return kind(children)
+    return node
+
+
+def required_terms(node: Node) -> Optional[FrozenSet[str]]:
+    """返回一组词项，文本命中该查询时其中至少一个必然出现（用于倒排索引和预筛选）
+
+    词项只取标题和内容中的（不限字段、title:、content:），其他字段不一定出现在正文中。
+    返回None表示无法确定（例如只有排除条件），这样的查询总是作为候选。
+    """
+    if isinstance(node, Term):
+        return frozenset([node.text]) if node.field in TEXT_FIELDS and node.text else None
+    if isinstance(node, Or):
+        terms = set()
+        for child in node.children:
+            child_terms = required_terms(child)
+            if child_terms is None:
+                return None
+            terms.update(child_terms)
+        return frozenset(terms)
+    if isinstance(node, And):
+        best = None
+        for child in node.children:
+            child_terms = required_terms(child)
+            if child_terms is not None and (best is None or len(child_terms) < len(best)):
+                best = child_terms
+        return best
+    if node == FALSE:
+        return frozenset()
+    return None
+
+
+def _negation_normal_form(node: Node, negate: bool = False) -> Node:
+    """把否定下推到词项上（德摩根定律）"""
+    if isinstance(node, Not):
+        return _negation_normal_form(node.child, not negate)
+    if isinstance(node, And):
+        kind = type(node)
+        if negate:
+            kind = And if kind is Or else Or
+        return kind([_negation_normal_form(child, negate) for child in node.children])
+    if isinstance(node, Const):
+        return Const(node.value != negate)
+    return Not(node) if negate else node
+
+
+class Query:
+    """编译后的布尔查询
+
+    语法：AND / OR / NOT（大写）、相邻子句默认为AND、括号分组、"短语"、
+    -排除、字段限定 title: content: summary: source: author: url: site:
+    （如 title:OpenAI、site:reuters.com、title:("gpt-5" OR o3)）。
+    不限字段的词项在标题 + 内容中匹配；与关键词过滤一致，匹配为不区分大小写的子串包含。
+    """
+
+    def __init__(self, text: str, root: Node):
+        self.text = text
+        self.root = root
+        self._required = required_terms(root)
+
+    @classmethod
+    def parse(cls, text: str) -> 'Query':
+        return cls(text, optimize(_Parser(text).parse()))
+
+    @classmethod
+    def from_keywords(cls, keywords: Sequence[str]) -> 'Query':
+        """把关键词列表转换为等价的查询
+
+        关键词列表按顺序由第一个出现的关键词决定结果，等价于：
+        对每个正向关键词k，"k出现且排在它前面的排除词都不出现"，各项之间为OR；
+        没有正向关键词时为"所有排除词都不出现"。
+        """
+        branches = []
+        excluded = []
+        for keyword in keywords:
+            term, is_exclude = KeywordMatcher.parse_keyword(keyword)
+            node = Term(term) if term else TRUE
+            if is_exclude:
+                excluded.append(Not(node))
+                continue
+            branches.append(And(excluded + [node]))
+        root = Or(branches) if branches else And(excluded)
+        return cls(" ".join(keywords), optimize(root))
+
+    def matches(self, item) -> bool:
+        """新闻（NewsItem）是否命中"""
+        return self.root.evaluate(QueryDocument.from_item(item))
+
+    def match_fields(self, title: str = "", content: str = "", **fields) -> bool:
+        """按字段判断（summary/source/author/url 可选）"""
+        return self.root.evaluate(QueryDocument(title, content, **fields))
+
+    def match(self, text: str) -> bool:
+        """只有一段文本时：所有字段都取这段文本（site取不到主机名，总是不命中）"""
+        return self.root.evaluate(QueryDocument(text, "", summary=text, source=text, author=text, url=text))
+
+    def may_match(self, text: str) -> bool:
+        """预筛选：返回False时该文本必然不命中"""
+        if self._required is None:
+            return True
+        text_lower = text.lower()
+        return any(term in text_lower for term in self._required)
+
+    @property
+    def required_terms(self) -> Optional[FrozenSet[str]]:
+        return self._required
+
+    def filter(self, items) -> list:
+        return [item for item in items if self.matches(item)]
+
+    def to_engine_query(self, engine: str) -> Tuple[str, bool]:
+        """转换为搜索引擎的查询语句
+
+        引擎不支持的条件（如content:、source:，以及分组的否定）被放宽为"不限制"，
+        得到的结果是精确结果的超集。
+
+        Returns:
+            (查询语句, 是否与本查询完全等价)；不等价时需要在本地再用 matches 过滤
+        """
+        fields = ENGINE_FIELDS[engine]
+        exact = [True]
+
+        def render(node: Node, top: bool = False) -> Optional[str]:
+            if isinstance(node, Const):
+                if not node.value:
+                    exact[0] = False
+                return None
+            negate = isinstance(node, Not)
+            term = node.child if negate else node
+            if isinstance(term, Term):
+                prefix = fields.get(term.field)
+                if prefix is None:
+                    exact[0] = False
+                    return None
+                text = f'"{term.text}"' if _needs_quotes(term.text) else term.text
+                return f"{'-' if negate else ''}{prefix}{text}"
+            parts = [render(child) for child in node.children]
+            if isinstance(node, Or):
+                if any(part is None for part in parts) or any(part.startswith('-') for part in parts):
+                    # OR中有无法下推的分支或排除条件时整个OR不加限制
+                    exact[0] = False
+                    return None
+                return f"({' OR '.join(parts)})"
+            parts = [part for part in parts if part is not None]
+            if not parts:
+                return None
+            return " ".join(parts) if top or len(parts) == 1 else f"({' '.join(parts)})"
+
+        rendered = render(optimize(_negation_normal_form(self.root)), top=True)
+        return rendered or "", exact[0]
+
+    def __repr__(self):
+        return f"Query({self.root!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_query(text: str) -> Query:
+    """解析并优化查询语句（结果按语句缓存，定时任务重复运行时不再解析）
+
+    Raises:
+        QuerySyntaxError: 语法错误
+    """
+    return Query.parse(text)
+
+
+def is_query(keywords: Sequence[str]) -> bool:
+    """单个参数且包含大写的AND/OR/NOT或字段限定（字段:词项，冒号后无空格）时视为查询语句
+
+    只有括号不构成查询，按普通关键词匹配。
+    """
+    return len(keywords) == 1 and _QUERY_HINT_RE.search(keywords[0]) is not None
+
+
+def compile_filter(keywords: Sequence[str]) -> Union[KeywordMatcher, Query]:
+    """编译过滤条件：查询语句编译为Query，否则为关键词列表的KeywordMatcher
+
+    两者都提供 match(text)、may_match(text) 和 match_fields(title, content, ...)。
+    """
+    if is_query(keywords):
+        return compile_query(keywords[0])
+    return compile_keywords(keywords)
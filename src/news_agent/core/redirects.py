@@ -0,0 +1,253 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import requests
+
+from .http_client import HTTPClient
+from .url_canonical import canonicalize_url
+
+# 常见的跳转/短链接主机，只有这些主机的URL需要联网解析（后缀匹配）
+DEFAULT_REDIRECT_HOSTS = (
+    'news.google.com', 'google.com', 'bing.com', 't.co', 'bit.ly', 'ow.ly', 'buff.ly',
+    'tinyurl.com', 'lnkd.in', 'dlvr.it', 'trib.al', 'feedproxy.google.com',
+    'feeds.feedburner.com', 'rss.feedsportal.com',
+)
+
+# HEAD不被支持时改用GET（只读响应头，不下载响应体）
+HEAD_FALLBACK_CODES = (403, 405, 501)
+
+
+class RedirectCache:
+    """跨运行的重定向解析结果缓存（SQLite）
+
+    每个包装URL对应一条记录：最终URL和解析时间。解析失败的URL也会记录
+    （final为NULL），在较短的 failure_ttl 内不再重试。
+    """
+
+    def __init__(self, path: str, ttl: float = 30 * 86400, failure_ttl: float = 86400):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS redirects ("
+                "url TEXT PRIMARY KEY, final TEXT, resolved_at INTEGER) WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, urls: Sequence[str], now: float = None) -> Dict[str, Optional[str]]:
+        """返回未过期的缓存结果，解析失败的URL对应None，没有缓存的URL不在结果中"""
+        now = time.time() if now is None else now
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(urls), 900):
+                batch = list(urls[start:start + 900])
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT url, final, resolved_at FROM redirects WHERE url IN ({placeholders})", batch
+                )
+                for url, final, resolved_at in rows:
+                    ttl = self.ttl if final is not None else self.failure_ttl
+                    if now - resolved_at < ttl:
+                        found[url] = final
+        return found
+
+    def put_many(self, results: Dict[str, Optional[str]], now: float = None):
+        """写入解析结果，final为None表示解析失败"""
+        if not results:
+            return
+        now = int(time.time() if now is None else now)
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO redirects (url, final, resolved_at) VALUES (?, ?, ?)",
+                [(url, final, now) for url, final in results.items()]
+            )
+            conn.commit()
+
+    def prune(self, now: float = None) -> int:
+        """删除已过期的记录，返回删除的条数"""
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "DELETE FROM redirects WHERE (final IS NOT NULL AND resolved_at < ?) "
+                "OR (final IS NULL AND resolved_at < ?)",
+                (now - self.ttl, now - self.failure_ttl)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM redirects").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+@dataclass
+class ResolveStats:
+    """一次解析的统计"""
+    candidates: int = 0  # 需要解析的不同URL数
+    cached: int = 0  # 命中缓存
+    resolved: int = 0  # 联网解析成功
+    failed: int = 0  # 联网解析失败（保留原URL）
+    changed: int = 0  # 新闻URL被替换的条数
+
+
+class RedirectResolver:
+    """并发解析跳转链接（Google/Bing跳转、短链接、聚合器链接）得到文章的最终URL
+
+    - 只解析主机在 hosts 中的URL（hosts为空时解析全部URL）
+    - 用HEAD请求跟随重定向，不支持HEAD时改用只读响应头的GET
+    - 有界线程池，同一主机同时进行的请求数不超过 per_host_limit
+    - 结果写入持久缓存，同一个包装URL在有效期内只联网解析一次
+    """
+
+    def __init__(self, cache: RedirectCache, hosts: Iterable[str] = DEFAULT_REDIRECT_HOSTS,
+                 max_workers: int = 8, per_host_limit: int = 2, timeout: float = 10,
+                 max_redirects: int = 10, client: HTTPClient = None):
+        self.cache = cache
+        self.hosts = tuple(host.lower() for host in hosts)
+        self.max_workers = max(1, max_workers)
+        self.per_host_limit = max(1, per_host_limit)
+        self.timeout = timeout
+        self.client = client or HTTPClient(
+            connect_timeout=timeout, read_timeout=timeout,
+            pool_size=max(self.max_workers, self.per_host_limit)
+        )
+        self.client.session.max_redirects = max_redirects
+        self.stats = ResolveStats()
+
+    @classmethod
+    def from_config(cls, search_config, storage_config, **kwargs) -> 'RedirectResolver':
+        """根据SearchConfig和StorageConfig创建，缓存默认放在存储目录下"""
+        cache = RedirectCache(
+            search_config.redirect_cache_path or str(Path(storage_config.directory) / ".redirects.sqlite3"),
+            ttl=search_config.redirect_cache_ttl_days * 86400
+        )
+        options = dict(
+            hosts=search_config.redirect_hosts,
+            max_workers=search_config.redirect_max_workers,
+            per_host_limit=search_config.redirect_per_host_limit,
+            timeout=search_config.redirect_timeout
+        )
+        options.update(kwargs)
+        return cls(cache, **options)
+
+    def needs_resolving(self, url: str) -> bool:
+        if not url:
+            return False
+        if not self.hosts:
+            return True
+        host = urlparse(url).netloc.lower().rsplit('@', 1)[-1].split(':', 1)[0]
+        return any(host == h or host.endswith('.' + h) for h in self.hosts)
+
+    def resolve_urls(self, urls: Iterable[str]) -> Dict[str, str]:
+        """解析一批URL，返回 {原URL: 规范化后的最终URL}，只包含最终URL与原URL不同的项"""
+        candidates = list(dict.fromkeys(url for url in urls if self.needs_resolving(url)))
+        self.stats = ResolveStats(candidates=len(candidates))
+        if not candidates:
+            return {}
+
+        results = self.cache.get_many(candidates)
+        self.stats.cached = len(results)
+        missing = [url for url in candidates if url not in results]
+        if missing:
+            fetched = dict(self._resolve_concurrently(missing))
+            self.cache.put_many(fetched)
+            self.stats.resolved = sum(1 for final in fetched.values() if final is not None)
+            self.stats.failed = len(fetched) - self.stats.resolved
+            results.update(fetched)
+
+        return {url: final for url, final in results.items() if final is not None and final != url}
+
+    def resolve_streams(self, streams: Sequence[List]) -> List[List]:
+        """把各组新闻中的跳转链接替换为最终URL（所有组的URL一起并发解析）"""
+        mapping = self.resolve_urls(item.url for stream in streams for item in stream)
+        changed = 0
+        resolved_streams = []
+        for stream in streams:
+            resolved = []
+            for item in stream:
+                final = mapping.get(item.url)
+                if final is not None:
+                    item = replace(item, url=final)
+                    changed += 1
+                resolved.append(item)
+            resolved_streams.append(resolved)
+        self.stats.changed = changed
+        return resolved_streams
+
+    def resolve_items(self, items: Sequence) -> List:
+        return self.resolve_streams([items])[0]
+
+    def _resolve_concurrently(self, urls: List[str]):
+        """并发解析，逐个返回 (url, 最终URL或None)
+
+        与RSS源获取相同：按主机分组排队，主机有空闲名额时才提交，不占用工作线程。
+        """
+        pending_by_host: Dict[str, deque] = {}
+        for url in urls:
+            pending_by_host.setdefault(urlparse(url).netloc.lower(), deque()).append(url)
+        active_by_host: Dict[str, int] = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def submit_ready():
+                for host, queue in pending_by_host.items():
+                    while (queue and len(running) < self.max_workers and
+                           active_by_host.get(host, 0) < self.per_host_limit):
+                        url = queue.popleft()
+                        active_by_host[host] = active_by_host.get(host, 0) + 1
+                        running[executor.submit(self._resolve_one, url)] = (host, url)
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    host, url = running.pop(future)
+                    active_by_host[host] -= 1
+                    yield url, future.result()
+                submit_ready()
+
+    def _resolve_one(self, url: str) -> Optional[str]:
+        """跟随重定向链，返回规范化后的最终URL；网络错误时返回None"""
+        session = self.client.session
+        timeout = (self.client.connect_timeout, self.client.read_timeout)
+        try:
+            response = session.head(url, timeout=timeout, allow_redirects=True)
+            response.close()
+            if response.status_code in HEAD_FALLBACK_CODES:
+                # 不支持HEAD的服务器：GET但只读取响应头
+                response = session.get(url, timeout=timeout, allow_redirects=True, stream=True)
+                response.close()
+        except requests.exceptions.RequestException:
+            return None
+        return canonicalize_url(response.url)
+
+    def close(self):
+        self.cache.close()
+        self.client.close()
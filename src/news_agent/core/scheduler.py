@@ -1,11 +1,19 @@
 import schedule
 import time
 import threading
-from typing import List, Callable, Dict, Any
+from typing import List, Callable, Dict, Any, Optional
+from dataclasses import replace
 from datetime import datetime, timedelta
 
 from .config import config
+from .data_sources.base import NewsItem
 from .data_sources.rss import RSSSource
+from .feed_state import FeedStateStore
+from .feed_schedule import FeedCadence
+from .feed_health import FeedHealthRegistry
+from .near_duplicates import NearDuplicateDetector
+from .percolator import Percolator
+from .redirects import RedirectResolver
 from ..storage.manager import StorageManager
 
 
@@ -14,7 +22,13 @@ class NewsScheduler:
         self.jobs: List[Dict[str, Any]] = []
         self.running = False
         self.thread = None
-        self.storage_manager = StorageManager(config.storage.directory)
+        self.storage_manager = StorageManager.from_config(config.storage)
+        # 本轮已到期、等待合并执行的任务
+        self._due_jobs: List[Dict[str, Any]] = []
+        self._due_lock = threading.Lock()
+        # 共享的条件请求缓存和检查周期最近一次更新的轮次，以及每个主题最近参与的轮次
+        self._fetch_round = 0
+        self._topic_rounds: Dict[tuple, int] = {}
     
     def add_rss_job(self, keywords: List[str], interval: str = None, time_pattern: str = None):
         """添加RSS收集任务"""
@@ -34,9 +48,9 @@ class NewsScheduler:
             'last_run': None
         }
         
-        # 创建任务函数
+        # 创建任务函数：只登记为到期，同一轮到期的主题共用一次获取
         def job_func():
-            self._run_rss_job(keywords)
+            self._queue_rss_topic(job_config)
         
         # 根据间隔类型调度任务
         if interval.endswith('h'):  # 小时间隔
@@ -54,10 +68,41 @@ class NewsScheduler:
         self.jobs.append(job_config)
         return len(self.jobs) - 1  # 返回任务ID
     
+    def _queue_rss_topic(self, job_config: Dict[str, Any]):
+        """登记到期的RSS任务，由 run_due_topics 合并执行"""
+        with self._due_lock:
+            self._due_jobs.append(job_config)
+    
+    def run_due_topics(self):
+        """执行本轮到期的所有RSS任务（共用一次获取）"""
+        with self._due_lock:
+            due_jobs, self._due_jobs = self._due_jobs, []
+        if not due_jobs:
+            return
+        self._run_rss_cycle([job['keywords'] for job in due_jobs])
+        for job in due_jobs:
+            job['last_run'] = datetime.now()
+    
     def _run_rss_job(self, keywords: List[str]):
-        """执行RSS收集任务"""
+        """执行单个RSS收集任务"""
+        self._run_rss_cycle([keywords])
+    
+    def _run_rss_cycle(self, topics: List[List[str]]):
+        """执行一轮RSS收集：所有主题共用一次RSS源获取
+        
+        RSS源只下载和解析一次（不按关键词过滤），然后用常驻查询把每条新闻
+        分配到命中的主题，各主题的新闻按各自的关键词分别保存。
+        条件请求缓存和检查周期按整个源集合记录，只有在本轮所有主题都参与了
+        上一次共享获取时才能使用：否则其他主题在此期间的获取已经更新了缓存，
+        源返回304或未到期会让本主题错过这段时间的新条目。本进程中第一次运行的主题，
+        以及上次获取之后有其他主题单独获取过的主题，跳过条件请求和检查周期，完整获取一次
+        （以前保存过的新闻由已保存新闻索引按关键词去掉）。
+        """
+        # 相同关键词的任务只处理一次
+        topics = list(dict.fromkeys(tuple(keywords) for keywords in topics))
         try:
-            print(f"[{datetime.now()}] 开始执行RSS收集任务，关键词: {keywords}")
+            print(f"[{datetime.now()}] 开始执行RSS收集任务，主题数: {len(topics)}，"
+                  f"关键词: {'; '.join(', '.join(topic) for topic in topics)}")
             
             # 获取RSS配置
             ds_config = config.data_sources
@@ -65,25 +110,82 @@ class NewsScheduler:
                 print("警告: 未配置RSS源")
                 return
             
-            # 创建RSS数据源
-            rss_source = RSSSource(ds_config.rss_sources, ds_config.rss_timeout)
+            full_fetch = any(self._topic_rounds.get(topic) != self._fetch_round for topic in topics)
             
-            # 获取新闻
-            news_items = rss_source.fetch_news(keywords)
-            
-            if news_items:
-                # 保存数据
-                storage_config = config.storage
-                saved_path = self.storage_manager.save_news(
-                    news_items, keywords, storage_config.format
+            # 创建RSS数据源（状态按整个源集合记录，不区分关键词）
+            cache_store = None
+            if ds_config.rss_conditional_get and not full_fetch:
+                cache_store = FeedStateStore.for_name(
+                    ds_config.rss_state_dir, RSSSource.state_name('cache')
+                )
+            cadence = None
+            if ds_config.rss_adaptive_schedule:
+                cadence = FeedCadence(
+                    FeedStateStore.for_name(ds_config.rss_state_dir, RSSSource.state_name('schedule')),
+                    min_interval=ds_config.rss_min_poll_minutes * 60,
+                    max_interval=ds_config.rss_max_poll_minutes * 60
                 )
-                print(f"找到 {len(news_items)} 条新闻，已保存至: {saved_path}")
-            else:
-                print("未找到相关新闻")
+            health = FeedHealthRegistry.from_config(ds_config) if ds_config.rss_circuit_breaker else None
+            redirect_resolver = None
+            if config.search.resolve_redirects:
+                redirect_resolver = RedirectResolver.from_config(config.search, config.storage)
+            rss_source = RSSSource.from_config(
+                ds_config, cache_store=cache_store, cadence=cadence, health=health,
+                redirect_resolver=redirect_resolver
+            )
+            
+            # 只获取已到期的源
+            due_urls = list(ds_config.rss_sources) if full_fetch else rss_source.due_urls()
+            if not due_urls:
+                print("没有到期的RSS源，跳过本次获取")
+                return
+            if len(due_urls) < len(ds_config.rss_sources):
+                print(f"到期的RSS源: {len(due_urls)}/{len(ds_config.rss_sources)}")
+            
+            # 获取新闻（所有主题共用）
+            try:
+                news_items = rss_source.fetch_news(urls=due_urls)
+            finally:
+                if redirect_resolver is not None:
+                    redirect_resolver.close()
+            self._fetch_round += 1
+            for topic in topics:
+                self._topic_rounds[topic] = self._fetch_round
+            
+            # 每条新闻只扫描一次，分配到命中的主题
+            by_topic = Percolator({topic: list(topic) for topic in topics}).percolate(news_items)
+            
+            # 在每个主题命中的新闻中合并近似重复（不同RSS源转载的同一篇报道）：
+            # 保留的一条由各主题自己的新闻中选出，不会因为保留的一条不命中而丢掉整篇报道
+            search_config = config.search
+            detector = NearDuplicateDetector.from_config(search_config) if search_config.near_duplicates else None
+            for topic in topics:
+                topic_items = by_topic.get(topic, [])
+                if detector is not None and len(topic_items) > 1:
+                    topic_items, near_groups = detector.dedupe(topic_items)
+                    if near_groups:
+                        print(f"[{', '.join(topic)}] 合并近似重复新闻 {sum(len(g.aliases) for g in near_groups)} 条")
+                self._save_topic(list(topic), topic_items)
                 
         except Exception as e:
             print(f"执行RSS任务时出错: {e}")
     
+    def _save_topic(self, keywords: List[str], news_items: List[NewsItem]):
+        """保存一个主题命中的新闻（只写入以前未保存过的新闻）"""
+        if not news_items:
+            print(f"[{', '.join(keywords)}] 未找到相关新闻")
+            return
+        news_items = [replace(item, keywords=list(keywords)) for item in news_items]
+        storage_config = config.storage
+        new_count = len(self.storage_manager.filter_unseen(news_items, keywords))
+        saved_path = self.storage_manager.save_news(
+            news_items, keywords, storage_config.format
+        )
+        if saved_path:
+            print(f"[{', '.join(keywords)}] 找到 {len(news_items)} 条新闻（{new_count} 条为新），已保存至: {saved_path}")
+        else:
+            print(f"[{', '.join(keywords)}] 找到 {len(news_items)} 条新闻，均已保存过")
+    
     def start(self):
         """启动调度器"""
         if self.running:
@@ -95,6 +197,7 @@ class NewsScheduler:
         def run_scheduler():
             while self.running:
                 schedule.run_pending()
+                self.run_due_topics()
                 time.sleep(1)
         
         self.thread = threading.Thread(target=run_scheduler, daemon=True)
@@ -116,6 +219,8 @@ class NewsScheduler:
         """清除所有任务"""
         schedule.clear()
         self.jobs.clear()
+        with self._due_lock:
+            self._due_jobs.clear()
         print("已清除所有任务")
     
     def get_next_run_time(self) -> str:
@@ -126,5 +231,13 @@ class NewsScheduler:
         return "无计划任务"
 
 
-# 全局调度器实例
-scheduler = NewsScheduler()
\ No newline at end of file
+# 全局调度器实例，首次使用时才创建（创建时会加载存储和已见索引）
+_scheduler: Optional[NewsScheduler] = None
+
+
+def get_scheduler() -> NewsScheduler:
+    """获取全局调度器实例"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = NewsScheduler()
+    return _scheduler
\ No newline at end of file
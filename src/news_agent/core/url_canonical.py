@@ -0,0 +1,259 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, unquote
+
+
+# 跟踪/统计参数，出现在任何网站上都可以去掉
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'gclsrc', 'msclkid', 'yclid', 'twclid', 'igshid', 'ttclid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'mkt_tok', 'oly_anon_id', 'oly_enc_id',
+    'vero_id', 'wickedid', 'rb_clickid', 's_cid', 'cmpid', 'ncid', 'ocid', 'sr_share',
+    'smid', 'ref_src', 'ref_url', 'guccounter', 'amp_js_v', 'usqp',
+})
+
+# 值为这些时表示AMP版本的参数（?amp=1、?outputType=amp）
+AMP_PARAMS = frozenset({'amp', 'outputtype', 'output'})
+AMP_VALUES = frozenset({'', '1', 'true', 'amp'})
+
+# AMP版本的链接形式：/amp/xxx、xxx/amp、xxx.amp(.html)、?amp=1
+AMP_STYLES = frozenset({'prefix', 'suffix', 'ext', 'query'})
+
+# 以这些前缀开头的参数一律去掉（utm_source、utm_medium、pk_campaign等）
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hmb_', 'ga_', 'itm_', 'wt.', 'at_')
+
+# 去掉的主机名前缀（移动版、AMP版与桌面版视为同一页面）
+HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.', 'wap.')
+
+# 国家顶级域名下常见的二级公共后缀（co.uk、com.cn、ac.jp等），
+# 去掉前缀后不能只剩下公共后缀（amp.co.uk 不是 co.uk 上的页面）
+SECOND_LEVEL_SUFFIXES = frozenset({
+    'co', 'com', 'net', 'org', 'gov', 'edu', 'ac', 'or', 'ne', 'go', 'gob', 'gouv', 'mil', 'nic', 'ltd', 'plc',
+})
+
+# 跳转链接：主机（去掉www.后） -> (路径, 存放目标地址的参数)
+REDIRECT_RULES = {
+    'google.com': ('/url', ('q', 'url')),
+    'news.google.com': ('/url', ('q', 'url')),
+    'bing.com': ('/news/apiclick.aspx', ('url',)),
+}
+
+# 按网站的规则（主机为去掉www.等前缀后的域名，子域名同样适用）
+#   keep: 只保留这些查询参数（其余全部去掉）
+#   drop: 额外去掉的查询参数（网站自己的跟踪参数）
+#   amp: 网站使用的AMP链接形式（AMP_STYLES中的值）；其他网站上 /amp、.amp 可能是正常路径，不做映射
+DOMAIN_RULES: Dict[str, Dict[str, frozenset]] = {
+    'youtube.com': {'keep': frozenset({'v', 'list'})},
+    'nytimes.com': {'drop': frozenset({'smid', 'smtyp', 'searchResultPosition', 'partner', 'emc', 'campaign_id',
+                                       'instance_id', 'segment_id', 'user_id', 'regi_id', 'te', 'nl', 'algo',
+                                       'module', 'pgtype'}),
+                    'amp': frozenset({'ext'})},
+    'wsj.com': {'drop': frozenset({'mod', 'reflink', 'st', 'cx_testId', 'cx_testVariant', 'cx_artPos'})},
+    'bloomberg.com': {'drop': frozenset({'srnd', 'sref', 'leadSource', 'embedded-checkout', 'in_source'})},
+    'reuters.com': {'drop': frozenset({'taid', 'feedType', 'feedName', 'il', 'rpc'})},
+    'theguardian.com': {'drop': frozenset({'CMP', 'INTCMP'})},
+    'bbc.com': {'drop': frozenset({'ns_mchannel', 'ns_source', 'ns_campaign', 'ns_linkname', 'ns_fee',
+                                   'xtor', 'intlink_from_url', 'link_location'}),
+                'amp': frozenset({'ext'})},
+    'bbc.co.uk': {'drop': frozenset({'ns_mchannel', 'ns_source', 'ns_campaign', 'ns_linkname', 'ns_fee',
+                                     'xtor', 'intlink_from_url', 'link_location'}),
+                  'amp': frozenset({'ext'})},
+    'cnn.com': {'drop': frozenset({'iid', 'hpt', 'sr', 'iref', 'cid'})},
+    'axios.com': {'drop': frozenset({'stream', 'source'})},
+    'washingtonpost.com': {'drop': frozenset({'itid', 'wpisrc', 'wpmk', 'pwapi_token', 'tid'}),
+                           'amp': frozenset({'query'})},
+    'ft.com': {'drop': frozenset({'ftcamp', 'segmentid', 'desktop', 'shareType', 'sharetype'})},
+    'medium.com': {'drop': frozenset({'source', 'sk'})},
+    'weibo.com': {'drop': frozenset({'display', 'retcode'})},
+    'sina.com.cn': {'drop': frozenset({'from', 'vt'})},
+    'qq.com': {'drop': frozenset({'ADTAG', 'adtag', 'pgv_ref'})},
+    '163.com': {'drop': frozenset({'f', 'spss'})},
+}
+
+# AMP页面路径，按链接形式：/amp/xxx、xxx/amp、xxx.amp、xxx.amp.html
+_AMP_PATH_PATTERNS = {
+    'prefix': r'^/amp(?=/)',
+    'suffix': r'/amp/?$',
+    'ext': r'\.amp(?=\.html?$|$)',
+}
+
+# Google AMP缓存：www.google.com/amp/s/example.com/... 与 *.cdn.ampproject.org/c/s/example.com/...
+_GOOGLE_AMP_RE = re.compile(r'^/amp/(s/)?(.+)$')
+_AMP_CDN_RE = re.compile(r'^/[cv]/(s/)?(.+)$')
+
+# 查询参数重新编码时不转义的字符
+_QUERY_SAFE = "/:@!$'()*,;"
+
+_SLASHES_RE = re.compile(r'/{2,}')
+
+_DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def unwrap_redirect(url: str) -> str:
+    """展开Google/Bing跳转链接（/url?q=...），得到真实的新闻链接；其他链接只去掉首尾空白"""
+    url = (url or '').strip()
+    if url.startswith('/url?'):
+        # Google搜索结果页中的相对跳转链接
+        params = dict(parse_qsl(url[5:]))
+        target = params.get('q') or params.get('url')
+        return unwrap_redirect(target) if target else url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if parts.scheme.lower() not in ('http', 'https') or not parts.hostname:
+        return url
+    target = _unwrap_redirect(parts)
+    return unwrap_redirect(target) if target is not None else url
+
+
+@lru_cache(maxsize=65536)
+def canonicalize_url(url: str) -> str:
+    """把新闻链接规范化为用于去重和哈希的形式
+
+    规范化结果只作为比较用的键（NewsItem.identity_key、已保存索引的URL键），
+    新闻条目上保存的仍是原始链接：去掉前缀或参数后的地址不一定能打开。
+
+    - 展开Google/Bing跳转链接（/url?q=...）和Google AMP缓存链接
+    - 协议和主机名小写，去掉默认端口和 www./m./amp. 等前缀
+    - AMP链接（amp.子域名、AMP缓存、DOMAIN_RULES中登记了AMP形式的网站）映射到原文路径
+    - 去掉跟踪参数并按参数名排序，按网站规则去掉网站自己的跟踪参数或只保留有意义的参数
+    - 去掉片段（#...）和路径末尾的 /
+
+    不是http(s)绝对地址的链接只去掉首尾空白后原样返回。同一地址多次规范化结果不变。
+    """
+    return _canonicalize(url, False)
+
+
+def _canonicalize(url: str, from_amp_cache: bool) -> str:
+    url = (url or '').strip()
+    if url.startswith('/url?'):
+        # Google搜索结果页中的相对跳转链接
+        params = dict(parse_qsl(url[5:]))
+        target = params.get('q') or params.get('url')
+        return canonicalize_url(target) if target else url
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in ('http', 'https') or not parts.hostname:
+        return url
+
+    target = _unwrap_redirect(parts)
+    if target is not None:
+        return canonicalize_url(target)
+
+    host = parts.hostname.rstrip('.')
+    match = None
+    if host.endswith('.cdn.ampproject.org'):
+        match = _AMP_CDN_RE.match(parts.path)
+    elif host in ('google.com', 'www.google.com'):
+        match = _GOOGLE_AMP_RE.match(parts.path)
+    if match:
+        secure, rest = match.groups()
+        return _canonicalize(f"{'https' if secure else 'http'}://{rest}", True)
+
+    original_host = host.lower()
+    host = _normalize_host(original_host)
+    netloc = host
+    if port is not None and str(port) != _DEFAULT_PORTS[scheme]:
+        netloc = f"{host}:{port}"
+
+    rule = _domain_rule(host) or {}
+    if from_amp_cache or (original_host.startswith('amp.') and host != original_host):
+        # AMP缓存中的页面和amp.子域名上的页面一定是AMP版本
+        amp_styles = AMP_STYLES
+    else:
+        amp_styles = rule.get('amp', frozenset())
+
+    path = parts.path
+    if amp_styles and 'amp' in path.lower():
+        path = _amp_path_re(amp_styles).sub('', path)
+    if '//' in path:
+        path = _SLASHES_RE.sub('/', path)
+    path = path.rstrip('/') or '/'
+
+    query = _clean_query(rule, parts.query, 'query' in amp_styles)
+    # #!开头的片段是旧式单页应用的路由，需要保留
+    fragment = parts.fragment if parts.fragment.startswith('!') else ''
+    return urlunsplit((scheme, netloc, path, query, fragment))
+
+
+def canonicalize_urls(urls: Iterable[str]) -> List[str]:
+    """批量规范化，相同的链接只计算一次（用于已保存的数据集）"""
+    urls = list(urls)
+    mapping = {url: canonicalize_url(url) for url in dict.fromkeys(urls)}
+    return [mapping[url] for url in urls]
+
+
+def _unwrap_redirect(parts) -> Optional[str]:
+    """展开搜索引擎的跳转链接，不是跳转链接时返回None"""
+    host = parts.hostname
+    rule = REDIRECT_RULES.get(host[4:] if host.startswith('www.') else host)
+    if rule is None or parts.path != rule[0]:
+        return None
+    params = dict(parse_qsl(parts.query))
+    for name in rule[1]:
+        target = params.get(name)
+        if target and target.startswith(('http://', 'https://', 'http%', 'https%')):
+            return unquote(target) if '%' in target[:8] else target
+    return None
+
+
+def _normalize_host(host: str) -> str:
+    host = host.lower()
+    for prefix in HOST_PREFIXES:
+        # 只去掉一层前缀，并保证剩下的仍是完整域名（比公共后缀多至少一级）
+        if host.startswith(prefix):
+            rest = host[len(prefix):]
+            if rest.count('.') + 1 > _suffix_labels(rest):
+                return rest
+            break
+    return host
+
+
+def _suffix_labels(host: str) -> int:
+    """估计主机名的公共后缀级数：xx.co.uk、xx.com.cn 为2，其他为1"""
+    labels = host.rsplit('.', 2)
+    if len(labels) >= 2 and len(labels[-1]) == 2 and labels[-2] in SECOND_LEVEL_SUFFIXES:
+        return 2
+    return 1
+
+
+def _domain_rule(host: str) -> Optional[Dict[str, frozenset]]:
+    # 依次尝试 a.b.example.com、b.example.com、example.com
+    while host:
+        rule = DOMAIN_RULES.get(host)
+        if rule is not None:
+            return rule
+        _, _, host = host.partition('.')
+    return None
+
+
+@lru_cache(maxsize=None)
+def _amp_path_re(styles: frozenset):
+    return re.compile('|'.join(_AMP_PATH_PATTERNS[style] for style in sorted(styles) if style in _AMP_PATH_PATTERNS),
+                      re.IGNORECASE)
+
+
+def _clean_query(rule: Dict[str, frozenset], query: str, strip_amp: bool) -> str:
+    if not query:
+        return ''
+    keep = rule.get('keep')
+    drop = rule.get('drop', frozenset())
+    params = []
+    for name, value in parse_qsl(query, keep_blank_values=True):
+        if keep is not None:
+            if name in keep:
+                params.append((name, value))
+            continue
+        lower = name.lower()
+        if lower in TRACKING_PARAMS or lower.startswith(TRACKING_PREFIXES) or name in drop:
+            continue
+        if strip_amp and lower in AMP_PARAMS and value.lower() in AMP_VALUES:
+            continue
+        params.append((name, value))
+    params.sort()
+    return urlencode(params, safe=_QUERY_SAFE)
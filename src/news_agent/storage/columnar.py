@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ..core.data_sources.base import NewsItem
+
+
+# 按列存储新闻时使用的表结构（Parquet片段、CSV读取结果）
+NEWS_SCHEMA = pa.schema([
+    ('title', pa.string()),
+    ('content', pa.string()),
+    ('url', pa.string()),
+    ('published_date', pa.timestamp('us')),
+    ('source', pa.string()),
+    ('author', pa.string()),
+    ('summary', pa.string()),
+    ('keywords', pa.string()),
+])
+
+
+def items_to_table(items: Sequence[NewsItem]) -> pa.Table:
+    """新闻列表转为Arrow表（作者、摘要为空时保存为空字符串，关键词以 | 连接）"""
+    return pa.table({
+        'title': [item.title for item in items],
+        'content': [item.content for item in items],
+        'url': [item.url for item in items],
+        'published_date': [item.published_date for item in items],
+        'source': [item.source for item in items],
+        'author': [item.author or '' for item in items],
+        'summary': [item.summary or '' for item in items],
+        'keywords': ['|'.join(item.keywords) if item.keywords else '' for item in items],
+    }, schema=NEWS_SCHEMA)
+
+
+def table_to_items(table: pa.Table, published_dates: Optional[List[datetime]] = None) -> List[NewsItem]:
+    """Arrow表转为新闻列表
+
+    空值处理、关键词拆分和时间转换都按整列完成，逐行只剩构造NewsItem。
+    published_dates 不为None时代替表中的发布时间（CSV中时区不一致时使用）。
+    """
+    def text(name: str) -> List[str]:
+        return pc.fill_null(_column(table, name), '').to_pylist()
+
+    def optional_text(name: str) -> list:
+        return _blank_to_null(_column(table, name)).to_pylist()
+
+    if published_dates is None:
+        dates = table.column('published_date')
+        if pa.types.is_timestamp(dates.type) and dates.type.unit != 'us':
+            # 纳秒时间转为Python datetime时会变成pandas.Timestamp，先截断到微秒
+            dates = dates.cast(pa.timestamp('us', dates.type.tz), safe=False)
+        published_dates = dates.to_pylist()
+
+    keywords = pc.split_pattern(_blank_to_null(_column(table, 'keywords')), '|').to_pylist()
+
+    return [
+        NewsItem(title=title, content=content, url=url, published_date=published_date,
+                 source=source, author=author, summary=summary, keywords=keyword_list or [])
+        for title, content, url, published_date, source, author, summary, keyword_list in zip(
+            text('title'), text('content'), text('url'), published_dates, text('source'),
+            optional_text('author'), optional_text('summary'), keywords
+        )
+    ]
+
+
+def _column(table: pa.Table, name: str) -> pa.ChunkedArray:
+    """取文本列，缺少的列视为全部为空，非文本类型（如CSV中全空推断成的数值）转为文本"""
+    if name not in table.column_names:
+        return pa.chunked_array([pa.nulls(table.num_rows, pa.string())])
+    column = table.column(name)
+    if not pa.types.is_string(column.type):
+        column = column.cast(pa.string())
+    return column
+
+
+def _blank_to_null(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """空字符串转为空值（空值在转换为Python对象时是None）"""
+    return pc.if_else(pc.greater(pc.utf8_length(column), 0), column, pa.scalar(None, pa.string()))
+
+
+def parse_iso_dates(values: pd.Series):
+    """按整列解析ISO 8601时间字符串
+
+    Returns:
+        (解析后的Series, None)；时区不一致（有的带时差有的不带，或时差不同）时无法放进一列，
+        返回 (统一为UTC的Series或原始Series, 逐个解析的datetime列表)，后者保留各自的时区
+    """
+    try:
+        parsed = pd.to_datetime(values, format='ISO8601')
+        if parsed.dtype.kind == 'M':
+            return parsed, None
+    except (ValueError, TypeError):
+        pass
+    # 相同的时间字符串只解析一次
+    cache = {value: datetime.fromisoformat(value) for value in pd.unique(values)}
+    exact = [cache[value] for value in values]
+    try:
+        return pd.to_datetime(values, format='ISO8601', utc=True), exact
+    except (ValueError, TypeError):
+        return values, exact
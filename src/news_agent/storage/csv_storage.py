@@ -1,8 +1,9 @@
 import pandas as pd
+import pyarrow as pa
 from typing import List
-from datetime import datetime
 
 from .base import StorageBackend
+from .columnar import parse_iso_dates, table_to_items
 from ..core.data_sources.base import NewsItem
 
 
@@ -31,30 +32,27 @@ class CSVStorage(StorageBackend):
         return str(file_path)
     
     def load(self, filename: str) -> List[NewsItem]:
+        df, exact_dates = self._read(filename)
+        return table_to_items(pa.Table.from_pandas(df, preserve_index=False), published_dates=exact_dates)
+    
+    def load_dataframe(self, filename: str) -> pd.DataFrame:
+        """读取为DataFrame（供分析使用）：文本列中的空值为空字符串，发布时间为datetime列
+        （时区不一致时统一为UTC）"""
+        return self._read(filename)[0]
+    
+    def load_table(self, filename: str) -> pa.Table:
+        return pa.Table.from_pandas(self.load_dataframe(filename), preserve_index=False)
+    
+    def _read(self, filename: str):
         file_path = self.get_file_path(filename)
         
         if not file_path.exists():
             raise FileNotFoundError(f"文件不存在: {file_path}")
         
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
-        
-        news_items = []
-        for _, row in df.iterrows():
-            keywords = row['keywords'].split('|') if row['keywords'] else []
-            
-            news_item = NewsItem(
-                title=row['title'],
-                content=row['content'],
-                url=row['url'],
-                published_date=datetime.fromisoformat(row['published_date']),
-                source=row['source'],
-                author=row['author'] if pd.notna(row['author']) and row['author'] else None,
-                summary=row['summary'] if pd.notna(row['summary']) and row['summary'] else None,
-                keywords=keywords
-            )
-            news_items.append(news_item)
-        
-        return news_items
+        # 全部按文本读取，空单元格为空字符串（不推断成NaN）
+        df = pd.read_csv(file_path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+        df['published_date'], exact_dates = parse_iso_dates(df['published_date'])
+        return df, exact_dates
     
     def get_file_extension(self) -> str:
         return "csv"
\ No newline at end of file
@@ -33,21 +33,7 @@ class JSONStorage(StorageBackend):
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        news_items = []
-        for item_data in data.get('news', []):
-            news_item = NewsItem(
-                title=item_data.get('title', ''),
-                content=item_data.get('content', ''),
-                url=item_data.get('url', ''),
-                published_date=datetime.fromisoformat(item_data.get('published_date')),
-                source=item_data.get('source', ''),
-                author=item_data.get('author'),
-                summary=item_data.get('summary'),
-                keywords=item_data.get('keywords', [])
-            )
-            news_items.append(news_item)
-        
-        return news_items
+        return [NewsItem.from_dict(item_data) for item_data in data.get('news', [])]
     
     def get_file_extension(self) -> str:
         return "json"
\ No newline at end of file
@@ -0,0 +1,90 @@
+import json
+import os
+from typing import Iterable, Iterator, List
+
+from .base import StorageBackend
+from ..core.data_sources.base import NewsItem
+
+try:
+    import orjson  # 可选依赖，比标准库json快数倍
+except ImportError:
+    orjson = None
+
+
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(line: bytes):
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+class JSONLStorage(StorageBackend):
+    """JSON Lines存储：每行一条紧凑的新闻记录
+
+    保存总是追加到文件末尾（文件不存在时创建），同一个文件可以跨多次运行累积；
+    读取按行解析，iter_load 逐条产出新闻，内存占用与文件大小无关。
+    写入中途崩溃只会留下一行不完整的记录：读取时跳过无法解析的行，
+    下一次追加前先补上换行，不会与新记录连在一起。
+    """
+
+    def save(self, news_items: List[NewsItem], filename: str) -> str:
+        file_path = self.get_file_path(filename)
+
+        with open(file_path, 'ab') as f:
+            # 上次写入中断时最后一行没有换行，先补上
+            if f.tell() > 0 and not _ends_with_newline(file_path):
+                f.write(b'\n')
+            f.writelines(_dumps(item.to_dict()) + b'\n' for item in news_items)
+            f.flush()
+            os.fsync(f.fileno())
+
+        return str(file_path)
+
+    def append(self, news_items: Iterable[NewsItem], filename: str, batch_size: int = 1000) -> str:
+        """分批追加（适合逐条产生的新闻流），每批写入后落盘"""
+        batch = []
+        file_path = str(self.get_file_path(filename))
+        for item in news_items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                self.save(batch, filename)
+                batch = []
+        if batch:
+            self.save(batch, filename)
+        return file_path
+
+    def load(self, filename: str) -> List[NewsItem]:
+        return list(self.iter_load(filename))
+
+    def iter_load(self, filename: str) -> Iterator[NewsItem]:
+        """逐条读取新闻，跳过空行和无法解析的行（例如被截断的最后一行）"""
+        file_path = self.get_file_path(filename)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+
+        with open(file_path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = _loads(line)
+                except ValueError:
+                    continue
+                if isinstance(data, dict):
+                    yield NewsItem.from_dict(data)
+
+    def get_file_extension(self) -> str:
+        return "jsonl"
+
+
+def _ends_with_newline(file_path) -> bool:
+    with open(file_path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
@@ -1,35 +1,122 @@
-from typing import List, Dict, Any
+import pandas as pd
+import pyarrow as pa
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 from .base import StorageBackend
+from .columnar import items_to_table
 from .json_storage import JSONStorage
+from .jsonl_storage import JSONLStorage
 from .csv_storage import CSVStorage
 from .parquet_storage import ParquetStorage
+from .seen_index import SeenIndex, keyword_scope
+from .seen_filter import SeenFilter
 from ..core.data_sources.base import NewsItem
 
 
 class StorageManager:
-    def __init__(self, storage_dir: str = "data"):
+    def __init__(self, storage_dir: str = "data", seen_index: SeenIndex = None,
+                 backends: Dict[str, StorageBackend] = None):
         self.storage_dir = storage_dir
+        # 跨运行的已保存新闻索引，为None时每次保存全部新闻
+        self.seen_index = seen_index
         self._backends: Dict[str, StorageBackend] = {
             'json': JSONStorage(storage_dir),
+            'jsonl': JSONLStorage(storage_dir),
             'csv': CSVStorage(storage_dir),
             'parquet': ParquetStorage(storage_dir)
         }
+        # 替换或补充默认的存储后端（如按配置创建的Parquet数据集）
+        self._backends.update(backends or {})
     
     def get_backend(self, format_name: str) -> StorageBackend:
         if format_name not in self._backends:
             raise ValueError(f"不支持的存储格式: {format_name}. 支持的格式: {list(self._backends.keys())}")
         return self._backends[format_name]
     
+    @classmethod
+    def from_config(cls, storage_config) -> 'StorageManager':
+        """根据StorageConfig创建，按配置启用已保存新闻索引和已见过滤器"""
+        seen_index = None
+        if storage_config.seen_index:
+            seen_filter = None
+            if storage_config.seen_filter:
+                seen_filter = SeenFilter(
+                    error_rate=storage_config.seen_filter_error_rate,
+                    capacity=storage_config.seen_filter_capacity,
+                    window=storage_config.seen_filter_window_days * 86400,
+                    generations=storage_config.seen_filter_generations,
+                    snapshot_path=storage_config.seen_filter_path or str(Path(storage_config.directory) / ".seen_filter.npz"),
+                    snapshot_interval=storage_config.seen_filter_snapshot_minutes * 60
+                )
+            seen_index = SeenIndex(
+                storage_config.seen_index_path or str(Path(storage_config.directory) / ".seen_index.sqlite3"),
+                track_times=storage_config.seen_track_times,
+                seen_filter=seen_filter
+            )
+            # 从快照恢复后补上快照之后写入索引的键；没有快照时用窗口内的全部键填充，
+            # 避免把已保存过的新闻当作新新闻
+            if seen_filter is not None:
+                seen_index.warm_filter(since=seen_filter.snapshot_time if seen_filter.load() else None)
+        parquet = ParquetStorage(
+            storage_config.directory,
+            dataset=storage_config.parquet_dataset,
+            dataset_name=storage_config.parquet_dataset_name,
+            partition_by=storage_config.parquet_partition_by,
+            row_group_size=storage_config.parquet_row_group_size
+        )
+        return cls(storage_config.directory, seen_index=seen_index, backends={'parquet': parquet})
+    
+    def filter_unseen(self, news_items: List[NewsItem], keywords: List[str] = None) -> List[NewsItem]:
+        """去掉以前运行中以相同关键词保存过的新闻（按URL和内容哈希）"""
+        if self.seen_index is None:
+            return list(news_items)
+        return self.seen_index.filter_unseen(news_items, scope=keyword_scope(keywords))
+    
     def save_news(self, news_items: List[NewsItem], keywords: List[str] = None, 
-                  format_name: str = "json", filename: str = None) -> str:
+                  format_name: str = "json", filename: str = None,
+                  skip_seen: bool = True) -> Optional[str]:
+        """保存新闻，启用索引时只写入以前以相同关键词（不区分顺序和大小写）未保存过的新闻
+        
+        Returns:
+            保存的文件路径；没有新新闻时返回None
+        """
         backend = self.get_backend(format_name)
         
-        if filename is None:
-            filename = backend.generate_filename(keywords or [])
+        scope = keyword_scope(keywords)
+        to_save = news_items
+        if self.seen_index is not None and skip_seen:
+            to_save = self.seen_index.filter_unseen(news_items, scope=scope)
         
-        return backend.save(news_items, filename)
+        saved_path = None
+        if to_save:
+            if filename is None:
+                filename = backend.generate_filename(keywords or [])
+            saved_path = backend.save(to_save, filename)
+        
+        # 写入成功后再记录（已保存过的新闻更新最近出现时间）
+        if self.seen_index is not None:
+            self.seen_index.mark_seen(news_items, scope=scope)
+        
+        return saved_path
     
     def load_news(self, filename: str, format_name: str = None) -> List[NewsItem]:
+        backend = self.get_backend(self._infer_format(filename, format_name))
+        return backend.load(filename)
+    
+    def load_table(self, filename: str, format_name: str = None) -> pa.Table:
+        """以Arrow表读取（供分析使用）：Parquet和CSV按列读取，不构造NewsItem"""
+        backend = self.get_backend(self._infer_format(filename, format_name))
+        if hasattr(backend, 'load_table'):
+            return backend.load_table(filename)
+        return items_to_table(backend.load(filename))
+    
+    def load_dataframe(self, filename: str, format_name: str = None) -> pd.DataFrame:
+        backend = self.get_backend(self._infer_format(filename, format_name))
+        if hasattr(backend, 'load_dataframe'):
+            return backend.load_dataframe(filename)
+        return items_to_table(backend.load(filename)).to_pandas()
+    
+    def _infer_format(self, filename: str, format_name: str = None) -> str:
         # 如果没有指定格式，从文件扩展名推断
         if format_name is None:
             for fmt, backend in self._backends.items():
@@ -39,9 +126,7 @@ class StorageManager:
             
             if format_name is None:
                 raise ValueError(f"无法从文件名推断格式: {filename}")
-        
-        backend = self.get_backend(format_name)
-        return backend.load(filename)
+        return format_name
     
     def list_files(self, format_name: str = None) -> Dict[str, List[str]]:
         if format_name:
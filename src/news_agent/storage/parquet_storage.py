@@ -1,15 +1,71 @@
+import json
+import os
+import time
+import uuid
 import pandas as pd
-from typing import List
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
+from urllib.parse import quote
 
 from .base import StorageBackend
+from .columnar import NEWS_SCHEMA, items_to_table, table_to_items
 from ..core.data_sources.base import NewsItem
 
 
+# 数据集模式下可用的分区列
+PARTITION_COLUMNS = ('date', 'source', 'keyword')
+
+# 片段文件中保存的列（分区列保存在目录名中）
+FRAGMENT_SCHEMA = NEWS_SCHEMA
+
+# 正在写入的临时文件和合并日志以 . 开头，读取数据集时被忽略
+TEMP_PREFIX = '.tmp-'
+JOURNAL_PREFIX = '.compact-'
+
+# 超过这个时间仍未发布的临时文件视为崩溃遗留
+STALE_TEMP_SECONDS = 3600
+
+
 class ParquetStorage(StorageBackend):
+    """Parquet存储
+
+    默认每次保存写一个独立文件。dataset为True时改为追加到一个按Hive风格分区的
+    数据集目录（如 news_dataset.parquet/date=2025-09-01/source=BBC/part-….parquet）：
+
+    - 每次保存在每个分区中追加一个新片段，行组大小为 row_group_size
+    - 片段先写入以 . 开头的临时文件、fsync后再原子重命名，读取方永远看不到写了一半的文件
+    - 读取时整个目录是一张逻辑表，可以按分区列过滤（只打开相关目录）
+    - compact() 把分区中的小片段合并成一个，用合并日志保证中途崩溃后可以恢复
+    """
+
+    def __init__(self, storage_dir: str = "data", dataset: bool = False,
+                 dataset_name: str = "news_dataset.parquet",
+                 partition_by: Sequence[str] = ('date', 'source'),
+                 row_group_size: int = 64 * 1024):
+        super().__init__(storage_dir)
+        self.dataset = dataset
+        self.dataset_name = dataset_name
+        unknown = set(partition_by) - set(PARTITION_COLUMNS)
+        if unknown:
+            raise ValueError(f"不支持的分区列: {sorted(unknown)}. 支持的分区列: {list(PARTITION_COLUMNS)}")
+        self.partition_by = tuple(partition_by)
+        self.row_group_size = max(1, row_group_size)
+
+    @property
+    def dataset_path(self) -> Path:
+        return self.storage_dir / self.dataset_name
+
     def save(self, news_items: List[NewsItem], filename: str) -> str:
+        if self.dataset:
+            self.append(news_items, prefix=Path(filename).stem)
+            return str(self.dataset_path)
+
         file_path = self.get_file_path(filename)
-        
+
         # 转换为DataFrame
         data = []
         for item in news_items:
@@ -24,41 +80,185 @@ class ParquetStorage(StorageBackend):
                 'keywords': '|'.join(item.keywords) if item.keywords else ''
             }
             data.append(row)
-        
+
         df = pd.DataFrame(data)
-        
+
         # 确保发布时间是datetime类型
         df['published_date'] = pd.to_datetime(df['published_date'])
-        
+
         df.to_parquet(file_path, index=False)
-        
+
         return str(file_path)
-    
+
     def load(self, filename: str) -> List[NewsItem]:
+        return table_to_items(self.load_table(filename))
+
+    def load_table(self, filename: str, columns: List[str] = None) -> pa.Table:
+        """以Arrow表读取文件或数据集目录（供分析使用，不构造NewsItem）"""
         file_path = self.get_file_path(filename)
-        
+
         if not file_path.exists():
             raise FileNotFoundError(f"文件不存在: {file_path}")
-        
-        df = pd.read_parquet(file_path)
-        
-        news_items = []
-        for _, row in df.iterrows():
-            keywords = row['keywords'].split('|') if row['keywords'] else []
-            
-            news_item = NewsItem(
-                title=row['title'],
-                content=row['content'],
-                url=row['url'],
-                published_date=row['published_date'].to_pydatetime(),
-                source=row['source'],
-                author=row['author'] if pd.notna(row['author']) and row['author'] else None,
-                summary=row['summary'] if pd.notna(row['summary']) and row['summary'] else None,
-                keywords=keywords
-            )
-            news_items.append(news_item)
-        
-        return news_items
-    
+
+        # 数据集目录作为一个整体读取（不论当前是否以数据集模式写入）
+        if file_path.is_dir():
+            return self.read_table(columns=columns, path=file_path)
+        return pq.read_table(file_path, columns=columns)
+
+    def load_dataframe(self, filename: str, columns: List[str] = None) -> pd.DataFrame:
+        return self.load_table(filename, columns).to_pandas()
+
     def get_file_extension(self) -> str:
-        return "parquet"
\ No newline at end of file
+        return "parquet"
+
+    # ---- 数据集模式 ----
+
+    def append(self, news_items: List[NewsItem], prefix: str = "part") -> List[str]:
+        """把新闻按分区追加为新片段，返回写入的片段路径"""
+        if not news_items:
+            return []
+
+        groups: Dict[Tuple[str, ...], List[NewsItem]] = {}
+        for item in news_items:
+            groups.setdefault(self._partition_values(item), []).append(item)
+
+        written = []
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for values, items in groups.items():
+            directory = self._partition_dir(values)
+            name = f"{prefix}-{stamp}-{uuid.uuid4().hex[:8]}.parquet"
+            written.append(str(self._write_fragment(items_to_table(items), directory / name)))
+        return written
+
+    def read_table(self, filter=None, columns: List[str] = None, path: Path = None) -> pa.Table:
+        """以一张表读取整个数据集；filter 为 pyarrow.dataset 表达式，
+        如 (ds.field('date') >= '2025-09-01') & (ds.field('source') == 'BBC')，
+        只会打开满足分区条件的目录中的片段"""
+        dataset = self.open_dataset(path)
+        if dataset is None:
+            return FRAGMENT_SCHEMA.empty_table()
+        return dataset.to_table(filter=filter, columns=columns)
+
+    def load_dataset(self, filter=None) -> List[NewsItem]:
+        return table_to_items(self.read_table(filter))
+
+    def open_dataset(self, path: Path = None) -> Optional[ds.Dataset]:
+        """打开数据集，数据集还不存在时返回None
+
+        分区列按目录结构识别（以其他 partition_by 写入的数据集也能读取），一律作为字符串列；
+        与片段中同名的列（如source）以片段中的值为准。
+        """
+        path = Path(path) if path is not None else self.dataset_path
+        if not path.is_dir():
+            return None
+        self._recover(path)
+        fragments = _fragments(path)
+        if not fragments:
+            return None
+        columns = [part.split('=', 1)[0] for part in fragments[0].relative_to(path).parent.parts]
+        partitioning = ds.partitioning(pa.schema([(column, pa.string()) for column in columns]), flavor='hive')
+        schema = pa.unify_schemas([
+            FRAGMENT_SCHEMA,
+            pa.schema([(column, pa.string()) for column in columns if column not in FRAGMENT_SCHEMA.names])
+        ])
+        return ds.dataset([str(fragment) for fragment in fragments], format='parquet',
+                          partitioning=partitioning, partition_base_dir=str(path), schema=schema)
+
+    def compact(self, min_fragments: int = 2) -> int:
+        """把每个分区中的片段合并成一个，返回合并掉的片段数
+
+        步骤：写临时文件 → 写合并日志 → 重命名为正式片段 → 删除旧片段 → 删除日志。
+        中途崩溃时由 recover() 根据日志完成或撤销这次合并，不会重复或丢失数据。
+        """
+        if not self.dataset_path.is_dir():
+            return 0
+        self.recover()
+        removed = 0
+        for directory in sorted({path.parent for path in _fragments(self.dataset_path)}):
+            fragments = sorted(path for path in directory.glob('*.parquet') if not path.name.startswith('.'))
+            if len(fragments) < min_fragments:
+                continue
+            table = pa.concat_tables(pq.read_table(path, schema=FRAGMENT_SCHEMA) for path in fragments)
+            target = directory / f"compacted-{datetime.now().strftime('%Y%m%d_%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet"
+            temp = directory / (TEMP_PREFIX + target.name)
+            self._write_parquet(table, temp)
+            journal = directory / f"{JOURNAL_PREFIX}{target.stem}.json"
+            _write_atomic(journal, json.dumps({
+                'target': target.name, 'temp': temp.name, 'sources': [path.name for path in fragments]
+            }).encode('utf-8'))
+            self._finish_compaction(journal)
+            removed += len(fragments)
+        return removed
+
+    def recover(self):
+        """完成或撤销中断的合并，并清理崩溃留下的临时文件"""
+        self._recover(self.dataset_path)
+
+    def _recover(self, path: Path):
+        if not path.is_dir():
+            return
+        for journal in path.rglob(f"{JOURNAL_PREFIX}*.json"):
+            self._finish_compaction(journal)
+        # 其他进程可能正在写入，只删除足够旧的临时文件
+        expired = time.time() - STALE_TEMP_SECONDS
+        for temp in path.rglob(f"{TEMP_PREFIX}*"):
+            try:
+                if temp.stat().st_mtime < expired:
+                    temp.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _finish_compaction(self, journal: Path):
+        directory = journal.parent
+        record = json.loads(journal.read_text(encoding='utf-8'))
+        temp, target = directory / record['temp'], directory / record['target']
+        if temp.exists():
+            # 日志已写入说明临时文件完整，可以安全地发布
+            os.replace(temp, target)
+        if target.exists():
+            for name in record['sources']:
+                (directory / name).unlink(missing_ok=True)
+        journal.unlink(missing_ok=True)
+
+    def _partition_values(self, item: NewsItem) -> Tuple[str, ...]:
+        values = []
+        for column in self.partition_by:
+            if column == 'date':
+                values.append(item.published_date.strftime('%Y-%m-%d'))
+            elif column == 'source':
+                values.append(item.source or 'unknown')
+            else:
+                values.append('_'.join(item.keywords) if item.keywords else 'all')
+        return tuple(values)
+
+    def _partition_dir(self, values: Tuple[str, ...]) -> Path:
+        # 分区值按URI编码（pyarrow读取时自动解码），避免 / 等字符破坏目录结构
+        parts = [f"{column}={quote(value, safe='')}" for column, value in zip(self.partition_by, values)]
+        return self.dataset_path.joinpath(*parts)
+
+    def _write_fragment(self, table: pa.Table, path: Path) -> Path:
+        temp = path.with_name(TEMP_PREFIX + path.name)
+        self._write_parquet(table, temp)
+        os.replace(temp, path)
+        return path
+
+    def _write_parquet(self, table: pa.Table, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, str(path), row_group_size=self.row_group_size)
+        with open(path, 'rb') as f:
+            os.fsync(f.fileno())
+
+
+def _fragments(path: Path) -> List[Path]:
+    """数据集中已发布的片段（不含临时文件）"""
+    return sorted(fragment for fragment in path.rglob('*.parquet')
+                  if fragment.is_file() and not fragment.name.startswith('.'))
+
+
+def _write_atomic(path: Path, data: bytes):
+    temp = path.with_name(TEMP_PREFIX + path.name)
+    with open(temp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, path)
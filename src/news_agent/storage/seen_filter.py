@@ -0,0 +1,285 @@
+import json
+import math
+import os
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+
+# splitmix64的常量，用于由64位键派生两个独立哈希
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+_SEED_2 = np.uint64(0x9E3779B97F4A7C15)
+
+# 可扩展Bloom过滤器：新一层的容量倍数和误判率收紧比例
+GROWTH = 2
+TIGHTENING = 0.5
+
+SNAPSHOT_VERSION = 1
+
+
+def _mix(keys: np.ndarray) -> np.ndarray:
+    z = keys.copy()
+    z ^= z >> np.uint64(30)
+    z *= _MIX_1
+    z ^= z >> np.uint64(27)
+    z *= _MIX_2
+    z ^= z >> np.uint64(31)
+    return z
+
+
+def to_keys(keys: Iterable[int]) -> np.ndarray:
+    """把64位有符号整数键（SeenIndex的键）转换为uint64数组"""
+    if isinstance(keys, np.ndarray):
+        return keys.astype(np.int64, copy=False).view(np.uint64)
+    return np.fromiter(keys, dtype=np.int64).view(np.uint64)
+
+
+class BloomFilter:
+    """定长Bloom过滤器，位数组保存在uint64数组中，按批处理键
+
+    按容量和误判率计算位数 m = -n·ln(p) / (ln2)² 和哈希个数 k = m/n·ln2，
+    每个键约占 -ln(p) / (ln2)² 位：误判率1%时约9.6位，0.1%时约14.4位。
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        if capacity <= 0:
+            raise ValueError(f"容量必须为正数: {capacity}")
+        if not 0 < error_rate < 1:
+            raise ValueError(f"误判率必须在(0, 1)之间: {error_rate}")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_bits = (bits + 63) // 64 * 64
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = np.zeros(self.num_bits // 64, dtype=np.uint64)
+        self.count = 0
+
+    def _positions(self, keys: np.ndarray) -> np.ndarray:
+        # 双重哈希：pos_i = h1 + i·h2 (mod m)
+        h1 = _mix(keys)
+        h2 = _mix(keys ^ _SEED_2) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.num_bits)
+
+    def add(self, keys: np.ndarray):
+        if len(keys) == 0:
+            return
+        positions = self._positions(keys).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(6), np.uint64(1) << (positions & np.uint64(63)))
+        self.count += len(keys)
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        """返回每个键是否可能存在的布尔数组（False表示一定不存在）"""
+        if len(keys) == 0:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        words = self.bits[positions >> np.uint64(6)]
+        return ((words >> (positions & np.uint64(63))) & np.uint64(1)).astype(bool).all(axis=1)
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        return self.bits.nbytes
+
+
+class ScalableBloomFilter:
+    """可扩展Bloom过滤器：当前一层写满后追加容量翻倍、误判率减半的新层，
+    总误判率不超过 error_rate（第一层使用 error_rate·(1-TIGHTENING)）
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.layers: List[BloomFilter] = [BloomFilter(capacity, error_rate * (1 - TIGHTENING))]
+
+    def add(self, keys: np.ndarray):
+        # 只写入尚不存在的键，避免重复键占用容量
+        keys = np.unique(keys)
+        keys = keys[~self.contains(keys)]
+        while len(keys):
+            layer = self.layers[-1]
+            if layer.full:
+                layer = BloomFilter(layer.capacity * GROWTH, layer.error_rate * TIGHTENING)
+                self.layers.append(layer)
+            room = layer.capacity - layer.count
+            layer.add(keys[:room])
+            keys = keys[room:]
+
+    def contains(self, keys: np.ndarray) -> np.ndarray:
+        result = np.zeros(len(keys), dtype=bool)
+        for layer in self.layers:
+            pending = ~result
+            if not pending.any():
+                break
+            result[pending] = layer.contains(keys[pending])
+        return result
+
+    @property
+    def count(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(layer.nbytes for layer in self.layers)
+
+
+class SeenFilter:
+    """按时间窗口轮换的已见键过滤器，放在精确查重（SeenIndex）之前
+
+    窗口被分成generations代，每过 window/generations 秒新建一代并丢弃最老的一代，
+    内存占用因此有上限：只有最近window内写入的键会被记住。
+    contains返回False表示键在窗口内一定没有出现过，可以跳过精确查重；
+    返回True时（可能是误判）仍需精确查重。
+
+    snapshot_path不为空时按snapshot_interval秒定期把各代写入磁盘（原子替换），
+    重启时用load恢复，不必从冷状态开始。
+    """
+
+    def __init__(self, error_rate: float = 0.001, capacity: int = 1_000_000,
+                 window: float = 30 * 86400, generations: int = 4,
+                 snapshot_path: Optional[str] = None, snapshot_interval: float = 600):
+        if generations < 1:
+            raise ValueError(f"代数必须为正数: {generations}")
+        self.error_rate = error_rate
+        self.capacity = capacity
+        self.window = window
+        self.generations = generations
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.snapshot_interval = snapshot_interval
+        # (创建时间, 过滤器)，最新的一代在最后
+        self._generations = deque()
+        self._last_snapshot: Optional[float] = None
+        self._dirty = False
+        # 已加载快照的保存时间，此后写入精确索引的键需要补充到过滤器中
+        self.snapshot_time: Optional[float] = None
+
+    @property
+    def generation_span(self) -> float:
+        return self.window / self.generations
+
+    def _rotate(self, now: float):
+        # 丢弃窗口之外的代（长时间没有写入时可能一次丢弃多代）
+        while self._generations and now - self._generations[0][0] >= self.window:
+            self._generations.popleft()
+        if not self._generations or now - self._generations[-1][0] >= self.generation_span:
+            # 各代误判率之和不超过error_rate
+            self._generations.append((now, ScalableBloomFilter(self.capacity, self.error_rate / self.generations)))
+        while len(self._generations) > self.generations:
+            self._generations.popleft()
+
+    def add(self, keys: Iterable[int], now: Optional[float] = None):
+        """写入键（已存在于较老一代的键也会写入当前代以延长寿命）"""
+        now = time.time() if now is None else now
+        self._rotate(now)
+        self._generations[-1][1].add(to_keys(keys))
+        self._dirty = True
+
+    def contains(self, keys: Iterable[int]) -> np.ndarray:
+        keys = to_keys(keys)
+        result = np.zeros(len(keys), dtype=bool)
+        for _, generation in reversed(self._generations):
+            pending = ~result
+            if not pending.any():
+                break
+            result[pending] = generation.contains(keys[pending])
+        return result
+
+    def __len__(self) -> int:
+        return sum(generation.count for _, generation in self._generations)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(generation.nbytes for _, generation in self._generations)
+
+    def maybe_snapshot(self, now: Optional[float] = None) -> bool:
+        """有新写入且从未保存过或距上次快照超过snapshot_interval时保存快照，返回是否保存"""
+        now = time.time() if now is None else now
+        if self.snapshot_path is None or not self._dirty:
+            return False
+        if self._last_snapshot is not None and now - self._last_snapshot < self.snapshot_interval:
+            return False
+        self.save(now=now)
+        return True
+
+    def save(self, path: Optional[str] = None, now: Optional[float] = None):
+        """保存全部代到磁盘（先写临时文件再原子替换）"""
+        path = Path(path) if path else self.snapshot_path
+        if path is None:
+            return
+        now = time.time() if now is None else now
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            'version': SNAPSHOT_VERSION,
+            'saved_at': now,
+            'error_rate': self.error_rate,
+            'capacity': self.capacity,
+            'window': self.window,
+            'generations': []
+        }
+        arrays = {}
+        for g, (created, generation) in enumerate(self._generations):
+            layers = []
+            for l, layer in enumerate(generation.layers):
+                arrays[f"g{g}_l{l}"] = layer.bits
+                layers.append({'capacity': layer.capacity, 'error_rate': layer.error_rate, 'count': layer.count})
+            meta['generations'].append({
+                'created': created, 'error_rate': generation.error_rate, 'layers': layers
+            })
+        arrays['meta'] = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self._dirty = False
+        self._last_snapshot = now
+
+    def load(self, path: Optional[str] = None, now: Optional[float] = None) -> bool:
+        """从快照恢复（丢弃已超出窗口的代），文件不存在或损坏时返回False"""
+        path = Path(path) if path else self.snapshot_path
+        if path is None or not path.exists():
+            return False
+        now = time.time() if now is None else now
+        try:
+            with np.load(path) as data:
+                meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+                if meta.get('version') != SNAPSHOT_VERSION:
+                    return False
+                generations = deque()
+                for g, info in enumerate(meta['generations']):
+                    if now - info['created'] >= self.window:
+                        continue
+                    generation = ScalableBloomFilter.__new__(ScalableBloomFilter)
+                    generation.capacity = meta['capacity']
+                    generation.error_rate = info['error_rate']
+                    generation.layers = []
+                    for l, layer_info in enumerate(info['layers']):
+                        layer = BloomFilter(layer_info['capacity'], layer_info['error_rate'])
+                        bits = data[f"g{g}_l{l}"]
+                        if bits.shape != layer.bits.shape:
+                            return False
+                        layer.bits = bits.astype(np.uint64, copy=True)
+                        layer.count = layer_info['count']
+                        generation.layers.append(layer)
+                    generations.append((info['created'], generation))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"警告: 无法读取已见过滤器快照 {path}: {e}")
+            return False
+        self._generations = generations
+        self._last_snapshot = now
+        self._dirty = False
+        self.snapshot_time = meta['saved_at']
+        return True
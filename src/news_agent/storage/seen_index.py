@@ -0,0 +1,207 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Iterable, Iterator, Optional
+
+from ..core.data_sources.base import NewsItem
+from ..core.url_canonical import canonicalize_url
+from .seen_filter import SeenFilter
+
+
+# 单条IN查询的参数个数（SQLite默认上限为32766）
+LOOKUP_BATCH = 900
+
+# 键的种类，参与哈希计算，避免URL键与内容键相互冲突
+KIND_URL = b'u:'
+KIND_CONTENT = b'c:'
+KIND_SCOPE = b's:'
+
+
+def keyword_scope(keywords: Optional[Iterable[str]]) -> str:
+    """关键词集合的规范形式（去空白、小写、去重、排序），作为索引的作用域"""
+    if not keywords:
+        return ''
+    return '\x1f'.join(sorted({keyword.strip().lower() for keyword in keywords if keyword.strip()}))
+
+
+class SeenIndex:
+    """跨运行的已保存新闻索引（SQLite）
+
+    每条新闻对应两个键：URL键（按 canonicalize_url 规范化）和内容哈希键（NewsItem.get_content_hash），
+    任一键已存在即视为已保存过。键按作用域（scope，通常是 keyword_scope(关键词)）
+    区分：同一条新闻在一组关键词下保存过，不影响它在另一组关键词下保存；
+    空作用域的键与未区分作用域时相同。键是64位哈希，直接作为SQLite的
+    INTEGER PRIMARY KEY（即rowid）存储，查找只走一次B树，
+    数千万条记录时单次批量查询仍在毫秒级，每个键约占27字节磁盘空间。
+
+    track_times为True时记录每个键的首次和最近出现时间（epoch秒）。
+
+    seen_filter不为空时查询前先经过该过滤器：过滤器确定没见过的键
+    不再查询SQLite，只有可能见过的键才做精确查询。过滤器按时间窗口轮换，
+    超出窗口的键会被当作新键（即去重范围限定为最近的窗口）。
+    """
+
+    def __init__(self, path: str, track_times: bool = True, seen_filter: SeenFilter = None):
+        self.path = Path(path)
+        self.track_times = track_times
+        self.seen_filter = seen_filter
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # 调度器在后台线程中保存数据，由锁保证串行访问
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen ("
+                "key INTEGER PRIMARY KEY, first_seen INTEGER, last_seen INTEGER)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def url_key(url: str, scope: str = '') -> int:
+        return _hash64(_scope_prefix(scope) + KIND_URL + canonicalize_url(url).encode('utf-8'))
+
+    @staticmethod
+    def content_key(item: NewsItem, scope: str = '') -> int:
+        return _hash64(_scope_prefix(scope) + KIND_CONTENT + item.get_content_hash().encode('ascii'))
+
+    def item_keys(self, item: NewsItem, scope: str = '') -> List[int]:
+        keys = [self.content_key(item, scope)]
+        if item.url:
+            keys.append(self.url_key(item.url, scope))
+        return keys
+
+    def filter_unseen(self, items: Iterable[NewsItem], scope: str = '') -> List[NewsItem]:
+        """返回在该作用域中未保存过的新闻（同一批中的重复项只保留第一条），不修改索引"""
+        items = list(items)
+        item_keys = [self.item_keys(item, scope) for item in items]
+        candidates = {key for keys in item_keys for key in keys}
+        if self.seen_filter is not None and candidates:
+            # 过滤器确定没见过的键不必查询SQLite
+            candidates = list(candidates)
+            maybe = self.seen_filter.contains(candidates)
+            candidates = {key for key, hit in zip(candidates, maybe.tolist()) if hit}
+        seen = self._lookup(candidates)
+
+        unseen = []
+        for item, keys in zip(items, item_keys):
+            if any(key in seen for key in keys):
+                continue
+            seen.update(keys)
+            unseen.append(item)
+        return unseen
+
+    def mark_seen(self, items: Iterable[NewsItem], now: Optional[float] = None, scope: str = '') -> int:
+        """记录新闻已在该作用域中保存，已存在的键只更新最近出现时间，返回处理的键数"""
+        now = int(time.time() if now is None else now)
+        keys = {key for item in items for key in self.item_keys(item, scope)}
+        if not keys:
+            return 0
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                if self.track_times:
+                    conn.executemany(
+                        "INSERT INTO seen (key, first_seen, last_seen) VALUES (?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen",
+                        ((key, now, now) for key in keys)
+                    )
+                else:
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO seen (key) VALUES (?)",
+                        ((key,) for key in keys)
+                    )
+            if self.seen_filter is not None:
+                self.seen_filter.add(keys, now=now)
+                self.seen_filter.maybe_snapshot(now=now)
+        return len(keys)
+
+    def get_times(self, item: NewsItem, scope: str = '') -> Optional[tuple]:
+        """返回新闻在该作用域中的 (首次出现, 最近出现) 时间，未记录时返回None"""
+        keys = self.item_keys(item, scope)
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                f"SELECT MIN(first_seen), MAX(last_seen) FROM seen WHERE key IN ({placeholders})", keys
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return row
+
+    def iter_keys(self, since: Optional[float] = None, batch: int = 100_000) -> Iterator[List[int]]:
+        """分批返回索引中的键；since不为空且记录了时间时只返回此后出现过的键"""
+        with self._lock:
+            conn = self._connect()
+            if since is not None and self.track_times:
+                cursor = conn.execute("SELECT key FROM seen WHERE last_seen >= ?", (int(since),))
+            else:
+                cursor = conn.execute("SELECT key FROM seen")
+            while True:
+                rows = cursor.fetchmany(batch)
+                if not rows:
+                    break
+                yield [row[0] for row in rows]
+
+    def warm_filter(self, since: Optional[float] = None, now: Optional[float] = None) -> int:
+        """把索引中since之后出现过的键写入过滤器，返回写入的键数
+
+        since为空时使用过滤器的窗口起点（没有快照时的冷启动）；
+        加载快照后传入快照时间，补上快照之后才写入索引的键。
+        """
+        if self.seen_filter is None:
+            return 0
+        now = time.time() if now is None else now
+        if since is None:
+            since = now - self.seen_filter.window
+        count = 0
+        for keys in self.iter_keys(since=since):
+            self.seen_filter.add(keys, now=now)
+            count += len(keys)
+        return count
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self.seen_filter is not None and self.seen_filter.snapshot_path is not None:
+                self.seen_filter.save()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _lookup(self, keys: set) -> set:
+        if not keys:
+            return set()
+        keys = list(keys)
+        found = set()
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(keys), LOOKUP_BATCH):
+                batch = keys[i:i + LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                found.update(
+                    row[0] for row in
+                    conn.execute(f"SELECT key FROM seen WHERE key IN ({placeholders})", batch)
+                )
+        return found
+
+
+def _scope_prefix(scope: str) -> bytes:
+    return KIND_SCOPE + scope.encode('utf-8') + b'\0' if scope else b''
+
+
+def _hash64(data: bytes) -> int:
+    """64位有符号整数哈希（SQLite INTEGER范围）"""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big', signed=True)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+测试Parquet和CSV按列读取
+"""
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.storage.csv_storage import CSVStorage
+from news_agent.storage.manager import StorageManager
+from news_agent.storage.parquet_storage import ParquetStorage
+
+
+def make_items():
+    return [
+        NewsItem(title="Story 1", content="Body, with \"quotes\"\nand a newline", url="http://example.com/1",
+                 published_date=datetime(2025, 9, 1, 10, 0, 0, 123456), source="BBC",
+                 author="Alice", summary="Short", keywords=["AI", "chip"]),
+        NewsItem(title="Story 2", content="Body 2", url="http://example.com/2",
+                 published_date=datetime(2025, 9, 2, 8, 30), source="CNN"),
+    ]
+
+
+def test_round_trip(tmp_path):
+    """测试保存后按列读取得到相同的新闻"""
+    items = make_items()
+    for storage, filename in ((ParquetStorage(str(tmp_path)), "news.parquet"),
+                              (CSVStorage(str(tmp_path)), "news.csv")):
+        storage.save(items, filename)
+        loaded = storage.load(filename)
+        assert [item.to_dict() for item in loaded] == [item.to_dict() for item in items], filename
+        assert loaded[1].author is None and loaded[1].summary is None and loaded[1].keywords == []
+
+
+def test_csv_blank_cells_and_timezones(tmp_path):
+    """测试CSV中的空单元格（曾被读成NaN）和不一致的时区"""
+    (tmp_path / "news.csv").write_text(
+        "title,content,url,published_date,source,author,summary,keywords\n"
+        "A,Body,http://a,2025-09-01T10:00:00+08:00,BBC,,,\n"
+        "B,Body,http://b,2025-09-01T10:00:00,CNN,Bob,Sum,AI|chip\n",
+        encoding="utf-8-sig"
+    )
+    storage = CSVStorage(str(tmp_path))
+    items = storage.load("news.csv")
+    assert items[0].author is None and items[0].keywords == []
+    assert items[0].published_date == datetime(2025, 9, 1, 10, tzinfo=timezone(timedelta(hours=8)))
+    assert items[1].published_date == datetime(2025, 9, 1, 10)
+    assert items[1].author == "Bob" and items[1].keywords == ["AI", "chip"]
+
+    df = storage.load_dataframe("news.csv")
+    assert str(df["published_date"].dtype) == "datetime64[us, UTC]"
+    assert df["author"].tolist() == ["", "Bob"]
+
+
+def test_legacy_pandas_parquet(tmp_path):
+    """测试读取pandas写入的纳秒时间Parquet文件"""
+    pd.DataFrame({
+        "title": ["A"], "content": ["Body"], "url": ["http://a"],
+        "published_date": pd.to_datetime(["2025-09-01 10:00:00.123456789"]).astype("datetime64[ns]"),
+        "source": ["BBC"], "author": [None], "summary": [""], "keywords": ["AI"],
+    }).to_parquet(tmp_path / "old.parquet", index=False)
+    item = ParquetStorage(str(tmp_path)).load("old.parquet")[0]
+    assert type(item.published_date) is datetime
+    assert item.published_date == datetime(2025, 9, 1, 10, 0, 0, 123456)
+    assert item.author is None and item.summary is None and item.keywords == ["AI"]
+
+
+def test_storage_manager_tables(tmp_path):
+    """测试StorageManager直接返回Arrow表或DataFrame"""
+    manager = StorageManager(str(tmp_path))
+    items = make_items()
+    for fmt in ("parquet", "csv", "json", "jsonl"):
+        manager.save_news(items, ["AI"], fmt, f"news.{fmt}")
+        table = manager.load_table(f"news.{fmt}")
+        assert table.num_rows == 2 and table.column("title").to_pylist() == ["Story 1", "Story 2"], fmt
+        df = manager.load_dataframe(f"news.{fmt}")
+        assert df["keywords"].tolist() == ["AI|chip", ""], fmt
+
+
+def main():
+    """主测试函数"""
+    print("按列读取测试")
+    print("=" * 50)
+    for test in (test_round_trip,
+                 test_csv_blank_cells_and_timezones,
+                 test_legacy_pandas_parquet,
+                 test_storage_manager_tables):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+测试RSS源健康记录与熔断器
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.feed_health import FeedHealthRegistry
+from news_agent.core.feed_state import FeedStateStore
+
+URL = "http://example.com/feed.xml"
+
+
+def make_registry(tmp_path) -> FeedHealthRegistry:
+    store = FeedStateStore(str(tmp_path / "health.json"))
+    return FeedHealthRegistry(store, failure_threshold=2, cooldown=60, max_cooldown=200)
+
+
+def test_circuit_opens_and_backs_off(tmp_path):
+    """测试连续失败后熔断，冷却期逐次加倍并有上限"""
+    registry = make_registry(tmp_path)
+    assert registry.record_failure(URL, "timeout", now=0) is None
+    assert registry.allow(URL, now=1)
+
+    assert registry.record_failure(URL, "timeout", now=10) == 70
+    assert not registry.allow(URL, now=69)
+    assert registry.allow(URL, now=70)  # 冷却结束，放行试探请求
+
+    assert registry.record_failure(URL, "timeout", now=70) == 190
+    assert registry.record_failure(URL, "timeout", now=190) == 390  # 上限200秒
+
+
+def test_success_resets_and_tracks_latency(tmp_path):
+    """测试成功后恢复，并记录耗时EWMA"""
+    registry = make_registry(tmp_path)
+    registry.record_failure(URL, "HTTP 500", latency=1.0, now=0)
+    registry.record_failure(URL, "HTTP 500", latency=1.0, now=1)
+    registry.record_success(URL, latency=2.0, now=100)
+    assert registry.allow(URL, now=100)
+
+    record = registry.store.get(URL)
+    assert record["failures"] == 0
+    assert record["total_failures"] == 2
+    assert record["latency_ewma"] == 1.3
+
+
+def test_report_orders_broken_first(tmp_path):
+    """测试健康报告：熔断的源在前，其余按耗时排序，可从磁盘恢复"""
+    registry = make_registry(tmp_path)
+    registry.record_success("http://fast.com/rss", latency=0.1)
+    registry.record_success("http://slow.com/rss", latency=8.0)
+    registry.record_failure("http://dead.com/rss", "Connection refused")
+    registry.record_failure("http://dead.com/rss", "Connection refused")
+    registry.save()
+
+    rows = make_registry(tmp_path).report()
+    assert [r["url"] for r in rows] == ["http://dead.com/rss", "http://slow.com/rss", "http://fast.com/rss"]
+    assert rows[0]["state"] == "open"
+    assert rows[0]["last_error"] == "Connection refused"
+
+
+def main():
+    """主测试函数"""
+    print("RSS源健康记录测试")
+    print("=" * 50)
+    for test in (test_circuit_opens_and_backs_off,
+                 test_success_resets_and_tracks_latency,
+                 test_report_orders_broken_first):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+测试RSS源自适应检查周期
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.feed_schedule import FeedCadence
+from news_agent.core.feed_state import FeedStateStore
+
+HOUR = 3600
+
+
+def make_cadence(tmp_path, **kwargs) -> FeedCadence:
+    store = FeedStateStore(str(tmp_path / "schedule.json"))
+    return FeedCadence(store, min_interval=HOUR, max_interval=48 * HOUR, **kwargs)
+
+
+def test_new_feed_is_due_and_learns_interval(tmp_path):
+    """测试未检查过的源到期，并根据更新间隔学习检查周期"""
+    cadence = make_cadence(tmp_path)
+    url = "http://example.com/feed.xml"
+    assert cadence.is_due(url, now=0)
+
+    # 每6小时更新一次
+    for i in range(1, 5):
+        now = i * 6 * HOUR
+        interval = cadence.record(url, updated=True, newest=now, now=now)
+    assert interval == 6 * HOUR
+    assert not cadence.is_due(url, now=now + HOUR)
+    assert cadence.is_due(url, now=now + 6 * HOUR)
+
+
+def test_interval_is_clamped_and_backs_off(tmp_path):
+    """测试检查间隔受上下限约束，沉寂的源逐步放慢"""
+    cadence = make_cadence(tmp_path)
+    fast, slow = "http://a.com/rss", "http://b.com/rss"
+
+    for i in range(1, 5):
+        now = i * 60  # 每分钟更新一次
+        assert cadence.record(fast, updated=True, newest=now, now=now) == HOUR
+
+    cadence.record(slow, updated=True, newest=0, now=0)
+    cadence.record(slow, updated=True, newest=2 * HOUR, now=2 * HOUR)
+    # 之后10小时、100小时没有更新
+    assert cadence.record(slow, updated=False, now=12 * HOUR) == 5 * HOUR
+    assert cadence.record(slow, updated=False, now=102 * HOUR) == 48 * HOUR
+
+
+def test_failure_retries_soon_and_state_persists(tmp_path):
+    """测试失败时按最小间隔重试，状态可从磁盘恢复"""
+    cadence = make_cadence(tmp_path)
+    url = "http://example.com/feed.xml"
+    for i in range(3):
+        cadence.record(url, updated=True, newest=i * 10 * HOUR, now=i * 10 * HOUR)
+    cadence.record(url, updated=False, failed=True, now=25 * HOUR)
+    assert cadence.next_due(url) == 26 * HOUR
+    cadence.save()
+
+    reloaded = make_cadence(tmp_path)
+    assert reloaded.due_urls([url, "http://new.com/rss"], now=25.5 * HOUR) == ["http://new.com/rss"]
+    assert reloaded.store.get(url)["interval"] == 10 * HOUR
+
+
+def main():
+    """主测试函数"""
+    print("自适应检查周期测试")
+    print("=" * 50)
+    for test in (test_new_feed_is_due_and_learns_interval,
+                 test_interval_is_clamped_and_backs_off,
+                 test_failure_retries_soon_and_state_persists):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
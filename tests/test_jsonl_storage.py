@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+测试JSON Lines存储
+"""
+import sys
+import tempfile
+import types
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.storage.jsonl_storage import JSONLStorage
+from news_agent.storage.manager import StorageManager
+
+
+def make_item(i: int) -> NewsItem:
+    return NewsItem(
+        title=f"Story {i} 中文",
+        content=f"Body {i}\nsecond line",
+        url=f"http://example.com/{i}",
+        published_date=datetime(2025, 9, 1, 10, i % 60),
+        source="Test",
+        author="Alice" if i % 2 else None,
+        keywords=["AI"]
+    )
+
+
+def test_append_and_stream(tmp_path):
+    """测试每次保存追加到文件末尾，读取逐条产出"""
+    storage = JSONLStorage(str(tmp_path))
+    storage.save([make_item(1), make_item(2)], "news.jsonl")
+    storage.append((make_item(i) for i in range(3, 8)), "news.jsonl", batch_size=2)
+
+    lines = (tmp_path / "news.jsonl").read_bytes().splitlines()
+    assert len(lines) == 7
+    assert b"\n" not in lines[0] and "中文".encode("utf-8") in lines[0]
+
+    stream = storage.iter_load("news.jsonl")
+    assert isinstance(stream, types.GeneratorType)
+    items = list(stream)
+    assert [item.title for item in items] == [f"Story {i} 中文" for i in range(1, 8)]
+    assert items[0].to_dict() == make_item(1).to_dict()
+    assert items[1].author is None
+
+
+def test_truncated_last_line(tmp_path):
+    """测试写入中断留下的不完整最后一行被跳过，之后的追加不受影响"""
+    storage = JSONLStorage(str(tmp_path))
+    path = Path(storage.save([make_item(1), make_item(2)], "news.jsonl"))
+    data = path.read_bytes()
+    path.write_bytes(data[:-20])
+
+    assert [item.title for item in storage.load("news.jsonl")] == ["Story 1 中文"]
+
+    storage.save([make_item(3)], "news.jsonl")
+    assert [item.title for item in storage.load("news.jsonl")] == ["Story 1 中文", "Story 3 中文"]
+
+
+def test_storage_manager_registers_jsonl(tmp_path):
+    """测试StorageManager注册jsonl格式并能从扩展名推断"""
+    manager = StorageManager(str(tmp_path))
+    assert "jsonl" in manager.get_supported_formats()
+    saved = manager.save_news([make_item(1)], ["AI"], "jsonl", "news_AI.jsonl")
+    manager.save_news([make_item(2)], ["AI"], "jsonl", "news_AI.jsonl")
+
+    assert saved == str(tmp_path / "news_AI.jsonl")
+    assert manager.list_files("jsonl") == {"jsonl": ["news_AI.jsonl"]}
+    assert manager.list_files("json") == {"json": []}
+    assert len(manager.load_news("news_AI.jsonl")) == 2
+
+
+def main():
+    """主测试函数"""
+    print("JSON Lines存储测试")
+    print("=" * 50)
+    for test in (test_append_and_stream,
+                 test_truncated_last_line,
+                 test_storage_manager_registers_jsonl):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
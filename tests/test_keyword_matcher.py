@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+测试预编译关键词匹配器与原有匹配逻辑的一致性
+"""
+import random
+import sys
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.keyword_matcher import KeywordMatcher, compile_keywords
+
+
+def reference_match(text, keywords):
+    """原 RSSSource._match_keywords 的逐个扫描实现，作为对照"""
+    if not keywords:
+        return True
+    text_lower = text.lower()
+    for keyword in keywords:
+        keyword_lower = keyword.lower().strip()
+        if keyword_lower.startswith('"') and keyword_lower.endswith('"'):
+            if keyword_lower[1:-1] in text_lower:
+                return True
+            continue
+        if keyword_lower.startswith('-'):
+            if keyword_lower[1:] in text_lower:
+                return False
+            continue
+        if keyword_lower in text_lower:
+            return True
+    has_positive_keywords = any(not k.strip().startswith('-') for k in keywords)
+    return not has_positive_keywords
+
+
+def test_basic_modes():
+    """测试精确、短语、排除和普通匹配"""
+    text = "OpenAI发布了新的人工智能模型 Machine Learning news"
+    assert KeywordMatcher(['"machine learning"']).match(text)
+    assert KeywordMatcher(['人工智能']).match(text)
+    assert KeywordMatcher(['deep learning', 'openai']).match(text)
+    assert not KeywordMatcher(['-openai', 'machine']).match(text)
+    assert KeywordMatcher(['machine', '-openai']).match(text)  # 先命中正向关键词
+    assert not KeywordMatcher(['-crypto', 'bitcoin']).match(text)
+    assert KeywordMatcher(['-crypto']).match(text)  # 只有排除词且未命中
+    assert not KeywordMatcher(['-人工智能']).match(text)
+    assert KeywordMatcher([]).match(text)
+
+
+def test_randomized_against_reference():
+    """随机对照测试（含重叠词项和中文）"""
+    rng = random.Random(42)
+    alphabet = "abcab 人工智能中文"
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        keywords = []
+        for _ in range(rng.randint(0, 6)):
+            term = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+            prefix = rng.choice(["", "", "-", '"'])
+            keywords.append(prefix + term + ('"' if prefix == '"' else ""))
+        matcher = KeywordMatcher(keywords)
+        expected = reference_match(text, keywords)
+        assert matcher.match(text) == expected, (text, keywords)
+        # 预筛选不会漏掉匹配的文本
+        if expected:
+            assert matcher.may_match(text), (text, keywords)
+
+
+def test_compile_is_cached():
+    """测试编译结果缓存"""
+    assert compile_keywords(["AI", "-crypto"]) is compile_keywords(["AI", "-crypto"])
+
+
+def main():
+    """主测试函数"""
+    print("关键词匹配器测试")
+    print("=" * 50)
+    test_basic_modes()
+    test_randomized_against_reference()
+    test_compile_is_cached()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+测试多来源新闻的堆归并、去重与数量上限
+"""
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.data_sources.rss import FeedResult, RSSSource
+from news_agent.core.merge import merge_news
+
+BASE = datetime(2025, 9, 1)
+
+
+def make_item(i: int, minutes: int, source: str = "Test", content: str = None) -> NewsItem:
+    return NewsItem(
+        title=f"Story {i}",
+        content=content if content is not None else f"Body {i}",
+        url=f"http://example.com/{i}",
+        published_date=BASE + timedelta(minutes=minutes),
+        source=source
+    )
+
+
+def legacy_merge(items):
+    """原先的做法：set去重、内容哈希去重、全量排序"""
+    unique, hashes = [], set()
+    for item in set(items):
+        if item.content_hash64() not in hashes:
+            hashes.add(item.content_hash64())
+            unique.append(item)
+    unique.sort(key=lambda x: x.published_date, reverse=True)
+    return unique
+
+
+def test_merge_matches_legacy_order():
+    """测试归并结果与原先的去重+排序一致，并按时间从新到旧排列"""
+    rng = random.Random(0)
+    streams = []
+    for feed in range(20):
+        stream = [make_item(rng.randrange(300), rng.randrange(10_000), source=f"Feed{feed}") for _ in range(50)]
+        rng.shuffle(stream)  # 来源内部无序也能处理
+        streams.append(stream)
+    merged, stats = merge_news(streams)
+    expected = legacy_merge([item for stream in streams for item in stream])
+    assert set(merged) == set(expected)
+    dates = [item.published_date for item in merged]
+    assert dates == sorted(dates, reverse=True)
+    assert stats.raw == 1000 and stats.kept == len(merged) and stats.raw - stats.removed == stats.kept
+    assert not stats.stopped_early
+
+
+def test_keeps_newest_copy_and_content_duplicates():
+    """测试同一条新闻保留最新的一份，内容相同但URL不同的只保留一条"""
+    old, new = make_item(1, 0, source="Old"), make_item(1, 30, source="New")
+    mirror = NewsItem(title="Story 1", content="Body 1", url="http://mirror.com/1",
+                      published_date=BASE, source="Mirror")
+    merged, stats = merge_news([[old], [new, mirror]])
+    assert [item.source for item in merged] == ["New"]
+    assert stats.duplicates == 1 and stats.content_duplicates == 1
+
+
+def test_limit_stops_early():
+    """测试达到数量上限后立即停止，只保留最新的条目"""
+    streams = [[make_item(f * 100 + i, i * 3 + f) for i in range(100)] for f in range(3)]
+    merged, stats = merge_news(streams, limit=5)
+    assert [item.published_date for item in merged] == [BASE + timedelta(minutes=m) for m in (299, 298, 297, 296, 295)]
+    assert stats.kept == 5 and stats.skipped == 295 and stats.stopped_early
+    assert merge_news([], limit=3) == ([], merge_news([])[1])
+
+
+def test_input_order_mode():
+    """测试搜索结果模式：保持相关度顺序，只去重和截断"""
+    items = [make_item(3, 0), make_item(1, 50), make_item(3, 10), make_item(2, 20)]
+    merged, stats = merge_news([items], newest_first=False)
+    assert [item.title for item in merged] == ["Story 3", "Story 1", "Story 2"]
+    assert merge_news([items], limit=2, newest_first=False)[0] == merged[:2]
+
+
+def test_rss_source_uses_merge():
+    """测试RSS数据源按源归并并支持数量上限"""
+    source = RSSSource(["http://a.example/feed", "http://b.example/feed"])
+    results = [
+        FeedResult(url="http://a.example/feed", items=[make_item(1, 10), make_item(2, 5)]),
+        FeedResult(url="http://b.example/feed", items=[make_item(1, 10), make_item(3, 7)]),
+    ]
+    source.iter_fetch = lambda keywords=None, urls=None: iter(results)
+    assert [item.title for item in source.fetch_news()] == ["Story 1", "Story 3", "Story 2"]
+    assert [item.title for item in source.fetch_news(limit=2)] == ["Story 1", "Story 3"]
+
+
+def main():
+    """主测试函数"""
+    print("新闻合并测试")
+    print("=" * 50)
+    for test in (test_merge_matches_legacy_order,
+                 test_keeps_newest_copy_and_content_duplicates,
+                 test_limit_stops_early,
+                 test_input_order_mode,
+                 test_rss_source_uses_merge):
+        test()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
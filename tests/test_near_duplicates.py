@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+测试近似重复新闻检测
+"""
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.config import SearchConfig, config
+from news_agent.core.near_duplicates import NearDuplicateDetector
+
+
+WIRE_STORY = (
+    "The central bank raised its benchmark interest rate by a quarter point on Wednesday, "
+    "citing persistent inflation in services and a labor market that remains tight. "
+    "Officials signaled that further increases were possible if price pressures do not ease, "
+    "while several members argued for a pause to assess the effect of earlier moves."
+)
+
+
+def make_item(title: str, content: str, url: str, day: int = 1, source: str = "Test") -> NewsItem:
+    return NewsItem(
+        title=title,
+        content=content,
+        url=url,
+        published_date=datetime(2025, 9, day, 10, 0),
+        source=source
+    )
+
+
+def random_story(rng: random.Random, i: int) -> NewsItem:
+    words = [f"word{rng.randrange(3000)}" for _ in range(80)]
+    return make_item(f"Story {i} " + " ".join(words[:6]), " ".join(words), f"http://example.com/{i}")
+
+
+def test_syndicated_copies_are_grouped():
+    """测试转载的通稿（标题后缀、跟踪参数、个别改词）被合并，代表条目为正文最长的一条"""
+    items = [
+        make_item("Central bank raises rates again", WIRE_STORY, "http://wire.com/a"),
+        make_item("Central bank raises rates again - Reuters", WIRE_STORY + " Markets fell after the news.",
+                  "http://news.com/b?utm_source=rss"),
+        make_item("Central Bank Raises Rates Again | Daily", WIRE_STORY.replace("Wednesday", "Wed."),
+                  "http://daily.com/c"),
+        make_item("Local team wins championship", "The home side won the final in extra time "
+                  "after a dramatic comeback in the second half.", "http://sports.com/d"),
+    ]
+    detector = NearDuplicateDetector(threshold=0.7)
+    kept, groups = detector.dedupe(items)
+
+    assert len(kept) == 2
+    assert len(groups) == 1
+    group = groups[0]
+    assert group.representative.url == "http://news.com/b?utm_source=rss"
+    assert sorted(group.alias_urls) == ["http://daily.com/c", "http://wire.com/a"]
+    # 代表条目按首次出现的顺序排列
+    assert kept[0] is group.representative
+    assert kept[1].url == "http://sports.com/d"
+
+
+def test_distinct_stories_are_kept():
+    """测试互不相同的新闻不会被合并，且签名与进程无关（固定值可复现）"""
+    rng = random.Random(7)
+    items = [random_story(rng, i) for i in range(2000)]
+    detector = NearDuplicateDetector()
+    kept, groups = detector.dedupe(items)
+    assert len(kept) == len(items)
+    assert groups == []
+
+    again = NearDuplicateDetector().signatures(items[:10])
+    assert (again == detector.signatures(items[:10])).all()
+
+
+def test_representative_choice_and_cjk():
+    """测试中文按单字切分以及代表条目的选择方式"""
+    story = "国家统计局今天发布数据显示，上月全国居民消费价格同比上涨百分之零点五，环比持平，核心通胀保持稳定。"
+    items = [
+        make_item("统计局：上月物价同比上涨0.5%", story, "http://a.cn/1", day=3),
+        make_item("统计局：上月物价同比上涨0.5%（转载）", story + "责任编辑：张三", "http://b.cn/2", day=1),
+        make_item("足球联赛第十轮战报", "主队在主场以二比一战胜客队，继续领跑积分榜。", "http://c.cn/3", day=2),
+    ]
+    _, groups = NearDuplicateDetector(threshold=0.7, prefer='earliest').dedupe(items)
+    assert len(groups) == 1
+    assert groups[0].representative.url == "http://b.cn/2"
+
+    _, groups = NearDuplicateDetector(threshold=0.7, prefer='first').dedupe(items)
+    assert groups[0].representative.url == "http://a.cn/1"
+    assert groups[0].alias_urls == ["http://b.cn/2"]
+
+
+def test_dedupe_against_corpus():
+    """测试与已保存数据比对：与已有新闻近似重复的条目被去掉"""
+    rng = random.Random(3)
+    corpus = [random_story(rng, i) for i in range(500)]
+    copy = corpus[42]
+    items = [
+        make_item(copy.title + " (updated)", copy.content, "http://mirror.com/42"),
+        random_story(rng, 1000),
+        make_item("short", "", "http://empty.com/1"),
+    ]
+    fresh = NearDuplicateDetector().dedupe_against(items, corpus)
+    assert [item.url for item in fresh] == ["http://example.com/1000", "http://empty.com/1"]
+
+
+def test_other_scripts_and_empty_texts():
+    """测试西里尔、希腊等文字正常切词，没有词的新闻不会被合并"""
+    russian = ("Центральный банк повысил ключевую ставку на четверть пункта в среду, "
+               "сославшись на устойчивую инфляцию в сфере услуг и напряжённый рынок труда.")
+    items = [
+        make_item("Новости экономики", russian, "http://ru.example.com/1"),
+        make_item("Спорт", "Сборная выиграла финал чемпионата после серии пенальти в дополнительное время.",
+                  "http://ru.example.com/2"),
+        make_item("Ειδήσεις", "Η κυβέρνηση ανακοίνωσε νέα μέτρα για τη στήριξη των νοικοκυριών.",
+                  "http://gr.example.com/1"),
+        make_item("", "", "http://empty.com/1"),
+        make_item("...", "!!!", "http://empty.com/2"),
+        make_item("Новости экономики", russian, "http://mirror.example.com/1"),
+    ]
+    kept, groups = NearDuplicateDetector().dedupe(items)
+    assert [item.url for item in kept] == [item.url for item in items[:5]]
+    assert len(groups) == 1 and groups[0].alias_urls == ["http://mirror.example.com/1"]
+
+
+def test_threshold_validation():
+    """测试非法参数"""
+    for kwargs in ({'threshold': 0}, {'threshold': 1.5}, {'prefer': 'random'}):
+        try:
+            NearDuplicateDetector(**kwargs)
+        except ValueError:
+            continue
+        raise AssertionError(f"应当拒绝参数: {kwargs}")
+    detector = NearDuplicateDetector(threshold=0.8, num_perm=64)
+    assert detector.bands * detector.rows == 64
+
+
+def test_collapsing_is_opt_in():
+    """测试默认只去除完全相同的新闻，近似重复需要配置或 --near-duplicates 启用"""
+    from news_agent.cli.commands import _collapse_near_duplicates
+
+    items = [make_item("Rates rise", WIRE_STORY, "http://a.com/1"),
+             make_item("Rates rise again", WIRE_STORY, "http://b.com/2")]
+    assert SearchConfig().near_duplicates is False
+    original = dict(config._config.get('search', {}))
+    try:
+        config._config.setdefault('search', {}).pop('near_duplicates', None)
+        assert config.search.near_duplicates is False
+        assert _collapse_near_duplicates(items) == (items, [])
+        kept, groups = _collapse_near_duplicates(items, enabled=True)
+        assert len(kept) == 1 and len(groups) == 1
+    finally:
+        config._config['search'] = original
+
+
+def main():
+    """主测试函数"""
+    print("近似重复新闻检测测试")
+    print("=" * 50)
+    for test in (test_syndicated_copies_are_grouped,
+                 test_distinct_stories_are_kept,
+                 test_representative_choice_and_cjk,
+                 test_dedupe_against_corpus,
+                 test_other_scripts_and_empty_texts,
+                 test_threshold_validation,
+                 test_collapsing_is_opt_in):
+        test()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+测试NewsItem的身份键、缓存的哈希值和字典转换
+"""
+import hashlib
+import pickle
+import sys
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+
+
+def make_item(title: str = "  Breaking News ", url: str = "http://example.com/1", content: str = "Body") -> NewsItem:
+    return NewsItem(
+        title=title,
+        content=content,
+        url=url,
+        published_date=datetime(2025, 9, 1, 10, 0),
+        source="Test",
+        keywords=["AI"]
+    )
+
+
+def test_identity_and_equality():
+    """测试按URL和规范化标题判断同一条新闻"""
+    a = make_item()
+    b = make_item(title="breaking news")
+    c = make_item(url="http://example.com/2")
+    assert a == b and hash(a) == hash(b)
+    assert a != c
+    assert a != "not an item"
+    assert a.identity_key == ("http://example.com/1", "breaking news")
+    assert len({a, b, c}) == 2
+    assert not hasattr(a, '__dict__')
+
+
+def test_content_hash_compatible_and_cached():
+    """测试内容哈希与原先的md5算法一致，并且只计算一次"""
+    item = make_item(content="  Some CONTENT " + "x" * 600)
+    expected = hashlib.md5(
+        f"{item.title.strip().lower()}{item.content[:500].strip().lower()}".encode()
+    ).hexdigest()
+    assert item.get_content_hash() == expected
+    assert item._content_hash == expected
+    assert item.content_hash64() == make_item(title="BREAKING NEWS", content=item.content).content_hash64()
+    assert item.content_hash64() != make_item(content="other").content_hash64()
+
+
+def test_dict_roundtrip_and_copies():
+    """测试to_dict/from_dict兼容，复制和序列化不会带上旧的缓存"""
+    item = make_item()
+    data = item.to_dict()
+    assert set(data) == {'title', 'content', 'url', 'published_date', 'source', 'author', 'summary', 'keywords'}
+    assert data['published_date'] == "2025-09-01T10:00:00"
+    restored = NewsItem.from_dict(data)
+    assert restored == item and restored.to_dict() == data
+    assert NewsItem.from_dict({'title': 'T', 'published_date': datetime(2025, 1, 1)}).keywords == []
+
+    hash(item)
+    item.get_content_hash()
+    changed = replace(item, url="http://example.com/3")
+    assert changed._hash is None and hash(changed) != hash(item)
+
+    copy = pickle.loads(pickle.dumps(item))
+    assert copy._hash is None and copy == item and copy.to_dict() == data
+
+
+def main():
+    """主测试函数"""
+    print("NewsItem测试")
+    print("=" * 50)
+    for test in (test_identity_and_equality,
+                 test_content_hash_compatible_and_cached,
+                 test_dict_roundtrip_and_copies):
+        test()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+测试OPML导入导出与RSS源校验
+"""
+import sys
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from news_agent.core.data_sources.rss import RSSSource
+from news_agent.core.opml import OPMLFeed, parse_opml, build_opml, validate_feeds
+from test_rss_source import FeedServer, make_rss
+
+SAMPLE_OPML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="1.0">
+  <head><title>Subscriptions</title></head>
+  <body>
+    <outline text="Tech" title="Tech">
+      <outline type="rss" text="Hacker News" xmlUrl="https://news.ycombinator.com/rss"/>
+      <outline text="AI">
+        <outline type="rss" text="AI Blog" xmlUrl="https://ai.example.com/feed"/>
+      </outline>
+    </outline>
+    <outline type="rss" text="BBC" xmlUrl="https://feeds.bbci.co.uk/news/rss.xml"/>
+    <outline type="rss" text="HN again" xmlUrl="https://news.ycombinator.com/rss"/>
+  </body>
+</opml>"""
+
+
+def test_parse_and_build_roundtrip():
+    """测试OPML解析（嵌套分组、去重）与导出后再解析一致"""
+    feeds = parse_opml(SAMPLE_OPML)
+    assert [(f.url, f.title, f.category) for f in feeds] == [
+        ("https://news.ycombinator.com/rss", "Hacker News", "Tech"),
+        ("https://ai.example.com/feed", "AI Blog", "Tech/AI"),
+        ("https://feeds.bbci.co.uk/news/rss.xml", "BBC", None),
+    ]
+    assert parse_opml(build_opml(feeds).encode()) == feeds
+    assert parse_opml(build_opml([OPMLFeed(url="http://a.com/rss")]).encode())[0].title == "http://a.com/rss"
+
+    try:
+        parse_opml(b"<rss></rss>")
+        assert False, "应当拒绝非OPML文档"
+    except ValueError:
+        pass
+
+
+def test_validate_feeds_concurrently():
+    """测试并发校验：可用性、条目数、标题和错误"""
+    server = FeedServer(delay=0.05)
+    try:
+        urls = []
+        for i in range(6):
+            server.routes[f"/v{i}.xml"] = make_rss(i, count=i + 1)
+            urls.append(server.url(f"/v{i}.xml"))
+        server.routes["/broken.xml"] = b"not a feed at all <"
+        urls += [server.url("/broken.xml"), server.url("/missing.xml")]
+
+        source = RSSSource([], max_workers=8, per_host_limit=8, max_retries=1)
+        results = {v.url: v for v in validate_feeds(source, urls)}
+
+        assert len(results) == 8
+        assert results[urls[3]].ok and results[urls[3]].entries == 4
+        assert results[urls[3]].title == "Feed 3"
+        assert not results[server.url("/broken.xml")].ok
+        assert "404" in results[server.url("/missing.xml")].error
+        assert server.max_active > 1
+    finally:
+        server.close()
+
+
+def main():
+    """主测试函数"""
+    print("OPML测试")
+    print("=" * 50)
+    test_parse_and_build_roundtrip()
+    test_validate_feeds_concurrently()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
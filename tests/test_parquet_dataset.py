@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+测试按分区追加的Parquet数据集
+"""
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pyarrow.dataset as ds
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.storage.manager import StorageManager
+from news_agent.storage.parquet_storage import (
+    FRAGMENT_SCHEMA, JOURNAL_PREFIX, TEMP_PREFIX, ParquetStorage
+)
+
+
+def make_item(i: int, day: int = 1, source: str = "BBC") -> NewsItem:
+    return NewsItem(
+        title=f"Story {i}",
+        content=f"Body {i}",
+        url=f"http://example.com/{i}",
+        published_date=datetime(2025, 9, day, 10, i % 60),
+        source=source,
+        author="Alice" if i % 2 else None,
+        keywords=["AI", "chip"]
+    )
+
+
+def test_append_partitions_and_reads_as_one_table(tmp_path):
+    """测试每次保存追加片段，读取时是一张表，并可按分区过滤"""
+    storage = ParquetStorage(str(tmp_path), dataset=True)
+    first = storage.save([make_item(1, day=1), make_item(2, day=2, source="Reuters/World")], "news_run1.parquet")
+    storage.save([make_item(3, day=1), make_item(4, day=1)], "news_run2.parquet")
+
+    assert first == str(storage.dataset_path)
+    partitions = sorted(str(path.parent.relative_to(storage.dataset_path)) for path in storage.dataset_path.rglob("*.parquet"))
+    assert partitions == [
+        "date=2025-09-01/source=BBC",
+        "date=2025-09-01/source=BBC",
+        "date=2025-09-02/source=Reuters%2FWorld",
+    ]
+
+    items = sorted(storage.load(storage.dataset_name), key=lambda item: item.title)
+    assert [item.title for item in items] == ["Story 1", "Story 2", "Story 3", "Story 4"]
+    assert items[1].source == "Reuters/World"
+    assert items[0].author == "Alice" and items[1].author is None
+    assert items[0].keywords == ["AI", "chip"]
+    assert items[0].published_date == datetime(2025, 9, 1, 10, 1)
+
+    table = storage.read_table(filter=ds.field("date") == "2025-09-02", columns=["title", "source"])
+    assert table.to_pydict() == {"title": ["Story 2"], "source": ["Reuters/World"]}
+
+    # 默认的单文件模式和文件列表都能看到数据集目录
+    assert ParquetStorage(str(tmp_path)).list_files() == [storage.dataset_name]
+    assert len(ParquetStorage(str(tmp_path)).load(storage.dataset_name)) == 4
+
+
+def test_half_written_fragments_are_invisible(tmp_path):
+    """测试写了一半的临时文件读取时被忽略，过期后被清理"""
+    storage = ParquetStorage(str(tmp_path), dataset=True)
+    storage.save([make_item(1)], "news_run1.parquet")
+    partition = next(storage.dataset_path.rglob("*.parquet")).parent
+    temp = partition / f"{TEMP_PREFIX}part-crashed.parquet"
+    temp.write_bytes(b"PAR1 truncated")
+
+    assert [item.title for item in storage.load_dataset()] == ["Story 1"]
+    assert temp.exists()  # 可能是其他进程正在写入
+
+    os.utime(temp, (0, 0))
+    storage.recover()
+    assert not temp.exists()
+
+
+def test_compact_merges_fragments_and_recovers(tmp_path):
+    """测试合并分区中的片段，以及合并中途崩溃后的恢复"""
+    storage = ParquetStorage(str(tmp_path), dataset=True, row_group_size=2)
+    for run in range(3):
+        storage.save([make_item(run * 2), make_item(run * 2 + 1)], f"news_run{run}.parquet")
+    partition = next(storage.dataset_path.rglob("*.parquet")).parent
+    assert len(list(partition.glob("*.parquet"))) == 3
+
+    assert storage.compact() == 3
+    assert len(list(partition.glob("*.parquet"))) == 1
+    assert len(storage.load_dataset()) == 6
+
+    # 模拟合并在写入日志之后、发布之前崩溃
+    storage.save([make_item(10)], "news_run3.parquet")
+    sources = sorted(path.name for path in partition.glob("*.parquet"))
+    temp = partition / f"{TEMP_PREFIX}compacted-crash.parquet"
+    storage._write_parquet(storage.read_table(columns=FRAGMENT_SCHEMA.names), temp)
+    (partition / f"{JOURNAL_PREFIX}compacted-crash.json").write_text(json.dumps({
+        "target": "compacted-crash.parquet", "temp": temp.name, "sources": sources
+    }))
+    assert len(storage.load_dataset()) == 7
+    assert [path.name for path in partition.iterdir()] == ["compacted-crash.parquet"]
+
+
+def test_storage_manager_uses_dataset_config(tmp_path):
+    """测试按配置启用数据集模式"""
+    from news_agent.core.config import StorageConfig
+
+    storage_config = StorageConfig(format="parquet", directory=str(tmp_path), seen_index=False,
+                                   parquet_dataset=True, parquet_partition_by=["source"])
+    manager = StorageManager.from_config(storage_config)
+    saved = manager.save_news([make_item(1), make_item(2, source="CNN")], ["AI"], "parquet")
+    manager.save_news([make_item(3)], ["AI"], "parquet")
+
+    assert saved == str(Path(tmp_path) / "news_dataset.parquet")
+    assert manager.list_files("parquet") == {"parquet": ["news_dataset.parquet"]}
+    assert len(manager.load_news("news_dataset.parquet")) == 3
+    assert sorted(path.name for path in Path(saved).iterdir()) == ["source=BBC", "source=CNN"]
+
+
+def main():
+    """主测试函数"""
+    print("Parquet数据集测试")
+    print("=" * 50)
+    for test in (test_append_partitions_and_reads_as_one_table,
+                 test_half_written_fragments_are_invisible,
+                 test_compact_merges_fragments_and_recovers,
+                 test_storage_manager_uses_dataset_config):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
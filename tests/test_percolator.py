@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+测试常驻查询（percolator）与逐个主题匹配的一致性
+"""
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.keyword_matcher import KeywordMatcher
+from news_agent.core.percolator import Percolator
+
+
+def make_item(title: str, content: str = "") -> NewsItem:
+    return NewsItem(title=title, content=content, url=f"http://example.com/{title}",
+                    published_date=datetime(2025, 9, 1), source="Test")
+
+
+def test_basic_topics():
+    """测试精确、短语、排除词和只有排除词的主题"""
+    percolator = Percolator({
+        'ml': ['"machine learning"'],
+        'ai': ['人工智能', 'openai'],
+        'no_crypto': ['-crypto'],
+        'ai_not_openai': ['-openai', 'ai'],
+        'bitcoin': ['bitcoin'],
+        'everything': [],
+    })
+    text = "OpenAI发布了新的人工智能模型 Machine Learning news"
+    assert percolator.match(text) == ['ml', 'ai', 'no_crypto', 'everything']
+    assert percolator.match("crypto AI") == ['ai_not_openai', 'everything']
+
+    item = make_item("Bitcoin rally", "Crypto markets")
+    assert percolator.match_item(item) == ['bitcoin', 'everything']
+
+    percolator.remove('everything')
+    percolator.add('bitcoin', ['-rally', 'bitcoin'])  # 替换已有主题
+    assert percolator.match_item(item) == []
+    assert len(percolator) == 5 and 'ml' in percolator
+
+
+def test_randomized_against_keyword_matcher():
+    """随机对照：每个主题的结果与KeywordMatcher逐个匹配一致"""
+    rng = random.Random(7)
+    alphabet = "abcab 人工智能中文"
+
+    def random_keywords():
+        keywords = []
+        for _ in range(rng.randint(0, 5)):
+            term = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+            prefix = rng.choice(["", "", "-", '"'])
+            keywords.append(prefix + term + ('"' if prefix == '"' else ""))
+        return keywords
+
+    queries = {f"topic{i}": random_keywords() for i in range(300)}
+    percolator = Percolator(queries)
+    matchers = {topic: KeywordMatcher(keywords) for topic, keywords in queries.items()}
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        expected = [topic for topic, matcher in matchers.items() if matcher.match(text)]
+        assert percolator.match(text) == expected, text
+
+
+def test_percolate_batch():
+    """测试按主题分组一批新闻"""
+    percolator = Percolator({'ai': ['ai'], 'rust': ['rust'], 'go': ['golang']})
+    items = [make_item("AI chips"), make_item("Rust and AI"), make_item("Weather")]
+    grouped = percolator.percolate(items)
+    assert grouped == {'ai': items[:2], 'rust': [items[1]]}
+
+
+def main():
+    """主测试函数"""
+    print("常驻查询测试")
+    print("=" * 50)
+    for test in (test_basic_topics, test_randomized_against_keyword_matcher, test_percolate_batch):
+        test()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
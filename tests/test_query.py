@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+测试布尔查询语句：解析、化简、短路求值、搜索引擎下推，以及与关键词列表语义的一致性
+"""
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.data_sources.bing_search import BingSearchSource
+from news_agent.core.data_sources.rss import RSSSource
+from news_agent.core.keyword_matcher import KeywordMatcher
+from news_agent.core.percolator import Percolator
+from news_agent.core.query import (
+    And, Not, Or, Query, QuerySyntaxError, Term, compile_filter, compile_query, is_query
+)
+
+
+def make_item(title: str, content: str = "", url: str = "https://www.reuters.com/tech/1",
+              source: str = "Reuters") -> NewsItem:
+    return NewsItem(title=title, content=content, url=url,
+                    published_date=datetime(2025, 9, 1), source=source, summary="")
+
+
+def test_parse_and_evaluate():
+    """测试运算符优先级、分组、字段和排除"""
+    query = compile_query('(AI OR "machine learning") AND -crypto title:OpenAI')
+    assert query.matches(make_item("OpenAI ships a model", "New AI research"))
+    assert not query.matches(make_item("OpenAI ships a model", "AI meets crypto"))
+    assert not query.matches(make_item("A new model", "OpenAI machine learning"))  # OpenAI不在标题中
+    assert query.matches(make_item("openai update", "Machine Learning at scale"))
+
+    assert compile_query("a OR b c").root == Or([Term("a"), And([Term("b"), Term("c")])])
+    assert compile_query("NOT (a OR b)").root == Not(Or([Term("a"), Term("b")]))
+    assert compile_query('title:("gpt 5" OR o3)').root == Or([Term("gpt 5", "title"), Term("o3", "title")])
+
+    site = compile_query("site:reuters.com AND source:reuters")
+    assert site.matches(make_item("x"))
+    assert not site.matches(make_item("x", url="https://notreuters.com/a"))
+    assert compile_query("").matches(make_item("anything"))
+
+
+def test_optimize():
+    """测试化简：双重否定、嵌套合并、重复子句、矛盾、按开销排序"""
+    assert compile_query("NOT NOT a").root == Term("a")
+    assert compile_query("a AND (b AND a)").root == And([Term("a"), Term("b")])
+    assert repr(compile_query("a AND -a").root) == "FALSE"
+    assert repr(compile_query("a OR -a OR b").root) == "TRUE"
+    # 标题条件比全文条件便宜，先求值
+    assert compile_query("content:x title:y").root.children[0] == Term("y", "title")
+
+
+def test_syntax_errors():
+    """测试语法错误"""
+    for text in ['(a OR b', 'a OR', 'a)', '"unclosed', 'title:', 'AND a']:
+        try:
+            compile_query(text)
+        except QuerySyntaxError:
+            continue
+        raise AssertionError(f"应当报错: {text}")
+
+
+def test_keyword_lists_equivalent():
+    """随机对照：关键词列表转换的查询与KeywordMatcher结果一致"""
+    rng = random.Random(3)
+    alphabet = "abcab 人工智能"
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        keywords = []
+        for _ in range(rng.randint(0, 5)):
+            term = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+            prefix = rng.choice(["", "", "-", '"'])
+            keywords.append(prefix + term + ('"' if prefix == '"' else ""))
+        expected = KeywordMatcher(keywords).match(text)
+        assert Query.from_keywords(keywords).match(text) == expected, (text, keywords)
+
+
+def test_engine_pushdown():
+    """测试下推到搜索引擎：不支持的条件放宽，并报告是否需要本地过滤"""
+    query = compile_query('(AI OR "machine learning") AND -crypto title:OpenAI')
+    assert query.to_engine_query('google') == ('intitle:openai -crypto (ai OR "machine learning")', True)
+    assert compile_query("site:bbc.com url:tech").to_engine_query('bing') == ("site:bbc.com", False)
+    assert compile_query("a AND NOT (b AND c)").to_engine_query('google') == ("a", False)
+    assert compile_query("a AND NOT (b OR c)").to_engine_query('google') == ("a -b -c", True)
+    assert compile_query("source:bbc OR ai").to_engine_query('google') == ("", False)
+
+    bing = BingSearchSource()
+    assert bing._build_search_query(['ai AND -crypto'], {'site': 'bbc.com'}) == "ai -crypto site:bbc.com"
+    assert bing._build_search_query(['AI', 'ML'], {}) == "AI ML"  # 普通关键词保持原样
+
+
+def test_shared_by_filters():
+    """测试同一查询用于RSS过滤、关键词匹配入口和常驻查询，编译结果被缓存"""
+    assert is_query(['a OR b']) and is_query(['title:x']) and is_query(['(AI OR ML)']) and is_query(['-site:x.com y'])
+    assert is_query(['(title:x)']) and is_query(['NOT crypto'])
+    # 只有括号或冒号后有空格时按普通关键词处理
+    assert not is_query(['(x)']) and not is_query(['GPT (OpenAI)']) and not is_query(['title: 新闻'])
+    assert not is_query(['title:']) and compile_filter(['GPT (OpenAI)']).match("GPT (OpenAI) ships")
+    assert not is_query(['rock and roll']) and not is_query(['a', 'b OR c']) and not is_query(['http://x.com/a'])
+    assert compile_filter(['a OR b']) is compile_query('a OR b')
+
+    source = RSSSource([])
+    assert source._match_keywords("OpenAI news", ['openai AND -crypto'])
+    assert not source._match_keywords("OpenAI crypto", ['openai AND -crypto'])
+
+    entry = type("Entry", (), {"title": "OpenAI ships", "link": "https://www.bbc.com/news/1",
+                               "summary": "AI news", "description": "AI news"})()
+    assert source._entry_to_row(entry, None, ['title:openai site:bbc.com'], feed_title="BBC") is not None
+    assert source._entry_to_row(entry, None, ['title:openai site:cnn.com'], feed_title="BBC") is None
+    assert source._entry_to_row(entry, None, ['source:bbc AND ai'], feed_title="BBC") is not None
+
+    percolator = Percolator({'q': ['title:openai AND -crypto'], 'k': ['openai']})
+    assert percolator.match_item(make_item("OpenAI ships")) == ['q', 'k']
+    assert percolator.match_item(make_item("News", "OpenAI")) == ['k']
+
+
+def test_percolator_with_random_queries():
+    """随机对照：常驻查询按必需词项索引后，结果与逐条求值一致"""
+    rng = random.Random(11)
+    words = ["ai", "ml", "gpt", "chip", "人工智能", "crypto"]
+
+    def random_query(depth=0):
+        if depth > 2 or rng.random() < 0.4:
+            word = rng.choice(words)
+            return rng.choice(["", "-", "title:", "content:", "-title:"]) + word
+        op = rng.choice([" AND ", " OR ", " "])
+        return "(" + op.join(random_query(depth + 1) for _ in range(rng.randint(2, 3))) + ")"
+
+    queries = {f"q{i}": [random_query()] for i in range(200)}
+    assert sum(is_query(keywords) for keywords in queries.values()) > 150
+    percolator = Percolator(queries)
+    for _ in range(200):
+        item = make_item(" ".join(rng.sample(words, 2)), " ".join(rng.sample(words, 3)))
+        # 只有括号、没有运算符和字段限定的查询按普通关键词处理，与 compile_filter 一致
+        expected = [topic for topic, keywords in queries.items()
+                    if compile_filter(keywords).match_fields(item.title, item.content)]
+        assert percolator.match_item(item) == expected
+
+
+def test_fetch_and_percolator_match_same_fields():
+    """测试RSS获取时的过滤与常驻查询对已获取新闻的匹配使用相同的字段（摘要为截断后的）"""
+    source = RSSSource([])
+    entries = [
+        type("Entry", (), {"title": "Chip news", "link": f"https://www.bbc.com/news/{i}",
+                           "summary": summary, "description": summary})()
+        for i, summary in enumerate(["zebra " + "x" * 600, "x" * 600 + " zebra", "short zebra", "none"])
+    ]
+    queries = {'summary': ['summary:zebra'], 'summary_not': ['chip AND -summary:zebra'],
+               'content': ['content:zebra'], 'site': ['site:bbc.com AND summary:zebra']}
+    items = [source._row_to_item(source._entry_to_row(entry, None), "BBC") for entry in entries]
+    by_topic = Percolator(queries).percolate(items)
+    for topic, keywords in queries.items():
+        fetched = [entry.link for entry in entries if source._entry_to_row(entry, None, keywords, feed_title="BBC")]
+        assert fetched == [item.url for item in by_topic.get(topic, [])], topic
+    # 截断位置之后的词只在内容中
+    assert [item.url for item in by_topic['summary']] == ["https://www.bbc.com/news/0", "https://www.bbc.com/news/2"]
+    assert len(by_topic['content']) == 3
+
+
+def main():
+    """主测试函数"""
+    print("查询语句测试")
+    print("=" * 50)
+    for test in (test_parse_and_evaluate, test_optimize, test_syntax_errors, test_keyword_lists_equivalent,
+                 test_engine_pushdown, test_shared_by_filters, test_percolator_with_random_queries,
+                 test_fetch_and_percolator_match_same_fields):
+        test()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+测试跳转链接解析与持久缓存（使用本地HTTP服务器，无需外网）
+"""
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.data_sources.rss import FeedResult, RSSSource
+from news_agent.core.redirects import RedirectCache, RedirectResolver
+
+
+class RedirectServer:
+    """本地跳转服务器：/r/<n> 跳转到 /article/<n>，/nohead/<n> 不支持HEAD，记录请求方法和并发数"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.requests = []
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def handle_request(self, method):
+                with server.lock:
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                    server.requests.append((method, self.path))
+                try:
+                    time.sleep(server.delay)
+                    kind, _, number = self.path.strip('/').partition('/')
+                    if kind == 'nohead' and method == 'HEAD':
+                        self.send_response(405)
+                        self.send_header("Content-Length", "0")
+                    elif kind in ('r', 'nohead'):
+                        self.send_response(302)
+                        self.send_header("Location", f"/article/{number}?utm_source=feed")
+                        self.send_header("Content-Length", "0")
+                    elif kind == 'article':
+                        body = b"x" * 100_000
+                        self.send_response(200)
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        if method == 'GET':
+                            self.wfile.write(body)
+                        return
+                    else:
+                        self.send_response(404)
+                        self.send_header("Content-Length", "0")
+                    self.end_headers()
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+            def do_HEAD(self):
+                self.handle_request('HEAD')
+
+            def do_GET(self):
+                self.handle_request('GET')
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def make_item(i: int, url: str) -> NewsItem:
+    return NewsItem(title=f"Story {i}", content=f"Body {i}", url=url,
+                    published_date=datetime(2025, 9, 1, 10, i), source="Test")
+
+
+def test_resolve_concurrently_and_cache(tmp_path):
+    """测试并发解析、单主机并发上限、HEAD回退GET，以及跨运行的持久缓存"""
+    server = RedirectServer()
+    try:
+        urls = [server.url(f"/r/{i}") for i in range(8)] + [server.url("/nohead/9")]
+        cache_path = str(tmp_path / "redirects.sqlite3")
+        resolver = RedirectResolver(RedirectCache(cache_path), hosts=(), max_workers=8, per_host_limit=3)
+        mapping = resolver.resolve_urls(urls + urls[:2])
+        assert mapping[urls[0]] == server.url("/article/0")  # 跟踪参数已去掉
+        assert mapping[urls[-1]] == server.url("/article/9")
+        assert resolver.stats.resolved == 9 and resolver.stats.cached == 0
+        assert server.max_active <= 3
+        # 正文不下载：只有不支持HEAD的链接发出GET请求
+        assert [path for method, path in server.requests if method == 'GET'] == ["/nohead/9", "/article/9?utm_source=feed"]
+        resolver.close()
+
+        # 新的解析器（下一次运行）直接命中缓存，不再发请求
+        count = len(server.requests)
+        again = RedirectResolver(RedirectCache(cache_path), hosts=())
+        assert again.resolve_urls(urls) == mapping
+        assert again.stats.cached == 9 and len(server.requests) == count
+
+        # 过期后重新解析
+        expired = RedirectResolver(RedirectCache(cache_path, ttl=0), hosts=())
+        expired.resolve_urls(urls[:1])
+        assert expired.stats.resolved == 1
+    finally:
+        server.close()
+
+
+def test_failures_and_host_filter(tmp_path):
+    """测试只解析指定主机的链接，解析失败时保留原链接并短期缓存失败"""
+    cache = RedirectCache(str(tmp_path / "redirects.sqlite3"), failure_ttl=3600)
+    resolver = RedirectResolver(cache, hosts=("127.0.0.1", "t.co"), timeout=1)
+    assert resolver.needs_resolving("https://t.co/abc") and resolver.needs_resolving("http://127.0.0.1:1/x")
+    assert not resolver.needs_resolving("https://example.com/t.co") and not resolver.needs_resolving("")
+
+    dead = "http://127.0.0.1:1/dead"  # 无法连接
+    assert resolver.resolve_urls([dead, "https://example.com/a"]) == {}
+    assert resolver.stats.candidates == 1 and resolver.stats.failed == 1
+    assert cache.get_many([dead]) == {dead: None}
+    assert cache.get_many([dead], now=time.time() + 7200) == {}
+    assert cache.prune(now=time.time() + 7200) == 1 and len(cache) == 0
+
+
+def test_rss_source_resolves_before_merge(tmp_path):
+    """测试RSS数据源在合并前解析跳转链接，不同包装链接指向同一篇文章时只保留一条"""
+    server = RedirectServer(delay=0)
+    try:
+        resolver = RedirectResolver(RedirectCache(str(tmp_path / "redirects.sqlite3")), hosts=())
+        source = RSSSource(["http://a.example/feed", "http://b.example/feed"], redirect_resolver=resolver)
+        results = [
+            FeedResult(url="http://a.example/feed", items=[make_item(1, server.url("/r/1"))]),
+            FeedResult(url="http://b.example/feed", items=[make_item(1, server.url("/nohead/1"))]),
+        ]
+        source.iter_fetch = lambda keywords=None, urls=None: iter(results)
+        news = source.fetch_news()
+        assert [item.url for item in news] == [server.url("/article/1")]
+        assert resolver.stats.changed == 2
+    finally:
+        server.close()
+
+
+def main():
+    """主测试函数"""
+    print("跳转链接解析测试")
+    print("=" * 50)
+    for test in (test_resolve_concurrently_and_cache,
+                 test_failures_and_host_filter,
+                 test_rss_source_resolves_before_merge):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
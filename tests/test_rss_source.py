@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+测试RSS数据源（使用本地HTTP服务器，无需外网）
+"""
+import html
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.rss import (
+    RSSSource, FEED_STATUS_NEW, FEED_STATUS_NOT_MODIFIED, FEED_STATUS_UNCHANGED, FEED_STATUS_SKIPPED
+)
+from news_agent.core.feed_state import FeedStateStore
+from news_agent.core.feed_schedule import FeedCadence
+from news_agent.core.feed_health import FeedHealthRegistry
+from news_agent.core.http_client import HTTPClient
+
+
+def make_rss(feed_id: int, count: int = 5) -> bytes:
+    """生成一个简单的RSS 2.0文档"""
+    items = "".join(
+        f"<item><title>Story {feed_id}-{j} about AI</title>"
+        f"<link>http://example.com/{feed_id}/{j}</link>"
+        f"<guid>guid-{feed_id}-{j}</guid>"
+        f"<description>&lt;p&gt;Body {j} &amp; AI news&lt;/p&gt;</description>"
+        f"<pubDate>Mon, 0{j + 1} Sep 2025 10:00:00 GMT</pubDate></item>"
+        for j in range(count)
+    )
+    return (
+        f'<?xml version="1.0"?><rss version="2.0"><channel>'
+        f"<title>Feed {feed_id}</title>{items}</channel></rss>"
+    ).encode()
+
+
+def make_json_feed(feed_id: int, count: int = 5) -> bytes:
+    """生成与make_rss内容相同的JSON Feed文档"""
+    items = [
+        {
+            "id": f"guid-{feed_id}-{j}",
+            "url": f"http://example.com/{feed_id}/{j}",
+            "title": f"Story {feed_id}-{j} about AI",
+            "content_html": f"<p>Body {j} &amp; AI news</p>",
+            "date_published": f"2025-09-0{j + 1}T10:00:00Z",
+        }
+        for j in range(count)
+    ]
+    return json.dumps({
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": f"Feed {feed_id}",
+        "items": items,
+    }).encode()
+
+
+class FeedServer:
+    """本地RSS服务器，记录并发请求数"""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.routes = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server.lock:
+                    server.active += 1
+                    server.requests += 1
+                    server.max_active = max(server.max_active, server.active)
+                try:
+                    time.sleep(server.delay)
+                    route = server.routes.get(self.path)
+                    if route is None:
+                        self.send_response(404)
+                        self.end_headers()
+                        return
+                    status, headers, body = route(self) if callable(route) else (200, {"Content-Type": "application/xml"}, route)
+                    self.send_response(status)
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_concurrent_fetch_respects_per_host_limit():
+    """测试并发获取与单主机并发上限"""
+    server = FeedServer(delay=0.1)
+    try:
+        urls = []
+        for i in range(8):
+            server.routes[f"/feed{i}.xml"] = make_rss(i)
+            urls.append(server.url(f"/feed{i}.xml"))
+
+        source = RSSSource(urls, max_workers=8, per_host_limit=3)
+        results = list(source.iter_fetch(["AI"]))
+
+        assert len(results) == 8
+        assert all(r.ok for r in results)
+        assert sum(len(r.items) for r in results) == 40
+        assert server.max_active <= 3
+        print(f"最大并发: {server.max_active}")
+    finally:
+        server.close()
+
+
+def test_fetch_news_dedup_and_sort():
+    """测试fetch_news仍然去重并按时间排序"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/a.xml"] = make_rss(1)
+        server.routes["/b.xml"] = make_rss(1)  # 与a完全相同
+        source = RSSSource([server.url("/a.xml"), server.url("/b.xml")], max_workers=2)
+
+        news = source.fetch_news(["AI"])
+
+        assert len(news) == 5
+        dates = [item.published_date for item in news]
+        assert dates == sorted(dates, reverse=True)
+    finally:
+        server.close()
+
+
+def test_html_cleaning_and_prefilter():
+    """测试HTML清理（去标签、还原实体）与预筛选（不能漏掉最终会匹配的条目）"""
+    source = RSSSource([])
+    assert source._clean_html('<p class="a">AT&amp;T\n<b>AI</b></p>') == "AT&T\nAI"
+    assert source._clean_html('<div\n id="x">&#20154;&#24037;智能</div>') == "人工智能"
+    # 常见实体走快速路径，结果与 html.unescape 一致
+    for text in ('a &amp;lt; b', '&lt;p&gt; &quot;x&quot; &#39;y&#039; &apos;z&apos;', 'x&nbsp;y&#160;z',
+                 'AT&T & co', '&amp;#20154;', '&ampfoo &lt &eacute;t&eacute;', '&amp;&amp;amp;', '&#x41;&'):
+        assert source._clean_html(text) == html.unescape(text), text
+    rng = random.Random(5)
+    pieces = ['&', 'amp;', 'lt;', 'gt', '#39;', '#', 'x4', '1;', 'nbsp;', 'quot;', 'a', ' ', ';', '人']
+    for _ in range(2000):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(1, 8)))
+        assert source._clean_html(text) == html.unescape(text), text
+
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/feed.xml"] = make_rss(7, count=3)
+        news = RSSSource([server.url("/feed.xml")]).fetch_news(["AI", "-crypto"])
+        assert len(news) == 3
+        assert news[0].content.startswith("Body ") and "& AI news" in news[0].content
+        assert RSSSource([server.url("/feed.xml")]).fetch_news(["robotics"]) == []
+
+        # 关键词只出现在完整正文（content:encoded）中，或被标签、实体拆开时，预筛选不能丢弃条目
+        bodies = [
+            "Plain text body mentioning OpenAI",
+            "<p>Researchers at <b>Open</b>AI said</p>",
+            "<p>A machine <em>learning</em> model</p>",
+            "<p>&#20154;&#24037;&#26234;&#33021;</p>",
+            "Nothing relevant here",
+        ]
+        items = "".join(
+            f"<item><title>Story {i}</title><link>http://example.com/body/{i}</link>"
+            f"<description>Short summary {i}</description>"
+            f"<content:encoded><![CDATA[{body}]]></content:encoded>"
+            f"<pubDate>Mon, 01 Sep 2025 1{i}:00:00 GMT</pubDate></item>"
+            for i, body in enumerate(bodies)
+        )
+        server.routes["/body.xml"] = (
+            '<?xml version="1.0"?><rss version="2.0" '
+            'xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>'
+            f"<title>Bodies</title>{items}</channel></rss>"
+        ).encode()
+        body_source = RSSSource([server.url("/body.xml")])
+        news = body_source.fetch_news(["openai", "machine learning", "人工智能"])
+        assert sorted(item.title for item in news) == ["Story 0", "Story 1", "Story 2", "Story 3"]
+        assert [item.title for item in body_source.fetch_news(["content:openai"])] == ["Story 1", "Story 0"]
+    finally:
+        server.close()
+
+
+def test_response_size_limit():
+    """测试响应体大小上限"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/big.xml"] = make_rss(1, count=200)
+        source = RSSSource([server.url("/big.xml")], max_bytes=1024, max_retries=1)
+
+        results = list(source.iter_fetch())
+
+        assert not results[0].ok
+        assert "上限" in results[0].error
+    finally:
+        server.close()
+
+
+def test_permanent_redirect_is_remembered():
+    """测试永久重定向只跟随一次"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/old.xml"] = lambda handler: (301, {"Location": "/new.xml"}, b"")
+        server.routes["/new.xml"] = make_rss(2)
+        client = HTTPClient()
+
+        first = client.fetch(server.url("/old.xml"))
+        assert first.url == server.url("/new.xml")
+        assert client.resolve(server.url("/old.xml")) == server.url("/new.xml")
+
+        requests_before = server.requests
+        source = RSSSource([server.url("/old.xml")], http_client=client)
+        news = source.fetch_news()
+        assert len(news) == 5
+        assert server.requests == requests_before + 1
+    finally:
+        server.close()
+
+
+def test_conditional_get(tmp_path):
+    """测试ETag条件请求与内容哈希短路"""
+    server = FeedServer(delay=0)
+    try:
+        body = make_rss(3)
+
+        def etag_route(handler):
+            if handler.headers.get("If-None-Match") == '"v1"':
+                return 304, {}, b""
+            return 200, {"ETag": '"v1"'}, body
+
+        server.routes["/etag.xml"] = etag_route
+        server.routes["/plain.xml"] = body
+        urls = [server.url("/etag.xml"), server.url("/plain.xml")]
+        state_path = tmp_path / "cache.json"
+
+        first = RSSSource(urls, cache_store=FeedStateStore(str(state_path)))
+        results = {r.url: r for r in first.iter_fetch()}
+        assert all(r.status == FEED_STATUS_NEW for r in results.values())
+        assert state_path.exists()
+
+        # 新实例从磁盘加载缓存
+        second = RSSSource(urls, cache_store=FeedStateStore(str(state_path)))
+        results = {r.url: r for r in second.iter_fetch()}
+        assert results[urls[0]].status == FEED_STATUS_NOT_MODIFIED
+        assert results[urls[0]].bytes_saved == len(body)
+        assert results[urls[1]].status == FEED_STATUS_UNCHANGED
+        assert not any(r.items for r in results.values())
+    finally:
+        server.close()
+
+
+def test_conditional_cache_per_keyword_set(tmp_path):
+    """测试条件请求缓存按关键词组合区分：另一组关键词记录的304/内容未变不会让本组拿不到条目"""
+    server = FeedServer(delay=0)
+    try:
+        body = make_rss(3)
+
+        def etag_route(handler):
+            if handler.headers.get("If-None-Match") == '"v1"':
+                return 304, {}, b""
+            return 200, {"ETag": '"v1"'}, body
+
+        server.routes["/etag.xml"] = etag_route
+        server.routes["/plain.xml"] = body
+        urls = [server.url("/etag.xml"), server.url("/plain.xml")]
+        state_dir = str(tmp_path / ".state")
+
+        def fetch(keywords):
+            store = FeedStateStore.for_name(state_dir, RSSSource.state_name('cache', keywords))
+            return {r.url: r for r in RSSSource(urls, cache_store=store).iter_fetch(keywords)}
+
+        assert all(r.items for r in fetch(['"Story 3-"']).values())
+        # 清理后文件名相同的关键词组合使用自己的缓存，仍然完整获取
+        results = fetch(['Story 3-'])
+        assert all(r.status == FEED_STATUS_NEW and len(r.items) == 5 for r in results.values())
+        results = fetch(['"Story 3-"'])
+        assert results[urls[0]].status == FEED_STATUS_NOT_MODIFIED
+        assert results[urls[1]].status == FEED_STATUS_UNCHANGED
+    finally:
+        server.close()
+
+
+def test_since_last_cursor(tmp_path):
+    """测试增量游标跳过已处理的条目"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/feed.xml"] = make_rss(4, count=3)
+        url = server.url("/feed.xml")
+        state_path = str(tmp_path / "cursor.json")
+
+        first = RSSSource([url], cursor_store=FeedStateStore(state_path))
+        assert len(first.fetch_news()) == 3
+
+        # 源新增了两条更新的条目
+        server.routes["/feed.xml"] = make_rss(4, count=5)
+        second = RSSSource([url], cursor_store=FeedStateStore(state_path))
+        results = list(second.iter_fetch())
+        assert len(results[0].items) == 2
+        assert results[0].skipped_entries == 3
+        assert {item.url for item in results[0].items} == {
+            "http://example.com/4/3", "http://example.com/4/4"
+        }
+    finally:
+        server.close()
+
+
+def test_cursor_stores_per_keyword_set(tmp_path):
+    """测试清理后文件名相同的关键词组合使用各自的游标，不会互相跳过条目"""
+    state_dir = str(tmp_path / ".state")
+    pairs = [(['"AI"'], ['AI']), (['c++'], ['c']), (['"machine learning"'], ['machinelearning']),
+             (['a_b'], ['a', 'b'])]
+    for first, second in pairs:
+        stores = [FeedStateStore.for_name(state_dir, RSSSource.state_name('cursor', keywords))
+                  for keywords in (first, second)]
+        assert stores[0].path != stores[1].path, (first, second)
+        assert stores[0].path.parent == Path(state_dir)
+    long_name = RSSSource.state_name('cursor', ['x' * 200])
+    assert len(FeedStateStore.for_name(state_dir, long_name).path.name) < 100
+
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/feed.xml"] = make_rss(4, count=3)
+        url = server.url("/feed.xml")
+
+        def fetch(keywords):
+            store = FeedStateStore.for_name(state_dir, RSSSource.state_name('cursor', keywords))
+            return RSSSource([url], cursor_store=store).fetch_news(keywords)
+
+        assert len(fetch(['"Story 4-"'])) == 3
+        # 另一组关键词（清理后名称相同）仍能看到全部条目
+        assert len(fetch(['Story 4-'])) == 3
+        assert fetch(['"Story 4-"']) == []
+    finally:
+        server.close()
+
+
+def test_adaptive_cadence_fetches_due_feeds(tmp_path):
+    """测试自适应检查周期：检查过的源在到期前不再获取"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/a.xml"] = make_rss(8)
+        server.routes["/b.xml"] = lambda handler: (500, {}, b"")
+        urls = [server.url("/a.xml"), server.url("/b.xml")]
+        cadence = FeedCadence(FeedStateStore(str(tmp_path / "schedule.json")), min_interval=3600)
+
+        source = RSSSource(urls, cadence=cadence, max_retries=1)
+        assert source.due_urls() == urls
+        assert len(source.fetch_news(urls=source.due_urls())) == 5
+
+        record = cadence.store.get(urls[0])
+        assert len(record["updates"]) == 1
+        # 最新条目的发布时间作为更新时间（与_entry_timestamp一致，按本地时间解释）
+        assert record["updates"][0] == time.mktime(time.strptime("2025-09-05 10:00", "%Y-%m-%d %H:%M"))
+        assert source.due_urls() == []
+        # 失败的源按最小间隔重试；a的最新条目已是很久以前，按最长间隔检查
+        assert source.due_urls(now=time.time() + 3601) == [urls[1]]
+        assert source.due_urls(now=time.time() + cadence.max_interval + 1) == urls
+    finally:
+        server.close()
+
+
+def test_retries_do_not_block_and_circuit_breaker(tmp_path):
+    """测试重试退避不阻塞其他源，连续失败的源被熔断跳过"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/ok.xml"] = make_rss(9)
+        dead = "http://127.0.0.1:1/dead.xml"  # 连接被拒绝
+        health = FeedHealthRegistry(FeedStateStore(str(tmp_path / "health.json")), failure_threshold=1)
+
+        source = RSSSource([dead, server.url("/ok.xml")], max_workers=1, max_retries=2, health=health)
+        start = time.monotonic()
+        arrivals = [(r.url, r.attempts, time.monotonic() - start) for r in source.iter_fetch()]
+
+        # 健康的源不等待死源的1秒退避
+        assert arrivals[0][0] == server.url("/ok.xml") and arrivals[0][2] < 0.9
+        assert arrivals[1][:2] == (dead, 2)
+        assert health.store.get(dead)["failures"] == 1
+
+        results = {r.url: r for r in source.iter_fetch()}
+        assert results[dead].status == FEED_STATUS_SKIPPED
+        assert results[server.url("/ok.xml")].status == FEED_STATUS_NEW
+        assert health.report()[0]["state"] == "open"
+    finally:
+        server.close()
+
+
+def test_json_feed_fast_path():
+    """测试JSON Feed按Content-Type或嗅探识别，结果与RSS一致"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/feed.json"] = lambda handler: (200, {"Content-Type": "application/feed+json"}, make_json_feed(10))
+        server.routes["/sniff"] = lambda handler: (200, {"Content-Type": "text/plain"}, make_json_feed(11))
+        server.routes["/feed.xml"] = make_rss(10)
+        json_urls = [server.url("/feed.json"), server.url("/sniff")]
+
+        results = {r.url: r for r in RSSSource(json_urls + [server.url("/feed.xml")], parse_workers=1).iter_fetch(["AI"])}
+        assert all(results[url].json_feed for url in json_urls)
+        assert not results[server.url("/feed.xml")].json_feed
+
+        def snapshot(items):
+            return sorted((i.title, i.url, i.content, i.source, i.published_date) for i in items)
+
+        assert snapshot(results[json_urls[0]].items) == snapshot(results[server.url("/feed.xml")].items)
+        assert results[json_urls[1]].feed_title == "Feed 11"
+        assert results[json_urls[0]].items[0].content.startswith("Body ")
+
+        streamed = RSSSource([json_urls[0]], stream_parse=True).fetch_news(["AI"])
+        assert len(streamed) == 5
+    finally:
+        server.close()
+
+
+def test_process_pool_parsing():
+    """测试进程池解析与线程内解析结果一致"""
+    server = FeedServer(delay=0)
+    try:
+        urls = []
+        for i in range(4):
+            server.routes[f"/p{i}.xml"] = make_rss(i)
+            urls.append(server.url(f"/p{i}.xml"))
+
+        in_thread = RSSSource(urls).fetch_news(["AI"])
+        in_pool = RSSSource(urls, parse_workers=2).fetch_news(["AI"])
+
+        assert len(in_pool) == 20
+        assert sorted(item.to_dict()['url'] for item in in_pool) == \
+            sorted(item.to_dict()['url'] for item in in_thread)
+        assert {item.source for item in in_pool} == {f"Feed {i}" for i in range(4)}
+    finally:
+        server.close()
+
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom Feed</title>
+  <entry>
+    <title>Atom AI story</title>
+    <link href="http://example.com/atom/1"/>
+    <id>urn:atom:1</id>
+    <updated>2025-09-02T10:00:00Z</updated>
+    <summary>First AI summary</summary>
+  </entry>
+  <entry>
+    <title>Older atom story</title>
+    <link href="http://example.com/atom/2"/>
+    <id>urn:atom:2</id>
+    <updated>2025-09-01T10:00:00Z</updated>
+    <content type="html">&lt;b&gt;AI&lt;/b&gt; content</content>
+  </entry>
+</feed>"""
+
+RDF_FEED = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="http://example.com/"><title>RDF Feed</title><link>http://example.com/</link></channel>
+  <item rdf:about="http://example.com/rdf/1"><title>RDF AI item</title><link>http://example.com/rdf/1</link>
+  <description>AI</description><dc:date>2025-09-03T10:00:00Z</dc:date></item>
+</rdf:RDF>"""
+
+
+def test_streaming_parser_matches_feedparser():
+    """测试流式解析与feedparser结果一致，并支持回退"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/rss.xml"] = make_rss(5)
+        server.routes["/atom.xml"] = ATOM_FEED
+        server.routes["/rdf.xml"] = RDF_FEED
+        urls = [server.url(p) for p in ("/rss.xml", "/atom.xml", "/rdf.xml")]
+
+        def snapshot(items):
+            return sorted((i.title, i.url, i.content, i.source, i.published_date) for i in items)
+
+        normal = RSSSource(urls).fetch_news(["AI"])
+        streamed = RSSSource(urls, stream_parse=True).fetch_news(["AI"])
+
+        assert len(normal) == 8
+        assert snapshot(streamed) == snapshot(normal)
+    finally:
+        server.close()
+
+
+def test_streaming_parser_stops_early():
+    """测试流式解析在条目上限处停止"""
+    server = FeedServer(delay=0)
+    try:
+        server.routes["/long.xml"] = make_rss(6, count=9)
+        source = RSSSource([server.url("/long.xml")], stream_parse=True, stream_max_items=3)
+
+        results = list(source.iter_fetch())
+        assert len(results[0].items) == 3
+
+        items = list(source.iter_stream_news(server.url("/long.xml"), ["AI"]))
+        assert [item.url for item in items] == [f"http://example.com/6/{j}" for j in range(3)]
+    finally:
+        server.close()
+
+
+def main():
+    """主测试函数"""
+    print("RSS数据源测试")
+    print("=" * 50)
+    test_concurrent_fetch_respects_per_host_limit()
+    test_fetch_news_dedup_and_sort()
+    test_html_cleaning_and_prefilter()
+    test_response_size_limit()
+    test_permanent_redirect_is_remembered()
+    test_process_pool_parsing()
+    test_streaming_parser_matches_feedparser()
+    test_streaming_parser_stops_early()
+    test_json_feed_fast_path()
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        test_conditional_get(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_conditional_cache_per_keyword_set(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_since_last_cursor(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_cursor_stores_per_keyword_set(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_adaptive_cadence_fetches_due_feeds(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_retries_do_not_block_and_circuit_breaker(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+测试调度器的共享获取：同一轮到期的主题只获取一次RSS源，各主题分别保存（使用本地HTTP服务器）
+"""
+import copy
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import schedule
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from news_agent.core.config import config
+from news_agent.core.scheduler import NewsScheduler
+from test_rss_source import FeedServer, make_rss
+
+
+def configure(tmp_path: Path, urls):
+    """把全局配置指向本地RSS源和临时目录，返回原配置以便恢复"""
+    original = copy.deepcopy(config._config)
+    rss = config._config.setdefault('data_sources', {}).setdefault('rss', {})
+    rss.update(sources=urls, state_dir=str(tmp_path / ".state"), circuit_breaker=False)
+    storage = config._config.setdefault('storage', {})
+    storage.update(directory=str(tmp_path), format="json", seen_filter=False)
+    config._config.setdefault('search', {})['resolve_redirects'] = False
+    return original
+
+
+def saved_titles(tmp_path: Path):
+    """返回 {文件名中的关键词部分: 标题列表}"""
+    saved = {}
+    for path in tmp_path.glob("news_*.json"):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        items = data['news'] if isinstance(data, dict) else data
+        keyword = path.stem.split('_', 3)[3]
+        saved[keyword] = sorted(item['title'] for item in items)
+        assert all(item['keywords'] for item in items)
+    return saved
+
+
+def test_due_topics_share_one_fetch(tmp_path):
+    """测试同一轮到期的多个主题共用一次获取，并按各自的关键词过滤和保存"""
+    server = FeedServer(delay=0)
+    original = None
+    try:
+        for i in range(3):
+            server.routes[f"/feed{i}.xml"] = make_rss(i, count=3)
+        original = configure(tmp_path, [server.url(f"/feed{i}.xml") for i in range(3)])
+        news_scheduler = NewsScheduler()
+
+        for keywords in (["Story 0-"], ["-Story 1-0", "Story 1-"], ["Story 2-1"], ["absent"], ["Story 0-"]):
+            news_scheduler.add_rss_job(keywords, interval="1h")
+        schedule.run_all()  # 所有任务同时到期，只登记不获取
+        assert server.requests == 0
+        news_scheduler.run_due_topics()
+        assert server.requests == 3  # 每个RSS源只下载一次
+
+        assert saved_titles(tmp_path) == {
+            "Story0-": ["Story 0-0 about AI", "Story 0-1 about AI", "Story 0-2 about AI"],
+            "-Story1-0_Story1-": ["Story 1-1 about AI", "Story 1-2 about AI"],
+            "Story2-1": ["Story 2-1 about AI"],
+        }
+        assert all(job['last_run'] for job in news_scheduler.list_jobs())
+
+        # 没有到期任务时不获取
+        news_scheduler.run_due_topics()
+        assert server.requests == 3
+        news_scheduler.clear_jobs()
+    finally:
+        schedule.clear()
+        if original is not None:
+            config._config = original
+        server.close()
+
+
+def test_overlapping_topics_at_different_intervals(tmp_path):
+    """测试关键词重叠、周期不同的主题：各自保存命中的新闻，
+    其他主题单独获取更新了共享的条件请求缓存后也不会错过新条目"""
+    server = FeedServer(delay=0)
+    original = None
+    feed = {"count": 3, "conditional": 0}
+
+    def conditional_feed(handler):
+        etag = f'"v{feed["count"]}"'
+        if handler.headers.get("If-None-Match") == etag:
+            feed["conditional"] += 1
+            return 304, {"ETag": etag}, b""
+        return 200, {"Content-Type": "application/xml", "ETag": etag}, make_rss(0, count=feed["count"])
+
+    try:
+        server.routes["/feed0.xml"] = conditional_feed
+        original = configure(tmp_path, [server.url("/feed0.xml")])
+        config._config['data_sources']['rss'].update(conditional_get=True, adaptive_schedule=False)
+        # 同一秒内的多次保存文件名相同，jsonl追加写入不会覆盖
+        config._config['storage']['format'] = "jsonl"
+        news_scheduler = NewsScheduler()
+        frequent = news_scheduler.jobs[news_scheduler.add_rss_job(["AI"], interval="1h")]
+        rare = news_scheduler.jobs[news_scheduler.add_rss_job(["Story 0-"], interval="6h")]
+
+        def run(*jobs):
+            for job in jobs:
+                news_scheduler._queue_rss_topic(job)
+            news_scheduler.run_due_topics()
+
+        def titles(keyword):
+            return sorted(json.loads(line)['title'] for path in tmp_path.glob(f"news_*_{keyword}.jsonl")
+                          for line in path.read_text(encoding="utf-8").splitlines())
+
+        run(frequent, rare)
+        stories = ["Story 0-0 about AI", "Story 0-1 about AI", "Story 0-2 about AI"]
+        assert titles("AI") == titles("Story0-") == stories  # 同一批新闻保存到两个主题下
+
+        feed["count"] = 4
+        run(frequent)  # 只有频繁的主题到期，共享缓存记录了新版本
+        run(frequent)  # 所有主题都参与过上次获取：使用条件请求
+        assert feed["conditional"] == 1
+        assert titles("AI") == stories + ["Story 0-3 about AI"]
+
+        run(rare)  # 不能因为共享缓存返回304而错过 Story 0-3
+        assert feed["conditional"] == 1
+        assert titles("Story0-") == stories + ["Story 0-3 about AI"]
+        news_scheduler.clear_jobs()
+    finally:
+        schedule.clear()
+        if original is not None:
+            config._config = original
+        server.close()
+
+
+def test_near_duplicates_collapse_per_topic(tmp_path):
+    """测试近似重复在各主题命中的新闻中合并：保留的一条不命中时，主题仍保存命中的转载"""
+    body = " ".join(f"word{i}" for i in range(120))
+
+    def feed(title: str, text: str, feed_id: int) -> bytes:
+        return (
+            f'<?xml version="1.0"?><rss version="2.0"><channel><title>Feed {feed_id}</title>'
+            f"<item><title>{title}</title><link>http://example.com/{feed_id}/0</link>"
+            f"<guid>guid-{feed_id}</guid><description>{text}</description>"
+            f"<pubDate>Mon, 01 Sep 2025 10:00:00 GMT</pubDate></item></channel></rss>"
+        ).encode()
+
+    server = FeedServer(delay=0)
+    original = None
+    try:
+        # 第一条正文更长，合并时作为代表保留，但只有第二条的标题含有 Quantum
+        server.routes["/a.xml"] = feed("Markets rally as chips surge", body + " extra closing remarks", 0)
+        server.routes["/b.xml"] = feed("Quantum chips make markets rally", body, 1)
+        original = configure(tmp_path, [server.url("/a.xml"), server.url("/b.xml")])
+        config._config['search']['near_duplicates'] = True
+        news_scheduler = NewsScheduler()
+
+        for keywords in (["Quantum"], ["markets"]):
+            news_scheduler.add_rss_job(keywords, interval="1h")
+        schedule.run_all()
+        news_scheduler.run_due_topics()
+
+        assert saved_titles(tmp_path) == {
+            "Quantum": ["Quantum chips make markets rally"],
+            "markets": ["Markets rally as chips surge"],
+        }
+        news_scheduler.clear_jobs()
+    finally:
+        schedule.clear()
+        if original is not None:
+            config._config = original
+        server.close()
+
+
+def test_cli_creates_scheduler_lazily():
+    """测试导入命令行和查看帮助时不创建调度器（不加载存储），用到时才创建且只创建一次"""
+    from click.testing import CliRunner
+    from news_agent.cli.commands import cli
+    from news_agent.core import scheduler as scheduler_module
+
+    original = scheduler_module._scheduler
+    scheduler_module._scheduler = None
+    try:
+        result = CliRunner().invoke(cli, ["--help"])
+        assert result.exit_code == 0
+        assert scheduler_module._scheduler is None
+        assert scheduler_module.get_scheduler() is scheduler_module.get_scheduler()
+    finally:
+        scheduler_module._scheduler = original
+
+
+def main():
+    """主测试函数"""
+    print("调度器共享获取测试")
+    print("=" * 50)
+    for test in (test_due_topics_share_one_fetch,
+                 test_overlapping_topics_at_different_intervals,
+                 test_near_duplicates_collapse_per_topic):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_cli_creates_scheduler_lazily()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+测试按时间窗口轮换的已见过滤器（Bloom过滤器）
+"""
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.config import StorageConfig
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.storage.manager import StorageManager
+from news_agent.storage.seen_filter import BloomFilter, ScalableBloomFilter, SeenFilter
+
+
+def random_keys(count: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).integers(-2 ** 63, 2 ** 63 - 1, size=count, dtype=np.int64)
+
+
+def make_item(i: int) -> NewsItem:
+    return NewsItem(
+        title=f"Story {i}",
+        content=f"Body {i}",
+        url=f"http://example.com/{i}",
+        published_date=datetime(2025, 9, 1, 10, 0),
+        source="Test"
+    )
+
+
+def test_memory_and_error_rate_per_million():
+    """测试每百万个键的内存占用和实际误判率"""
+    keys = random_keys(1_000_000, seed=1)
+    probes = random_keys(200_000, seed=2)
+
+    bloom = BloomFilter(1_000_000, 0.01)
+    bloom.add(keys.view(np.uint64))
+    # 1%误判率：约9.6位/键，即每百万个键约1.2MB
+    assert 1_150_000 <= bloom.nbytes <= 1_250_000
+    assert bloom.contains(keys[:100_000].view(np.uint64)).all()
+    assert bloom.contains(probes.view(np.uint64)).mean() < 0.013
+
+    # 默认配置（0.1%，4代）：每代第一层误判率为 0.001/4/2，约18.7位/键，每百万个键约2.3MB
+    seen = SeenFilter(error_rate=0.001, capacity=1_000_000, generations=4)
+    seen.add(keys, now=0)
+    assert len(seen) == 1_000_000
+    assert 2_200_000 <= seen.nbytes <= 2_400_000
+    assert seen.contains(keys[:100_000]).all()
+    assert seen.contains(probes).mean() < 0.001
+
+
+def test_scalable_growth_keeps_error_rate():
+    """测试超出容量时自动扩展且总误判率不超过设定值"""
+    bloom = ScalableBloomFilter(1000, 0.01)
+    keys = random_keys(20_000, seed=3)
+    for chunk in np.array_split(keys.view(np.uint64), 7):
+        bloom.add(chunk)
+    bloom.add(keys[:5000].view(np.uint64))  # 重复写入不占用容量
+    assert len(bloom.layers) == 5  # 1000 + 2000 + 4000 + 8000 + 16000
+    # 误判为已存在的少数新键不再写入
+    assert 19_800 <= bloom.count <= 20_000
+    assert bloom.contains(keys.view(np.uint64)).all()
+    assert bloom.contains(random_keys(100_000, seed=4).view(np.uint64)).mean() < 0.01
+
+
+def test_generations_age_out():
+    """测试按时间窗口轮换：超出窗口的键被遗忘，重新写入的键延长寿命"""
+    seen = SeenFilter(error_rate=0.001, capacity=1000, window=100, generations=4)
+    old, refreshed, recent = [1, 2, 3], [10, 11], [20, 21]
+    seen.add(old + refreshed, now=0)
+    seen.add(refreshed, now=60)
+    seen.add(recent, now=80)
+    assert seen.contains(old + refreshed + recent).all()
+
+    seen.add([99], now=110)
+    assert not seen.contains(old).any()
+    assert seen.contains(refreshed + recent).all()
+
+    # 长时间没有写入后，窗口内没有任何旧代
+    seen.add([100], now=1000)
+    assert not seen.contains(refreshed + recent).any()
+    assert len(seen._generations) == 1
+
+
+def test_snapshot_roundtrip(tmp_path):
+    """测试快照保存与恢复，已超出窗口的代在恢复时丢弃"""
+    path = tmp_path / "filter.npz"
+    seen = SeenFilter(capacity=100, window=100, generations=2, snapshot_path=str(path), snapshot_interval=30)
+    seen.add(range(50), now=0)
+    assert seen.maybe_snapshot(now=0)  # 首次写入立即保存
+    seen.add(range(50, 400), now=60)  # 触发扩展
+    assert not seen.maybe_snapshot(now=20)
+    assert seen.maybe_snapshot(now=70)
+
+    restored = SeenFilter(capacity=100, window=100, generations=2, snapshot_path=str(path))
+    assert restored.load(now=70)
+    assert restored.snapshot_time == 70
+    assert restored.contains(range(400)).all()
+    assert restored.nbytes == seen.nbytes
+
+    expired = SeenFilter(capacity=100, window=100, generations=2, snapshot_path=str(path))
+    assert expired.load(now=120)
+    assert not expired.contains(range(50)).any()
+    assert expired.contains(range(50, 400)).all()
+
+    path.write_bytes(b"broken")
+    assert not SeenFilter(snapshot_path=str(path)).load()
+
+
+def test_filter_in_front_of_seen_index(tmp_path):
+    """测试过滤器放在已保存新闻索引之前：确定没见过的新闻不查询SQLite，重启后仍然有效"""
+    storage_config = StorageConfig(directory=str(tmp_path), seen_filter=True, seen_filter_capacity=1000)
+    manager = StorageManager.from_config(storage_config)
+    index = manager.seen_index
+    lookups = []
+    original_lookup = index._lookup
+    index._lookup = lambda keys: lookups.append(len(keys)) or original_lookup(keys)
+
+    assert manager.save_news([make_item(i) for i in range(10)], ["AI"], "json", "first.json")
+    assert lookups == [0]  # 全部为新新闻，没有查询SQLite
+    assert (tmp_path / ".seen_filter.npz").exists()
+
+    assert manager.filter_unseen([make_item(i) for i in range(5, 15)], ["AI"]) == [make_item(i) for i in range(10, 15)]
+    assert lookups[-1] == 10  # 只查询可能见过的5条新闻的键
+
+    # 快照之后写入的键（未到下次快照时间）在重启时从索引补上
+    manager.save_news([make_item(20)], ["AI"], "json", "second.json")
+    restarted = StorageManager.from_config(storage_config)
+    unseen = restarted.filter_unseen([make_item(i) for i in (1, 20, 30)], ["AI"])
+    assert [item.title for item in unseen] == ["Story 30"]
+
+    # 没有快照时从索引冷启动填充
+    (tmp_path / ".seen_filter.npz").unlink()
+    cold = StorageManager.from_config(storage_config)
+    assert len(cold.seen_index.seen_filter) == 22
+    assert [item.title for item in cold.filter_unseen([make_item(3), make_item(31)], ["AI"])] == ["Story 31"]
+
+
+def main():
+    """主测试函数"""
+    print("已见过滤器测试")
+    print("=" * 50)
+    test_memory_and_error_rate_per_million()
+    test_scalable_growth_keeps_error_rate()
+    test_generations_age_out()
+    for test in (test_snapshot_roundtrip, test_filter_in_front_of_seen_index):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+测试跨运行的已保存新闻索引
+"""
+import json
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.storage.manager import StorageManager
+from news_agent.storage.seen_index import SeenIndex
+
+
+def make_item(i: int, url: str = None, content: str = None) -> NewsItem:
+    return NewsItem(
+        title=f"Story {i}",
+        content=content if content is not None else f"Body {i}",
+        url=url if url is not None else f"http://example.com/{i}",
+        published_date=datetime(2025, 9, 1, 10, 0),
+        source="Test"
+    )
+
+
+def test_filter_by_url_or_content(tmp_path):
+    """测试按URL或内容哈希判断已保存"""
+    index = SeenIndex(str(tmp_path / "seen.db"))
+    index.mark_seen([make_item(1), make_item(2)], now=100)
+
+    candidates = [
+        make_item(1),  # 完全相同
+        make_item(2, url="http://mirror.com/2"),  # 内容相同，URL不同
+        make_item(3, url="http://example.com/1"),  # URL相同，内容不同
+        make_item(4),
+        make_item(4),  # 同一批中的重复
+        make_item(5, url=""),
+    ]
+    unseen = index.filter_unseen(candidates)
+    assert [item.title for item in unseen] == ["Story 4", "Story 5"]
+    assert len(index) == 4
+
+
+def test_first_and_last_seen_times(tmp_path):
+    """测试首次和最近出现时间，以及重新打开后仍然有效"""
+    path = str(tmp_path / "seen.db")
+    index = SeenIndex(path)
+    index.mark_seen([make_item(1)], now=100)
+    index.mark_seen([make_item(1)], now=250)
+    index.close()
+
+    reopened = SeenIndex(path)
+    assert reopened.get_times(make_item(1)) == (100, 250)
+    assert reopened.get_times(make_item(9)) is None
+
+    untimed = SeenIndex(str(tmp_path / "untimed.db"), track_times=False)
+    untimed.mark_seen([make_item(1)])
+    assert untimed.filter_unseen([make_item(1)]) == []
+
+
+def test_storage_manager_saves_only_new_items(tmp_path):
+    """测试StorageManager重复运行只写入新新闻"""
+    manager = StorageManager(str(tmp_path), seen_index=SeenIndex(str(tmp_path / ".seen.db")))
+
+    first = manager.save_news([make_item(1), make_item(2)], ["AI"], "json", "first.json")
+    assert first.endswith("first.json")
+
+    assert manager.save_news([make_item(1), make_item(2)], ["AI"], "json", "again.json") is None
+    assert not (tmp_path / "again.json").exists()
+
+    third = manager.save_news([make_item(2), make_item(3)], ["AI"], "json", "third.json")
+    with open(third, encoding="utf-8") as f:
+        assert [n["title"] for n in json.load(f)["news"]] == ["Story 3"]
+
+    forced = manager.save_news([make_item(1)], ["AI"], "json", "forced.json", skip_seen=False)
+    assert forced is not None
+
+
+def test_seen_is_scoped_by_keywords(tmp_path):
+    """测试已保存记录按关键词集合区分：同一条新闻可以分别保存到不同关键词下"""
+    manager = StorageManager(str(tmp_path), seen_index=SeenIndex(str(tmp_path / ".seen.db")))
+
+    assert manager.save_news([make_item(1)], ["openai"], "json", "openai.json") is not None
+    assert manager.save_news([make_item(1)], ["trump"], "json", "trump.json") is not None
+    # 关键词顺序、大小写和空白不影响
+    assert manager.save_news([make_item(1), make_item(2)], [" OpenAI "], "json", "again.json").endswith("again.json")
+    assert manager.filter_unseen([make_item(1), make_item(2)], ["AI", "chip"]) == [make_item(1), make_item(2)]
+    assert manager.filter_unseen([make_item(1), make_item(2)], ["openai"]) == []
+
+
+def main():
+    """主测试函数"""
+    print("已保存新闻索引测试")
+    print("=" * 50)
+    for test in (test_filter_by_url_or_content,
+                 test_first_and_last_seen_times,
+                 test_storage_manager_saves_only_new_items,
+                 test_seen_is_scoped_by_keywords):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+测试新闻链接规范化
+"""
+import sys
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from datetime import datetime
+
+from news_agent.core.data_sources.base import NewsItem
+from news_agent.core.data_sources.rss import RSSSource
+from news_agent.core.url_canonical import canonicalize_url, canonicalize_urls, unwrap_redirect
+from news_agent.storage.seen_index import SeenIndex
+
+
+CASES = [
+    # 跟踪参数、默认端口、片段、末尾斜杠，参数排序
+    ("https://WWW.Example.com:443/a/b/?utm_source=rss&b=2&fbclid=x&a=1#comments",
+     "https://example.com/a/b?a=1&b=2"),
+    ("http://example.com:8080/a?pk_campaign=x", "http://example.com:8080/a"),
+    # 移动版主机
+    ("https://m.example.com/story", "https://example.com/story"),
+    ("https://mobile.example.co.uk/story", "https://example.co.uk/story"),
+    # 去掉前缀后只剩公共后缀时保留前缀
+    ("https://amp.co.uk/story", "https://amp.co.uk/story"),
+    ("https://www.com.cn/news", "https://www.com.cn/news"),
+    ("https://m.example.com.cn/news", "https://example.com.cn/news"),
+    # AMP版本：amp.子域名、AMP缓存、登记了AMP形式的网站
+    ("https://amp.example.com/news/story.amp.html?amp=1", "https://example.com/news/story.html"),
+    ("https://amp.example.com/amp/news/story", "https://example.com/news/story"),
+    ("https://amp.example.com/news/story/amp/", "https://example.com/news/story"),
+    ("https://www.washingtonpost.com/news/story?outputType=amp&id=3", "https://washingtonpost.com/news/story?id=3"),
+    ("https://www.bbc.com/news/world-123.amp", "https://bbc.com/news/world-123"),
+    ("https://www.google.com/amp/s/www.example.com/news/story", "https://example.com/news/story"),
+    ("https://www-example-com.cdn.ampproject.org/c/s/www.example.com/news/story.amp",
+     "https://example.com/news/story"),
+    ("https://www-example-com.cdn.ampproject.org/c/s/www.example.com/amp/news/story?amp=1",
+     "https://example.com/news/story"),
+    # 其他网站上 /amp、.amp、?amp 是正常的路径和参数
+    ("https://example.com/amp", "https://example.com/amp"),
+    ("https://example.com/amp/news/story", "https://example.com/amp/news/story"),
+    ("https://example.com/news/story/amp/", "https://example.com/news/story/amp"),
+    ("https://example.com/files/data.amp", "https://example.com/files/data.amp"),
+    ("https://example.com/news?outputType=amp&id=3", "https://example.com/news?id=3&outputType=amp"),
+    # 搜索引擎跳转链接
+    ("/url?q=https://www.example.com/story%3Futm_medium%3Dfeed&sa=U&ved=abc",
+     "https://example.com/story"),
+    ("https://www.google.com/url?url=https://example.com/a/&sa=D", "https://example.com/a"),
+    ("https://www.bing.com/news/apiclick.aspx?ref=FexRss&url=https%3a%2f%2fwww.example.com%2fx.html&c=1",
+     "https://example.com/x.html"),
+    # 按网站的规则
+    ("https://www.youtube.com/watch?v=abc&feature=share&t=10", "https://youtube.com/watch?v=abc"),
+    ("https://www.nytimes.com/2025/07/31/us/story.html?smtyp=cur&searchResultPosition=1",
+     "https://nytimes.com/2025/07/31/us/story.html"),
+    # 网站规则只去掉跟踪参数，有意义的参数保留
+    ("https://www.nytimes.com/search?query=ai&smid=tw-share", "https://nytimes.com/search?query=ai"),
+    ("https://edition.cnn.com/videos/world?iid=ob_lockedrail&v=2", "https://edition.cnn.com/videos/world?v=2"),
+    ("https://www.reuters.com/search/news?blob=chips&taid=1&utm_source=x",
+     "https://reuters.com/search/news?blob=chips"),
+    ("https://news.qq.com/a/1.htm?ADTAG=rss&id=2", "https://news.qq.com/a/1.htm?id=2"),
+    # 有意义的参数和 #! 路由保留
+    ("https://example.com/article.php?id=42&page=2", "https://example.com/article.php?id=42&page=2"),
+    ("https://example.com/#!/post/1", "https://example.com/#!/post/1"),
+    # 不是http(s)绝对地址时原样返回
+    ("/search?q=news&form=hpca", "/search?q=news&form=hpca"),
+    ("  mailto:news@example.com ", "mailto:news@example.com"),
+    ("", ""),
+]
+
+
+def test_canonical_forms():
+    """测试各类链接的规范化结果以及幂等性"""
+    for url, expected in CASES:
+        result = canonicalize_url(url)
+        assert result == expected, f"{url!r}: {result!r} != {expected!r}"
+        assert canonicalize_url(result) == result
+
+
+def test_variants_collapse_to_one():
+    """测试同一篇报道的各种链接变体得到相同结果"""
+    variants = [
+        "https://www.example.com/world/story-123",
+        "https://example.com/world/story-123/",
+        "http://m.example.com/world/story-123?utm_source=twitter&utm_medium=social",
+        "https://amp.example.com/world/story-123/amp",
+        "/url?q=https://www.example.com/world/story-123&sa=U",
+        "https://www.example.com/world/story-123#top",
+    ]
+    results = {canonicalize_url(url).replace("http://", "https://") for url in variants}
+    assert results == {"https://example.com/world/story-123"}
+
+
+def test_amp_paths_stay_distinct_elsewhere():
+    """测试没有登记AMP形式的网站上，/amp 开头或结尾的页面不会与其他页面合并"""
+    pages = [
+        "https://example.com/amp",
+        "https://example.com/",
+        "https://example.com/amp/guide",
+        "https://example.com/guide",
+        "https://example.com/blog/amp",
+        "https://example.com/blog",
+        "https://example.com/post.amp",
+        "https://example.com/post",
+    ]
+    assert len({canonicalize_url(url) for url in pages}) == len(pages)
+
+
+def test_batch_matches_single():
+    """测试批量规范化与逐条结果一致且保持顺序"""
+    urls = [url for url, _ in CASES] * 3
+    assert canonicalize_urls(urls) == [canonicalize_url(url) for url in urls]
+    assert canonicalize_urls(iter([])) == []
+
+
+def test_items_keep_original_url():
+    """测试新闻条目保留原始链接，只在去重和已保存索引中使用规范化形式"""
+    def make_item(url):
+        return NewsItem(title="Story", content="Body", url=url,
+                        published_date=datetime(2025, 9, 1), source="Test")
+
+    original = make_item("https://m.example.co.uk/story/?utm_source=rss")
+    desktop = make_item("https://example.co.uk/story")
+    assert original.url == "https://m.example.co.uk/story/?utm_source=rss"
+    assert original == desktop and len({original, desktop}) == 1
+    assert SeenIndex.url_key(original.url) == SeenIndex.url_key(desktop.url)
+    assert make_item("https://amp.co.uk/story") != make_item("https://co.uk/story")
+
+    row = ("Story", "Body", "https://amp.example.com/story.amp.html?utm_source=rss", None, None, None)
+    item = RSSSource([])._row_to_item(row, "Test")
+    assert item.url == row[2] and item == make_item("https://example.com/story.html")
+
+    # 搜索结果中的跳转链接只展开，不做规范化
+    assert unwrap_redirect("/url?q=https://www.example.com/a%3Fid%3D1&sa=U") == "https://www.example.com/a?id=1"
+    assert unwrap_redirect(" https://www.bing.com/news/apiclick.aspx?url=https%3a%2f%2fm.example.com%2fx ") == \
+        "https://m.example.com/x"
+    assert unwrap_redirect("https://www.example.com/a/?utm_source=x") == "https://www.example.com/a/?utm_source=x"
+
+
+def main():
+    """主测试函数"""
+    print("链接规范化测试")
+    print("=" * 50)
+    for test in (test_canonical_forms,
+                 test_variants_collapse_to_one,
+                 test_amp_paths_stay_distinct_elsewhere,
+                 test_batch_matches_single,
+                 test_items_keep_original_url):
+        test()
+    print("[SUCCESS] 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())